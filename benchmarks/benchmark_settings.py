@@ -0,0 +1,52 @@
+"""
+benchmarks/benchmark_settings.py - Django settings for the benchmarks against a local Postgres.
+
+The database is configured with the same environment variables as the
+example_project's `.env` (`POSTGRES_HOST`, `POSTGRES_PORT`, `POSTGRES_DB`,
+`POSTGRES_USER` and `POSTGRES_PASSWORD`), with the database name defaulting
+to `search_service_benchmarks`. The database must already exist, e.g.:
+
+    createdb search_service_benchmarks
+"""
+
+import os
+import pathlib
+import sys
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+
+def setup(**search_service_settings):
+    settings.configure(
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "rest_framework",
+            "django_filters",
+            "search_service",
+        ],
+        DATABASES={
+            "default": {
+                "ENGINE": "django.db.backends.postgresql",
+                "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+                "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+                "NAME": os.environ.get("POSTGRES_DB", "search_service_benchmarks"),
+                "USER": os.environ.get("POSTGRES_USER", "postgres"),
+                "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            }
+        },
+        REST_FRAMEWORK={
+            "DEFAULT_PAGINATION_CLASS": "search_service.pagination.MadocPagination",
+            "PAGE_SIZE": 25,
+            "UNAUTHENTICATED_USER": None,
+        },
+        SEARCH_SERVICE=search_service_settings,
+        ALLOWED_HOSTS=["*"],
+        USE_TZ=True,
+        DEFAULT_AUTO_FIELD="django.db.models.BigAutoField",
+        SECRET_KEY="benchmarks",
+    )
+    django.setup()
@@ -0,0 +1,40 @@
+"""
+benchmarks/compare.py - Compare the results of two runs of the benchmark suite.
+
+Usage:
+    python benchmarks/compare.py base.json head.json
+"""
+
+import argparse
+import json
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    argparser.add_argument("base")
+    argparser.add_argument("head")
+    args = argparser.parse_args()
+
+    base, head = load(args.base), load(args.head)
+    print(f"base: {base['commit']} {base['corpus']}")
+    print(f"head: {head['commit']} {head['corpus']}")
+    if base["corpus"] != head["corpus"]:
+        print("Warning: the runs are of different corpora")
+    print(f"{'benchmark':<30} {'base ms':>10} {'head ms':>10} {'change':>8}")
+    for name, result in head["benchmarks"].items():
+        if (base_result := base["benchmarks"].get(name)) is None:
+            continue
+        change = result["median"] / base_result["median"] - 1
+        print(
+            f"{name:<30} {base_result['median']:>10.1f} {result['median']:>10.1f} "
+            f"{change:>+8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""
+benchmarks/corpus.py - Generate a synthetic corpus of JSONResources for the benchmarks.
+
+The corpus is scaled from the test fixtures: each resource is a canvas (labelled
+as those of `tests/fixtures/iiif/vol3.json`) with a transcript, and sometimes a
+translation, generated from a bigram model of the texts in `tests/fixtures/text`,
+a few tags drawn from `tests/fixtures/tags/tags_truncated.json`, and metadata
+drawn from that of the manifest. The tag and metadata values follow a Zipf
+distribution over the fixture values and a long tail of variants of them,
+whose number grows with the size of the corpus.
+
+The resources are bulk loaded, with the Indexables (and their passages,
+FacetValues and search vectors) that the indexing task would create for them,
+then the facet summaries are rebuilt and the tables analyzed.
+
+Usage:
+    python benchmarks/corpus.py --indexables 10k [--flush] [--seed 0]
+"""
+
+import argparse
+import functools
+import itertools
+import json
+import pathlib
+import random
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+import benchmark_settings
+
+FIXTURES = pathlib.Path(__file__).resolve().parents[1] / "tests" / "fixtures"
+CONTEXTS = [
+    ("urn:benchmarks:site:1", 0.6),
+    ("urn:benchmarks:site:2", 0.3),
+    ("urn:benchmarks:site:3", 0.1),
+]
+MIN_WORD_LENGTH = 6
+
+
+def parse_size(value):
+    """Parse a size such as 10000, 10k or 1M."""
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    if value[-1].lower() in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1].lower()])
+    return int(value)
+
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+class TextModel(object):
+    """Bigram model of the words of the fixture texts of one file, whose
+    generated texts have a realistic vocabulary and term frequencies.
+    """
+
+    def __init__(self, entries):
+        self.template = {
+            k: v
+            for k, v in entries[0].items()
+            if k in ["type", "subtype", "group_id"] or k.startswith("language_")
+        }
+        self.successors = defaultdict(list)
+        self.lengths = []
+        for entry in entries:
+            words = entry["indexable"].split()
+            self.lengths.append(len(words))
+            for word, successor in zip(words, words[1:]):
+                self.successors[word].append(successor)
+        self.words = list(self.successors)
+
+    def generate(self, rng):
+        length = max(5, int(rng.gauss(*self.length_distribution)))
+        word = rng.choice(self.words)
+        words = [word]
+        for _ in range(length - 1):
+            word = rng.choice(self.successors.get(word) or self.words)
+            words.append(word)
+        return " ".join(words)
+
+    @property
+    def length_distribution(self):
+        mean = sum(self.lengths) / len(self.lengths)
+        variance = sum((n - mean) ** 2 for n in self.lengths) / len(self.lengths)
+        return mean, variance**0.5
+
+    def word_frequencies(self):
+        frequencies = defaultdict(int)
+        for successors in self.successors.values():
+            for word in successors:
+                frequencies[word] += 1
+        return frequencies
+
+
+class ZipfVocabulary(object):
+    """Values drawn with Zipf distributed frequencies from the base values,
+    which are the most frequent, followed by a long tail of `size` values in
+    total, of variants of the base values.
+    """
+
+    def __init__(self, values, size, exponent=1.1):
+        self.values = list(values)
+        self.size = max(size, len(self.values))
+        self.cum_weights = list(
+            itertools.accumulate(
+                1 / (rank + 1) ** exponent for rank in range(self.size)
+            )
+        )
+
+    def __getitem__(self, rank):
+        base = self.values[rank % len(self.values)]
+        if rank < len(self.values):
+            return base
+        return base, rank // len(self.values)
+
+    def choice(self, rng):
+        rank = bisect_left(self.cum_weights, rng.random() * self.cum_weights[-1])
+        return self[min(rank, self.size - 1)]
+
+
+class CorpusGenerator(object):
+    def __init__(self, indexables, seed=0):
+        self.indexables = indexables
+        self.rng = random.Random(seed)
+        manifest = load_json(FIXTURES / "iiif" / "vol3.json")
+        self.canvases = manifest["sequences"][0]["canvases"]
+        self.text_models = {
+            path.stem: TextModel(load_json(path))
+            for path in sorted((FIXTURES / "text").glob("*.json"))
+        }
+        self.transcript_models = [
+            m
+            for m in self.text_models.values()
+            if m.template["subtype"] == "transcript"
+        ]
+        self.translation_models = [
+            m
+            for m in self.text_models.values()
+            if m.template["subtype"] == "translation"
+        ]
+        # Around 11 indexables per resource
+        resources = max(1, indexables // 11)
+        self.tags = ZipfVocabulary(
+            load_json(FIXTURES / "tags" / "tags_truncated.json"),
+            int(2 * resources**0.5),
+        )
+        self.metadata = {
+            item["label"]: ZipfVocabulary(
+                (
+                    [
+                        value if isinstance(value, str) else json.dumps(value)
+                        for value in item["value"]
+                    ]
+                    if isinstance(item["value"], list)
+                    else [item["value"]]
+                ),
+                int(resources**0.5),
+            )
+            for item in manifest["metadata"]
+        }
+
+    def text_indexable(self, model, canvas):
+        text = model.generate(self.rng)
+        return {
+            **model.template,
+            "content_id": canvas["@id"],
+            "original_content": f"<p>{text}</p>",
+            "indexable_text": text,
+        }
+
+    def tag_indexable(self):
+        tag = self.tags.choice(self.rng)
+        variant = None
+        if isinstance(tag, tuple):
+            tag, variant = tag
+        value = tag["indexable"] if variant is None else f"{tag['indexable']} {variant}"
+        return {
+            "type": tag["type"],
+            "subtype": tag["subtype"],
+            "group_id": (
+                tag["group_id"] if variant is None else f"{tag['group_id']}-{variant}"
+            ),
+            "original_content": value,
+            "indexable_text": value,
+            "selector": tag.get("selector"),
+            **{k: v for k, v in tag.items() if k.startswith("language_")},
+        }
+
+    def metadata_indexable(self, label):
+        value = self.metadata[label].choice(self.rng)
+        if isinstance(value, tuple):
+            value = f"{value[0]} ({value[1]})"
+        return {
+            "type": "metadata",
+            "subtype": label,
+            "original_content": value,
+            "indexable_text": value,
+            "language": "en",
+        }
+
+    def resource(self, number):
+        canvas = self.canvases[number % len(self.canvases)]
+        indexables = [
+            self.text_indexable(self.rng.choice(self.transcript_models), canvas)
+        ]
+        if self.rng.random() < 0.5:
+            indexables.append(
+                self.text_indexable(self.rng.choice(self.translation_models), canvas)
+            )
+        indexables.extend(
+            self.tag_indexable() for _ in range(int(self.rng.expovariate(1 / 3)))
+        )
+        indexables.extend(
+            self.metadata_indexable(label)
+            for label in self.rng.sample(list(self.metadata), 6)
+        )
+        context = self.rng.choices(
+            [urn for urn, _ in CONTEXTS], [weight for _, weight in CONTEXTS]
+        )[0]
+        return {
+            "label": f"{canvas['label']} ({number})"[:50],
+            "type": "canvas",
+            "data": {"indexables": indexables},
+            "contexts": [context],
+        }
+
+    def __iter__(self):
+        """Resources until there are `indexables` indexables (with that of the
+        label of each resource).
+        """
+        remaining = self.indexables
+        for number in itertools.count():
+            if remaining <= 0:
+                return
+            resource = self.resource(number)
+            indexables = resource["data"]["indexables"][: remaining - 1]
+            resource["data"]["indexables"] = indexables
+            remaining -= len(indexables) + 1
+            yield resource
+
+    def search_terms(self):
+        """Common and rare words of the texts of the corpus, for searches."""
+        frequencies = defaultdict(int)
+        for model in self.text_models.values():
+            for word, frequency in model.word_frequencies().items():
+                word = word.strip(".,;:()[]¿?¡!'\"").lower()
+                if len(word) >= MIN_WORD_LENGTH and word.isalpha():
+                    frequencies[word] += frequency
+        ranked = sorted(frequencies, key=lambda w: (-frequencies[w], w))
+        return {"common": ranked[0], "rare": ranked[-1]}
+
+
+def flush():
+    from django.db import connection
+
+    from search_service.models import (
+        FacetField,
+        FacetValueCount,
+        Indexable,
+        JSONResource,
+    )
+
+    tables = [
+        model._meta.db_table
+        for model in [JSONResource, Indexable, FacetField, FacetValueCount]
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {', '.join(tables)} CASCADE")
+
+
+def load(resources, batch_size=1000):
+    """Bulk load the resources, with their Indexables, and return the number
+    of resources and of indexables loaded.
+    """
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import transaction
+
+    from search_service.language.indexable import format_indexable_language_fields
+    from search_service.models import (
+        Context,
+        FacetValue,
+        Indexable,
+        IndexablePassage,
+        JSONResource,
+    )
+    from search_service.serializers.indexing import JSONResourceToIndexableSerializer
+    from search_service.utils import is_facet_value_type, normalize_facet_value
+
+    content_type = ContentType.objects.get_for_model(JSONResource)
+    contexts = {
+        urn: Context.objects.get_or_create(urn=urn, defaults={"type": "site"})[0]
+        for urn, _ in CONTEXTS
+    }
+    serializer = JSONResourceToIndexableSerializer()
+    # The languages of the indexables are drawn from those of the fixtures
+    format_language = functools.lru_cache(format_indexable_language_fields)
+    resource_count = indexable_count = 0
+    resources = iter(resources)
+    while batch := list(itertools.islice(resources, batch_size)):
+        instances = [
+            JSONResource(label=r["label"], type=r["type"], data=r["data"])
+            for r in batch
+        ]
+        indexables, passages, resource_contexts, indexable_contexts = [], [], [], []
+        for instance, resource in zip(instances, batch):
+            resource_context_ids = [contexts[urn].id for urn in resource["contexts"]]
+            resource_contexts.extend(
+                JSONResource.contexts.through(
+                    jsonresource_id=instance.id, context_id=context_id
+                )
+                for context_id in resource_context_ids
+            )
+            for data in serializer.to_indexables(instance):
+                data = dict(data)
+                language = format_language(data.pop("language", None))
+                indexable = Indexable(
+                    resource_content_type=content_type,
+                    resource_id=instance.id,
+                    **{**language, **data},
+                )
+                indexables.append(indexable)
+                indexable_contexts.extend(
+                    Indexable.contexts.through(
+                        indexable_id=indexable.id, context_id=context_id
+                    )
+                    for context_id in resource_context_ids
+                )
+                passages.extend(
+                    IndexablePassage(
+                        indexable=indexable,
+                        word_offset=passage["word_offset"],
+                        passage_text=passage["passage_text"],
+                    )
+                    for passage in serializer.to_passages(indexable.indexable_text)
+                )
+        with transaction.atomic():
+            JSONResource.objects.bulk_create(instances)
+            JSONResource.contexts.through.objects.bulk_create(resource_contexts)
+            Indexable.objects.bulk_create(indexables)
+            Indexable.contexts.through.objects.bulk_create(indexable_contexts)
+            IndexablePassage.objects.bulk_create(passages)
+            FacetValue.objects.bulk_create(
+                FacetValue(
+                    indexable=indexable,
+                    resource_content_type_id=indexable.resource_content_type_id,
+                    resource_id=indexable.resource_id,
+                    type=indexable.type,
+                    subtype=indexable.subtype,
+                    group_id=indexable.group_id,
+                    value=indexable.indexable_text,
+                    normalized_value=normalize_facet_value(indexable.indexable_text),
+                    language_iso639_2=indexable.language_iso639_2,
+                    language_iso639_1=indexable.language_iso639_1,
+                )
+                for indexable in indexables
+                if is_facet_value_type(indexable.type)
+            )
+        resource_count += len(instances)
+        indexable_count += len(indexables)
+        print(f"Loaded {resource_count} resources, {indexable_count} indexables")
+    return resource_count, indexable_count
+
+
+def update_search_vectors():
+    """Set the search vectors of the Indexables (and passages) without them,
+    in the text search configuration of the language of each.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    from search_service.models import Indexable, IndexablePassage
+
+    languages = (
+        Indexable.objects.filter(search_vector=None)
+        .values_list("language_pg", flat=True)
+        .order_by()
+        .distinct()
+    )
+    for language in list(languages):
+        config = {"config": language} if language else {}
+        Indexable.objects.filter(search_vector=None, language_pg=language).update(
+            search_vector=SearchVector("indexable_text", weight="A", **config)
+        )
+        IndexablePassage.objects.filter(
+            search_vector=None, indexable__language_pg=language
+        ).update(search_vector=SearchVector("passage_text", weight="A", **config))
+
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    argparser.add_argument(
+        "--indexables",
+        type=parse_size,
+        default=10_000,
+        help="Number of indexables, e.g. 10k, 1M or 10M",
+    )
+    argparser.add_argument("--seed", type=int, default=0)
+    argparser.add_argument("--batch-size", type=int, default=1000)
+    argparser.add_argument(
+        "--flush", action="store_true", help="Delete the existing resources first"
+    )
+    args = argparser.parse_args()
+
+    benchmark_settings.setup()
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command("migrate", verbosity=0)
+    if args.flush:
+        flush()
+    start = time.perf_counter()
+    resources, indexables = load(
+        CorpusGenerator(args.indexables, seed=args.seed), batch_size=args.batch_size
+    )
+    update_search_vectors()
+    call_command("rebuild_facet_fields")
+    call_command("rebuild_facet_value_counts")
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    print(
+        f"Generated {resources} resources, {indexables} indexables "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
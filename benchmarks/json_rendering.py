@@ -0,0 +1,171 @@
+"""
+benchmarks/json_rendering.py - Compare the stdlib and fast JSON renderers and parsers.
+
+Renders realistic search responses (a page of JSONResource results with their
+`data`, hits and facets) and parses a large faceted search request with the DRF
+JSONRenderer/JSONParser and the search_service FastJSONRenderer/FastJSONParser.
+
+Usage:
+    python benchmarks/json_rendering.py [--results 25] [--number 200]
+"""
+
+import argparse
+import datetime
+import io
+import pathlib
+import random
+import sys
+import timeit
+import uuid
+from collections import defaultdict
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+settings.configure(
+    INSTALLED_APPS=[
+        "django.contrib.contenttypes",
+        "rest_framework",
+        "search_service",
+    ],
+    USE_TZ=True,
+)
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.utils.serializer_helpers import ReturnDict  # noqa: E402
+
+from search_service import parsers, renderers  # noqa: E402
+from search_service.parsers import FastJSONParser  # noqa: E402
+from search_service.renderers import FastJSONRenderer  # noqa: E402
+
+WORDS = (
+    "the letter of the council to the king concerning the harbour at leith "
+    "and the tolbooth of glasgow with an account of the monies received"
+).split()
+
+
+def words(n):
+    return " ".join(random.choice(WORDS) for _ in range(n))
+
+
+def search_result(num_hits=3):
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    return ReturnDict(
+        {
+            "id": uuid.uuid4(),
+            "created": now,
+            "modified": now,
+            "label": words(6),
+            "type": "manifest",
+            "data": {
+                "metadata": [
+                    {"label": words(2), "value": words(12)} for _ in range(20)
+                ],
+                "summary": words(200),
+                "pages": random.randint(1, 500),
+                "thumbnail": f"https://iiif.example.org/{uuid.uuid4()}/full/200,/0/default.jpg",
+            },
+            "rank": random.random(),
+            "snippet": "'" + words(40),
+            "hits": [
+                {
+                    "type": "text",
+                    "subtype": "transcript",
+                    "group_id": None,
+                    "indexable_text": words(30),
+                    "snippet": words(40),
+                    "language": "en",
+                    "rank": random.random(),
+                    "bounding_boxes": [
+                        [random.randint(0, 4000) for _ in range(4)] for _ in range(5)
+                    ],
+                }
+                for _ in range(num_hits)
+            ],
+        },
+        serializer=None,
+    )
+
+
+def facets():
+    grouped = defaultdict(lambda: defaultdict(dict))
+    for facet_type in ["metadata", "entity", "tag"]:
+        for subtype in range(10):
+            for value in range(10):
+                grouped[facet_type][f"field {subtype}"][words(3)] = random.randint(
+                    1, 1000
+                )
+    return grouped
+
+
+def search_response(num_results):
+    return {
+        "pagination": {
+            "page": 1,
+            "pageSize": num_results,
+            "next": "http://localhost:8000/search_service/json_resource_search/?page=2",
+            "previous": None,
+            "totalPages": 40,
+            "totalResults": 40 * num_results,
+        },
+        "results": [search_result() for _ in range(num_results)],
+        "facets": facets(),
+    }
+
+
+def search_request():
+    return (
+        '{"fulltext": "council harbour", "facet_types": ["metadata", "entity"], '
+        '"facets": ['
+        + ", ".join(
+            f'{{"type": "metadata", "subtype": "field {i}", "value": "{words(3)}"}}'
+            for i in range(200)
+        )
+        + "]}"
+    ).encode()
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"{label:<40} {seconds * 1e6:>10.1f} us")
+    return seconds
+
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    argparser.add_argument("--results", type=int, default=25)
+    argparser.add_argument("--number", type=int, default=200)
+    args = argparser.parse_args()
+
+    if renderers.orjson is None or parsers.orjson is None:
+        print("orjson is not installed, the fast classes use the stdlib fallback")
+
+    random.seed(0)
+    response = search_response(args.results)
+    request = search_request()
+    rendered = JSONRenderer().render(response)
+    print(f"Response: {len(rendered) / 1024:.1f} KiB, request: {len(request)} B")
+
+    stdlib = bench("JSONRenderer", lambda: JSONRenderer().render(response), args.number)
+    fast = bench(
+        "FastJSONRenderer", lambda: FastJSONRenderer().render(response), args.number
+    )
+    print(f"{'Renderer speedup':<40} {stdlib / fast:>10.1f} x")
+
+    stdlib = bench(
+        "JSONParser", lambda: JSONParser().parse(io.BytesIO(request)), args.number
+    )
+    fast = bench(
+        "FastJSONParser",
+        lambda: FastJSONParser().parse(io.BytesIO(request)),
+        args.number,
+    )
+    print(f"{'Parser speedup':<40} {stdlib / fast:>10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
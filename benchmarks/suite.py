@@ -0,0 +1,234 @@
+"""
+benchmarks/suite.py - Benchmark indexing and search against a generated corpus.
+
+Runs each benchmark (indexing throughput, fulltext search, facet computation,
+deep pagination and hits serialization) against the corpus generated by
+`benchmarks/corpus.py`, with the search requests made in-process to the API
+JSONResource search viewset (as the public viewset replaces the request body
+with the query params, i.e. the page). The durations of each run, the number
+of queries, and the median durations of the stages of the search timings are
+written to a JSON file, with the commit and the size of the corpus, which can
+be compared with those of another run with `benchmarks/compare.py`.
+
+Usage:
+    python benchmarks/corpus.py --indexables 10k --flush
+    python benchmarks/suite.py [--repeat 10] [--output results.json]
+"""
+
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import statistics
+import subprocess
+import time
+
+import benchmark_settings
+
+RESULTS_DIR = pathlib.Path(__file__).resolve().parent / "results"
+FACET_TYPES = ["metadata", "tag"]
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=RESULTS_DIR.parent,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def summarize(durations, **extra):
+    return {
+        "runs": len(durations),
+        "min": round(min(durations), 3),
+        "median": round(statistics.median(durations), 3),
+        "p95": round(percentile(durations, 0.95), 3),
+        "durations": [round(d, 3) for d in durations],
+        **extra,
+    }
+
+
+class SearchBenchmark(object):
+    def __init__(self, name, body, page=None):
+        self.name = name
+        self.body = body
+        self.page = page
+
+    def request(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.test import APIRequestFactory
+
+        from search_service.views import JSONResourceAPISearchViewSet
+
+        view = JSONResourceAPISearchViewSet.as_view({"post": "create"})
+        path = "/api/search_service/json_resource_search/"
+        if self.page is not None:
+            path = f"{path}?page={self.page}"
+        request = APIRequestFactory().post(path, self.body, format="json")
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = view(request)
+            response.render()
+            duration = (time.perf_counter() - start) * 1000
+        assert response.status_code == 200, response.content
+        return duration, len(queries), response.data
+
+    def run(self, repeat):
+        # Warm up the caches of the service and of Postgres
+        self.request()
+        durations, stages = [], {}
+        for _ in range(repeat):
+            duration, queries, data = self.request()
+            durations.append(duration)
+            for stage in data.get("debug", {}).get("timings", {}).get("stages", []):
+                stages.setdefault(stage["name"], []).append(stage["duration"])
+        return summarize(
+            durations,
+            queries=queries,
+            results=data.get("pagination", {}).get("totalResults"),
+            stages={
+                name: round(statistics.median(stage), 3)
+                for name, stage in stages.items()
+            },
+        )
+
+
+def run_indexing(resources, repeat):
+    """Index `resources` new resources (as the API does once they are
+    created), `repeat` times, and delete them again.
+    """
+    from corpus import CorpusGenerator
+
+    from search_service.models import Indexable, JSONResource
+    from search_service.signals import ready_for_indexing
+
+    durations, throughputs = [], []
+    generator = CorpusGenerator(resources * 11, seed=1)
+    for _ in range(repeat):
+        created = [
+            JSONResource.objects.create(
+                label=r["label"], type=r["type"], data=r["data"]
+            )
+            for r in (generator.resource(n) for n in range(resources))
+        ]
+        indexables = Indexable.objects.count()
+        start = time.perf_counter()
+        for instance in created:
+            ready_for_indexing.send(sender=JSONResource, instance=instance)
+        duration = time.perf_counter() - start
+        written = Indexable.objects.count() - indexables
+        durations.append(duration * 1000)
+        throughputs.append(written / duration)
+        for instance in created:
+            instance.delete()
+    return summarize(
+        durations,
+        resources=resources,
+        indexables_per_second=round(statistics.median(throughputs), 1),
+    )
+
+
+def get_benchmarks(terms, last_page):
+    fulltext = {"fulltext": terms["common"], "facet_types": FACET_TYPES}
+    return [
+        SearchBenchmark(
+            "fulltext_common", {"fulltext": terms["common"], "exclude": ["hits"]}
+        ),
+        SearchBenchmark("fulltext_rare", {"fulltext": terms["rare"]}),
+        SearchBenchmark("facets_browse", {"facet_types": FACET_TYPES}),
+        SearchBenchmark("facets_fulltext", fulltext),
+        SearchBenchmark(
+            "facets_filtered",
+            {
+                "facet_types": FACET_TYPES,
+                "facets": [{"type": "metadata", "subtype": "Language", "value": "spa"}],
+            },
+        ),
+        SearchBenchmark("pagination_first", fulltext, page=1),
+        SearchBenchmark("pagination_middle", fulltext, page=max(1, last_page // 2)),
+        SearchBenchmark("pagination_last", fulltext, page=last_page),
+        # As fulltext_common, with the hits of each result
+        SearchBenchmark("hits", {"fulltext": terms["common"]}),
+    ]
+
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    argparser.add_argument("--repeat", type=int, default=10)
+    argparser.add_argument(
+        "--index-resources",
+        type=int,
+        default=100,
+        help="Number of resources created for each run of the indexing benchmark",
+    )
+    argparser.add_argument("--only", nargs="*", help="Names of benchmarks to run")
+    argparser.add_argument("--output", type=pathlib.Path)
+    args = argparser.parse_args()
+
+    benchmark_settings.setup(
+        SEARCH_TIMINGS=True, SEARCH_TIMINGS_IN_RESPONSE=True, SLOW_SEARCH_THRESHOLD=None
+    )
+    from django import get_version
+    from django.db import connection
+
+    from corpus import CorpusGenerator
+
+    from search_service.models import Indexable, JSONResource
+
+    corpus = {
+        "resources": JSONResource.objects.count(),
+        "indexables": Indexable.objects.count(),
+    }
+    if not corpus["indexables"]:
+        argparser.error("There is no corpus, generate one with benchmarks/corpus.py")
+    terms = CorpusGenerator(0).search_terms()
+    _, _, data = SearchBenchmark("", {"fulltext": terms["common"]}).request()
+    benchmarks = get_benchmarks(terms, data["pagination"]["totalPages"] or 1)
+
+    results = {}
+    for benchmark in benchmarks:
+        if args.only and benchmark.name not in args.only:
+            continue
+        results[benchmark.name] = result = benchmark.run(args.repeat)
+        print(f"{benchmark.name:<30} {result['median']:>10.1f} ms")
+    if not args.only or "indexing" in args.only:
+        results["indexing"] = result = run_indexing(args.index_resources, args.repeat)
+        print(f"{'indexing':<30} {result['indexables_per_second']:>10.1f} indexables/s")
+
+    commit = get_commit()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    output = args.output or RESULTS_DIR / f"{now:%Y%m%dT%H%M%S}-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(
+            {
+                "commit": commit,
+                "time": now.isoformat(),
+                "python": platform.python_version(),
+                "django": get_version(),
+                "postgres": connection.pg_version,
+                "corpus": corpus,
+                "search_terms": terms,
+                "repeat": args.repeat,
+                "benchmarks": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
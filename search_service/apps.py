@@ -7,4 +7,5 @@ class SearchServiceConfig(AppConfig):
     def ready(self):
         from .signals import (
             index_json_resource,
+            remove_json_resource_summary_counts,
         )
@@ -0,0 +1,66 @@
+"""
+search_service/boxes.py - Packed storage for the word-level box-selector of an Indexable.
+
+A box-selector is a list of [x, y, w, h] boxes, one per word of the indexable text.
+When packed, it is stored as little-endian int32 values, four per box, so that the
+boxes for the matched words of a hit can be read without decoding the whole list.
+NumPy is used to gather the boxes where it is installed.
+"""
+
+import logging
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+BOX_FORMAT = "<4i"
+BOX_SIZE = struct.calcsize(BOX_FORMAT)
+INT32_MIN, INT32_MAX = -(2**31), 2**31 - 1
+
+
+def pack_boxes(boxes):
+    """Pack a list of [x, y, w, h] boxes, or return None if they aren't all
+    four int32 values (in which case the box-selector is left as JSON).
+    """
+    if not isinstance(boxes, list) or not all(
+        [
+            isinstance(box, list)
+            and len(box) == 4
+            and all(
+                [
+                    isinstance(v, int)
+                    and not isinstance(v, bool)
+                    and INT32_MIN <= v <= INT32_MAX
+                    for v in box
+                ]
+            )
+            for box in boxes
+        ]
+    ):
+        return None
+    return b"".join([struct.pack(BOX_FORMAT, *box) for box in boxes])
+
+
+def unpack_boxes(packed):
+    return [list(box) for box in struct.iter_unpack(BOX_FORMAT, packed)]
+
+
+def unpack_selector(selector, packed):
+    """The selector with the packed box-selector (if any) unpacked into it."""
+    if packed is None:
+        return selector
+    return {**(selector or {}), "box-selector": unpack_boxes(packed)}
+
+
+def gather_boxes(packed, indexes):
+    """Get the boxes at the given word indexes, skipping any that are out of range."""
+    num_boxes = len(packed) // BOX_SIZE
+    indexes = [i for i in indexes if 0 <= i < num_boxes]
+    if np is not None:
+        boxes = np.frombuffer(packed, dtype="<i4").reshape(-1, 4)
+        return boxes[indexes].tolist()
+    return [list(struct.unpack_from(BOX_FORMAT, packed, i * BOX_SIZE)) for i in indexes]
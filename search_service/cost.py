@@ -0,0 +1,264 @@
+"""
+search_service/cost.py - Cost guard for searches that are guaranteed to be expensive.
+
+A SearchCostGuard scores a search from the components of its (unparsed) data
+that are known to be expensive: short tokens of a fulltext that is searched
+for with `icontains`, `raw` filters on fields (or with lookups) that can't use
+an index, a `num_facets` over the maximum, many `contexts`, and a `facet_on`.
+Searches whose cost is over the `max_cost` of the policy are rejected with a
+400, or, with the "rewrite" action, first rewritten without the short tokens
+and with the `num_facets` capped. Optionally, the planner's (EXPLAIN) cost of
+the filtered queryset is checked against a `max_plan_cost`.
+
+The policy is the `SEARCH_COST_POLICY` setting, or the `cost_policy` of the
+viewset, over the DEFAULT_COST_POLICY, and is only applied where one is set.
+"""
+
+import json
+import logging
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, JSONField
+from django.db.models.functions import Upper
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .metrics import search_cost_guard
+from .settings import search_service_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COST_POLICY = {
+    # "reject" the searches over the max_cost, or "rewrite" them first
+    "action": "reject",
+    "max_cost": 100,
+    # Tokens of an `icontains` fulltext shorter than this are costed (or, with
+    # "rewrite", dropped)
+    "min_token_length": 2,
+    "max_num_facets": 100,
+    "max_contexts": 100,
+    # Maximum planner cost of the filtered queryset (None to not EXPLAIN it)
+    "max_plan_cost": None,
+    # The cost of each short token, unindexed raw filter, num_facets over the
+    # maximum, and facet_on, and of the `max_contexts` (scaled linearly)
+    "costs": {
+        "short_tokens": 1000,
+        "unindexed_raw": 1000,
+        "num_facets": 1000,
+        "contexts": 100,
+        "facet_on": 50,
+    },
+}
+
+# Lookups that can use a (btree or, for `contains` of JSON, GIN) index of the
+# field, and those that can only use an index of its Upper().
+INDEXED_LOOKUPS = ["exact", "in", "gt", "gte", "lt", "lte", "range", "isnull"]
+UPPER_INDEXED_LOOKUPS = ["iexact"]
+
+
+class SearchCostExceeded(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "The search is too expensive to run."
+    default_code = "search_too_expensive"
+
+    def __init__(self, **costs):
+        super().__init__()
+        # The costs are kept as numbers, rather than error detail strings
+        self.detail = {"detail": self.detail, **costs}
+
+
+def get_indexed_fields(model):
+    """The names of the fields of the model that lead an index."""
+    fields = {
+        field.name
+        for field in model._meta.concrete_fields
+        if field.primary_key or field.unique or field.db_index
+    }
+    fields.update(
+        index.fields[0].lstrip("-") for index in model._meta.indexes if index.fields
+    )
+    return fields
+
+
+def get_upper_indexed_fields(model):
+    """The names of the fields of the model whose Upper() leads an index."""
+    return {
+        expression.source_expressions[0].name
+        for index in model._meta.indexes
+        if index.expressions
+        and isinstance(expression := index.expressions[0], Upper)
+        and isinstance(expression.source_expressions[0], F)
+    }
+
+
+class SearchCostGuard(object):
+    def __init__(self, policy, model):
+        self.policy = {
+            **DEFAULT_COST_POLICY,
+            **policy,
+            "costs": {**DEFAULT_COST_POLICY["costs"], **policy.get("costs", {})},
+        }
+        self.model = model
+
+    def get_short_tokens(self, parser, request_data):
+        search_string = request_data.get("fulltext")
+        if not isinstance(search_string, str) or parser.is_vector_search(
+            request_data, search_string
+        ):
+            return []
+        return [
+            token
+            for token in search_string.split()
+            if len(token) < self.policy["min_token_length"]
+        ]
+
+    def is_indexed_lookup(self, key):
+        """Whether a raw filter (e.g. `indexables__subtype__iexact`) is on an
+        indexed field of the model (or of a related model), with a lookup
+        that can use the index.
+        """
+        model, parts = self.model, key.split("__")
+        while True:
+            try:
+                field = model._meta.get_field(parts[0])
+            except FieldDoesNotExist:
+                return False
+            parts = parts[1:]
+            if not (field.is_relation and parts and field.related_model):
+                break
+            model = field.related_model
+        lookups = parts or ["exact"]
+        if len(lookups) > 1:
+            # Key (or other) transforms of the field
+            return False
+        if isinstance(field, JSONField):
+            return lookups[0] == "contains" and field.name in get_indexed_fields(model)
+        if lookups[0] in UPPER_INDEXED_LOOKUPS:
+            return field.name in get_upper_indexed_fields(model)
+        return lookups[0] in INDEXED_LOOKUPS and field.name in get_indexed_fields(model)
+
+    def get_num_facets(self, request_data):
+        try:
+            return int(request_data.get("num_facets", 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def get_costs(self, parser, request_data):
+        """The costs of the expensive components of the search."""
+        costs = self.policy["costs"]
+        component_costs = {}
+        if short_tokens := self.get_short_tokens(parser, request_data):
+            component_costs["short_tokens"] = costs["short_tokens"] * len(short_tokens)
+        if isinstance(raw := request_data.get("raw"), dict):
+            unindexed = [key for key in raw if not self.is_indexed_lookup(key)]
+            if unindexed:
+                component_costs["unindexed_raw"] = costs["unindexed_raw"] * len(
+                    unindexed
+                )
+        if self.get_num_facets(request_data) > self.policy["max_num_facets"]:
+            component_costs["num_facets"] = costs["num_facets"]
+        contexts = len(request_data.get("contexts") or []) + len(
+            request_data.get("contexts_all") or []
+        )
+        if contexts:
+            component_costs["contexts"] = (
+                costs["contexts"] * contexts / self.policy["max_contexts"]
+            )
+        if request_data.get("facet_on"):
+            component_costs["facet_on"] = costs["facet_on"]
+        return component_costs
+
+    def rewrite(self, parser, request_data):
+        """The search without its short tokens (where it has others), and
+        with its `num_facets` capped at the maximum.
+        """
+        request_data = dict(request_data)
+        if short_tokens := self.get_short_tokens(parser, request_data):
+            tokens = [
+                token
+                for token in request_data["fulltext"].split()
+                if token not in short_tokens
+            ]
+            if tokens:
+                request_data["fulltext"] = " ".join(tokens)
+        if self.get_num_facets(request_data) > self.policy["max_num_facets"]:
+            request_data["num_facets"] = self.policy["max_num_facets"]
+        return request_data
+
+    def check(self, parser, request_data):
+        """Reject the search if it is over the `max_cost`, otherwise return
+        its data, rewritten where the policy allows it.
+        """
+        costs = self.get_costs(parser, request_data)
+        if sum(costs.values()) <= self.policy["max_cost"]:
+            return request_data, None
+        if self.policy["action"] == "rewrite":
+            request_data = self.rewrite(parser, request_data)
+            costs = self.get_costs(parser, request_data)
+            if sum(costs.values()) <= self.policy["max_cost"]:
+                return request_data, "rewritten"
+        raise SearchCostExceeded(
+            cost=sum(costs.values()), max_cost=self.policy["max_cost"], costs=costs
+        )
+
+    def check_plan(self, queryset):
+        """Reject the search if the planner's cost of the queryset is over
+        the `max_plan_cost`.
+        """
+        if (max_plan_cost := self.policy["max_plan_cost"]) is None:
+            return
+        plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+        if plan["Total Cost"] > max_plan_cost:
+            raise SearchCostExceeded(
+                plan_cost=plan["Total Cost"], max_plan_cost=max_plan_cost
+            )
+
+
+class SearchCostGuardMixin(object):
+    """Rejects (or rewrites) the expensive searches to a search viewset with
+    its `cost_guard_class`, where it has a `cost_policy`, or the
+    `SEARCH_COST_POLICY` is set.
+
+    The unparsed data of each search is checked before it is parsed (by the
+    SearchParser, the QueryParamDataMixin and msearch), and, with the
+    `max_plan_cost` of the policy, the filtered queryset before it is run.
+    """
+
+    cost_guard_class = SearchCostGuard
+    cost_policy = None
+
+    def get_cost_guard(self):
+        policy = self.cost_policy
+        if policy is None:
+            policy = search_service_settings.SEARCH_COST_POLICY
+        if policy is None or self.cost_guard_class is None:
+            return None
+        # The model of the (unfiltered) queryset, as the data isn't yet parsed
+        return self.cost_guard_class(policy, self.queryset.model)
+
+    def guard_search_data(self, parser, request_data):
+        if not isinstance(request_data, dict) or (
+            (cost_guard := self.get_cost_guard()) is None
+        ):
+            return request_data
+        view = self.__class__.__name__
+        try:
+            request_data, result = cost_guard.check(parser, request_data)
+        except SearchCostExceeded as e:
+            search_cost_guard.inc(view=view, result="rejected")
+            logger.info(f"Rejected expensive search: ({view=}, {e.detail})")
+            raise
+        if result is not None:
+            search_cost_guard.inc(view=view, result=result)
+        return request_data
+
+    def check_plan_cost(self, queryset):
+        if (cost_guard := self.get_cost_guard()) is None:
+            return
+        try:
+            cost_guard.check_plan(queryset)
+        except SearchCostExceeded as e:
+            view = self.__class__.__name__
+            search_cost_guard.inc(view=view, result="rejected")
+            logger.info(f"Rejected expensive search: ({view=}, {e.detail})")
+            raise
@@ -0,0 +1,153 @@
+"""
+search_service/explain.py - EXPLAIN capture for the queries of search requests.
+
+The SQL of the main search (page), count and facet queries of a request is
+captured, by the stage of the SearchTimer that it is run in, and after the
+request each query is run again with `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`.
+The plans are kept in an in-process ring buffer of the most recent plans,
+and, where requested, added to the response.
+"""
+
+import json
+import logging
+import random
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+from django.db import DatabaseError, connection, transaction
+from rest_framework.response import Response
+
+from .settings import search_service_settings
+from .timing import timed
+
+logger = logging.getLogger(__name__)
+
+# The stages of the search timings whose queries are explained.
+EXPLAIN_STAGES = ["page", "count", "facets"]
+EXPLAIN_SQL = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+
+class PlanBuffer(object):
+    """Thread-safe ring buffer of the most recent explained (or profiled)
+    requests.
+    """
+
+    def __init__(self, maxlen):
+        self.entries = deque(maxlen=maxlen)
+        self.lock = threading.Lock()
+
+    def append(self, entry):
+        with self.lock:
+            self.entries.append(entry)
+
+    def list(self):
+        """The entries, most recent first."""
+        with self.lock:
+            return list(reversed(self.entries))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+explained_plans = PlanBuffer(search_service_settings.EXPLAIN_BUFFER_SIZE)
+
+
+class QueryExplainer(object):
+    def __init__(self, timer, stages=EXPLAIN_STAGES):
+        self.timer = timer
+        self.stages = stages
+        self.queries = []
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """Database execute wrapper that captures the SELECT queries run in
+        the explained stages.
+        """
+        stack = self.timer.stack
+        if (
+            not many
+            and stack
+            and stack[-1][0] in self.stages
+            and sql.lstrip().upper().startswith("SELECT")
+        ):
+            self.queries.append((stack[-1][0], sql, params))
+        return execute(sql, params, many, context)
+
+    def explain(self, stage, sql, params):
+        # In a savepoint, so that a failed EXPLAIN doesn't break the transaction
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(EXPLAIN_SQL + sql, params)
+                plan = cursor.fetchone()[0]
+        except DatabaseError as e:
+            logger.warning(f"Failed to explain search query: ({stage=}, {e})")
+            return {"stage": stage, "sql": sql, "params": params, "error": str(e)}
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return {"stage": stage, "sql": sql, "params": params, "plan": plan}
+
+    def get_plans(self):
+        return [self.explain(*query) for query in self.queries]
+
+
+class SearchExplainMixin(object):
+    """Explains the queries of the requests to a search viewset that are
+    sampled (at `EXPLAIN_SAMPLE_RATE`), or, where `allow_explain` is set,
+    that set the `explain` flag, in which case the plans are also added to
+    the `debug` of the response data. The plans of the explained requests
+    are kept in the `explained_plans` buffer.
+
+    The queries are captured by the stages of the search timings, so are
+    only explained where `SEARCH_TIMINGS` is set.
+    """
+
+    allow_explain = False
+    query_explainer = None
+
+    def is_explain_requested(self, request):
+        if not self.allow_explain:
+            return False
+        with timed(self.search_timer, "parse"):
+            data = request.data
+        return isinstance(data, dict) and bool(data.get("explain"))
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.search_timer is None:
+            return
+        if self.is_explain_requested(request) or (
+            random.random() < search_service_settings.EXPLAIN_SAMPLE_RATE
+        ):
+            self.query_explainer = QueryExplainer(self.search_timer)
+
+    def explain_execute_wrapper(self, execute, sql, params, many, context):
+        if self.query_explainer is None:
+            return execute(sql, params, many, context)
+        return self.query_explainer.execute_wrapper(execute, sql, params, many, context)
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.search_timer is None:
+            return super().dispatch(request, *args, **kwargs)
+        with connection.execute_wrapper(self.explain_execute_wrapper):
+            response = super().dispatch(request, *args, **kwargs)
+        if (explainer := self.query_explainer) is None or not explainer.queries:
+            return response
+        with timed(self.search_timer, "explain"):
+            plans = explainer.get_plans()
+        explained_plans.append(
+            {
+                "time": datetime.now(timezone.utc).isoformat(),
+                "view": self.__class__.__name__,
+                "action": self.action,
+                "path": request.path,
+                "plans": plans,
+            }
+        )
+        if (
+            self.is_explain_requested(self.request)
+            and isinstance(response, Response)
+            and isinstance(response.data, dict)
+        ):
+            response.data.setdefault("debug", {})["explain"] = plans
+        return response
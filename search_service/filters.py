@@ -2,6 +2,7 @@ import logging
 
 from django.contrib.postgres.search import SearchRank
 from django.db.models import (
+    Exists,
     F,
     Max,
     OuterRef,
@@ -14,7 +15,15 @@ from django.db.models import (
 from rest_framework.filters import BaseFilterBackend
 from django.contrib.postgres.search import SearchQuery, SearchRank, SearchHeadline
 from django.db.models.functions import Concat
-from .models import Indexable, BaseSearchResource, JSONResource, ResourceRelationship
+from .models import (
+    Indexable,
+    BaseSearchResource,
+    FacetField,
+    JSONResource,
+    ResourceRelationship,
+)
+from .ranking import indexable_headline, indexable_rank
+from .utils import is_field_included
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +54,30 @@ class AuthContextsFilter(BaseFilterBackend):
         return queryset
 
 
+class FacetFieldContextsFilter(BaseFilterBackend):
+    """Filters a FacetField queryset by the contexts set in the `auth` of the
+    request, and by the `contexts` and `contexts_all` of the search query.
+    For `contexts_all`, the facet fields must be in each of the contexts.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if request.auth and (contexts := request.auth.get("contexts")):
+            queryset = queryset.filter(context__urn__in=contexts)
+        if contexts := request.data.get("contexts"):
+            queryset = queryset.filter(context__urn__in=contexts)
+        for context in request.data.get("contexts_all") or []:
+            queryset = queryset.filter(
+                Exists(
+                    FacetField.objects.filter(
+                        context__urn__iexact=context,
+                        type=OuterRef("type"),
+                        subtype=OuterRef("subtype"),
+                    )
+                )
+            )
+        return queryset
+
+
 class GenericFilter(BaseFilterBackend):
     def filter_queryset(self, request, queryset, view):
         """
@@ -62,29 +95,33 @@ class GenericFilter(BaseFilterBackend):
                 if (
                     search_query := request.data.get("headline_query", None)
                 ) is not None:
-                    queryset = (
-                        queryset.annotate(
-                            rank=SearchRank(
-                                F("search_vector"), search_query, cover_density=True
-                            ),
-                            snippet=Concat(
-                                Value("'"),
-                                SearchHeadline(
-                                    "original_content",
-                                    search_query,
-                                    max_words=50,
-                                    min_words=25,
-                                    max_fragments=3,
-                                ),
-                                output_field=CharField(),
-                            ),
-                            fullsnip=SearchHeadline(
-                                "indexable_text",
+                    # Headlines are only generated for the fields in the
+                    # sparse fieldset of the request
+                    headlines = {}
+                    if is_field_included(request.data, "snippet"):
+                        # The passages are of the indexable_text, so the
+                        # snippet is from the whole original_content
+                        headlines["snippet"] = Concat(
+                            Value("'"),
+                            SearchHeadline(
+                                "original_content",
                                 search_query,
-                                start_sel="<b>",
-                                stop_sel="</b>",
-                                highlight_all=True,
+                                max_words=50,
+                                min_words=25,
+                                max_fragments=3,
                             ),
+                            output_field=CharField(),
+                        )
+                    if is_field_included(request.data, "fullsnip"):
+                        headlines["fullsnip"] = indexable_headline(
+                            search_query,
+                            start_sel="<b>",
+                            stop_sel="</b>",
+                            highlight_all=True,
+                        )
+                    queryset = (
+                        queryset.annotate(
+                            rank=indexable_rank(search_query), **headlines
                         )
                         .filter(_filter, rank__gt=0.0)
                         .order_by("-rank")
@@ -122,21 +159,20 @@ class ResourceFilter(BaseFilterBackend):
         if (_resource_filters := request.data.get("resource_filters", None)) and type(
             _resource_filters
         ) == list:
-            if queryset.first():
-                resource_filter_q = [
-                    Q(
-                        **{
-                            f"{query_prefix}"
-                            + f"{resource_filter_item['resource_class']}__"
-                            + f"{resource_filter_item['field']}__{resource_filter_item['operator']}": resource_filter_item[
-                                "value"
-                            ]
-                        }
-                    )
-                    for resource_filter_item in _resource_filters
-                ]
-                for f in resource_filter_q:
-                    queryset = queryset.filter(*(f,))
+            resource_filter_q = [
+                Q(
+                    **{
+                        f"{query_prefix}"
+                        + f"{resource_filter_item['resource_class']}__"
+                        + f"{resource_filter_item['field']}__{resource_filter_item['operator']}": resource_filter_item[
+                            "value"
+                        ]
+                    }
+                )
+                for resource_filter_item in _resource_filters
+            ]
+            for f in resource_filter_q:
+                queryset = queryset.filter(*(f,))
         return queryset.prefetch_related("relationship_sources")
 
 
@@ -148,15 +184,11 @@ class FacetFilter(BaseFilterBackend):
         facetable = queryset
         filter_facetable_resources = request.data.get("facet_on", None)
         if (
-            filter_facetable_resources and queryset
+            filter_facetable_resources
         ):  # Facet on something other than the original queryset
-            facetable = (
-                queryset.first()
-                .__class__.objects.all()
-                .filter(
-                    filter_facetable_resources,
-                    id__in=queryset.values("relationship_sources__target_id"),
-                )
+            facetable = queryset.model.objects.filter(
+                filter_facetable_resources,
+                id__in=queryset.values("relationship_sources__target_id"),
             )
         if (
             facet_filter := request.data.get("facet_filters", None)
@@ -182,40 +214,36 @@ class RankSnippetFilter(BaseFilterBackend):
         if (
             search_query := request.data.get("headline_query", None)
         ) is not None and isinstance(search_query, SearchQuery):
-            if queryset:
-                # Create a subquery to produce the matching snippets and ranks
-                # on the Indexables
-                matches = (
-                    Indexable.objects.filter(resource_id=OuterRef("pk"))
-                    .annotate(
-                        highlight=Concat(
-                            Value("'"),
-                            SearchHeadline(
-                                "indexable_text",
-                                search_query,
-                                max_words=50,
-                                min_words=25,
-                                max_fragments=3,
-                            ),
-                            output_field=CharField(),
-                        )
-                    )
-                    .annotate(
-                        rank=SearchRank(
-                            F("search_vector"),
+            # Create a subquery to produce the matching snippets and ranks
+            # on the Indexables
+            matches = (
+                Indexable.objects.filter(resource_id=OuterRef("pk"))
+                .annotate(
+                    highlight=Concat(
+                        Value("'"),
+                        indexable_headline(
                             search_query,
-                            cover_density=True,
-                        )
+                            max_words=50,
+                            min_words=25,
+                            max_fragments=3,
+                        ),
+                        output_field=CharField(),
                     )
-                    .order_by("-rank")
                 )
-                return (
-                    queryset.annotate(  # this will effectively be Max(rank) as we are ordering by descending rank
-                        rank=Subquery(matches.values("rank")[:1]),
-                        snippet=Subquery(matches.values("highlight")[:1]),
-                    )
-                    .filter(rank__gt=0.0)
-                    .order_by("-rank")
-                    .distinct()
+                .annotate(rank=indexable_rank(search_query))
+                .order_by("-rank")
+            )
+            # The snippet is only generated if it is in the sparse fieldset
+            snippet = {}
+            if is_field_included(request.data, "snippet"):
+                snippet["snippet"] = Subquery(matches.values("highlight")[:1])
+            return (
+                queryset.annotate(  # this will effectively be Max(rank) as we are ordering by descending rank
+                    rank=Subquery(matches.values("rank")[:1]),
+                    **snippet,
                 )
+                .filter(rank__gt=0.0)
+                .order_by("-rank")
+                .distinct()
+            )
         return queryset.distinct()
@@ -0,0 +1,105 @@
+"""
+search_service/functions.py - Database functions for the word positions of Indexables,
+and aggregates for the search statistics.
+"""
+
+import logging
+
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import Aggregate, F, FloatField, Func, IntegerField
+
+logger = logging.getLogger(__name__)
+
+# Positions in a tsvector are capped at this value by Postgres.
+MAX_TSVECTOR_POSITION = 16383
+
+
+class WordPositions(Func):
+    """
+    Maps each position in the tsvector of `indexable_text` to the index of the
+    (space separated) word that it was parsed from, i.e. the word index into a
+    box-selector. The tokens that have a position in the tsvector are those
+    that `ts_debug` reports lexemes (or an empty list for stop words) for, and
+    the word index of a token is the number of spaces preceding it.
+    """
+
+    output_field = ArrayField(IntegerField())
+
+    def __init__(self, text="indexable_text", config="language_pg", **extra):
+        super().__init__(F(config), F(text), **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        (config_sql, config_params), (text_sql, text_params) = [
+            compiler.compile(expression) for expression in self.source_expressions
+        ]
+        sql = (
+            "(SELECT array_agg(t.word_index ORDER BY t.ord) FROM ("
+            "SELECT d.ord, d.lexemes, COALESCE(SUM("
+            "LENGTH(d.token) - LENGTH(REPLACE(d.token, ' ', ''))"
+            ") OVER (ORDER BY d.ord ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING)"
+            ", 0) AS word_index "
+            f"FROM ts_debug(COALESCE({config_sql}, get_current_ts_config()::text)"
+            f"::regconfig, COALESCE({text_sql}, '')) WITH ORDINALITY AS "
+            "d(alias, description, token, dictionaries, dictionary, lexemes, ord)"
+            ") AS t WHERE t.lexemes IS NOT NULL)"
+        )
+        return sql, [*config_params, *text_params]
+
+
+class MatchedWordIndexes(Func):
+    """
+    The sorted word indexes of the words in `indexable_text` that match the
+    lexemes (including prefix matches) of a search query, using the positions
+    of those lexemes in the `search_vector` and the `word_positions` map.
+    """
+
+    output_field = ArrayField(IntegerField())
+
+    def __init__(
+        self,
+        search_query,
+        word_positions="word_positions",
+        search_vector="search_vector",
+        **extra,
+    ):
+        super().__init__(F(word_positions), F(search_vector), search_query, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        (
+            (word_positions_sql, word_positions_params),
+            (search_vector_sql, search_vector_params),
+            (query_sql, query_params),
+        ) = [compiler.compile(expression) for expression in self.source_expressions]
+        sql = (
+            f"(SELECT array_agg(DISTINCT {word_positions_sql}[p.position] "
+            f"ORDER BY {word_positions_sql}[p.position]) "
+            f"FROM unnest({search_vector_sql}) AS l(lexeme, positions, weights), "
+            "unnest(l.positions) AS p(position) "
+            f"WHERE p.position < {MAX_TSVECTOR_POSITION} "
+            f"AND {word_positions_sql}[p.position] IS NOT NULL "
+            # Negated (!) lexemes of the query aren't matches
+            "AND EXISTS (SELECT 1 FROM regexp_matches("
+            f"querytree({query_sql})::text, '(!?)''([^'']+)''(:\\*)?', 'g') AS m "
+            "WHERE m[1] = '' AND (l.lexeme = m[2] OR "
+            "(m[3] IS NOT NULL AND LEFT(l.lexeme, LENGTH(m[2])) = m[2]))))"
+        )
+        return sql, [
+            *word_positions_params,
+            *word_positions_params,
+            *search_vector_params,
+            *word_positions_params,
+            *query_params,
+        ]
+
+
+class Percentile(Aggregate):
+    """The (continuous) `percentile` of the values of an expression, e.g.
+    Percentile("duration", 0.95) for the 95th percentile.
+    """
+
+    function = "percentile_cont"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models import FacetField
+
+
+class Command(BaseCommand):
+    help = "Rebuild the FacetField catalog from the facet fields of the Indexables."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            FacetField.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {FacetField.objects.count()} facet fields.")
+        )
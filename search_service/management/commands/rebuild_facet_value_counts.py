@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models import FacetValueCount
+
+
+class Command(BaseCommand):
+    help = "Rebuild the FacetValueCount summary from the FacetValues."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            FacetValueCount.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {FacetValueCount.objects.count()} facet value counts."
+            )
+        )
@@ -0,0 +1,159 @@
+import json
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def is_error(status, recorded_status):
+    """Whether the replayed search failed: without a response, with a server
+    error, or with a client error that the recorded search didn't have.
+    """
+    if status is None or status >= 500:
+        return True
+    return status >= 400 and status != recorded_status
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the searches recorded (with SEARCH_RECORDING_FILE) against an "
+        "instance of the search service, and report the throughput, latency "
+        "percentiles (ms) and error rate of each view, action and search "
+        "fingerprint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="NDJSON file of recorded searches.")
+        parser.add_argument(
+            "--url",
+            default="http://localhost:8000",
+            help="Base URL of the instance to replay the searches against.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Number of searches to run at once.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Number of times to replay the recorded searches.",
+        )
+        parser.add_argument(
+            "--limit", type=int, help="Only replay the first number of searches."
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=30, help="Timeout (s) of each search."
+        )
+        parser.add_argument("--output", help="Write the report as JSON to a file.")
+
+    def load_searches(self, path, limit=None):
+        searches = []
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        searches.append(json.loads(line))
+                    if limit is not None and len(searches) >= limit:
+                        break
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Failed to load the recorded searches: {e}")
+        return searches
+
+    def get_request(self, base_url, search):
+        url = base_url.rstrip("/") + search["path"]
+        if search.get("query"):
+            url = f"{url}?{urlencode(search['query'], doseq=True)}"
+        data = None
+        if search.get("body") is not None:
+            body = search["body"]
+            data = (body if isinstance(body, str) else json.dumps(body)).encode()
+        headers = {"Content-Type": "application/json", **search.get("headers", {})}
+        return Request(url, data=data, headers=headers, method=search["method"])
+
+    def replay(self, request, timeout):
+        """Run the request, returning its duration (ms) and its status (or
+        None where it failed without a response).
+        """
+        start = time.perf_counter()
+        try:
+            with urlopen(request, timeout=timeout) as response:
+                response.read()
+                status = response.status
+        except HTTPError as e:
+            status = e.code
+        except (URLError, OSError):
+            status = None
+        return (time.perf_counter() - start) * 1000, status
+
+    def handle(self, *args, **options):
+        searches = self.load_searches(options["file"], options["limit"])
+        if not searches:
+            raise CommandError("There are no recorded searches to replay.")
+        searches = searches * options["repeat"]
+        requests = [self.get_request(options["url"], s) for s in searches]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(
+                executor.map(lambda r: self.replay(r, options["timeout"]), requests)
+            )
+        elapsed = time.perf_counter() - start
+
+        groups = defaultdict(list)
+        for search, result in zip(searches, results):
+            key = (
+                f"{search.get('view')}.{search.get('action')} / "
+                f"{search.get('fingerprint')}"
+            )
+            duration, status = result
+            groups[key].append((duration, is_error(status, search.get("status"))))
+        report = {
+            "searches": len(searches),
+            "duration": round(elapsed, 3),
+            "throughput": round(len(searches) / elapsed, 2),
+            "concurrency": options["concurrency"],
+            "fingerprints": [],
+        }
+        for key, group in sorted(groups.items(), key=lambda g: -len(g[1])):
+            durations = [duration for duration, _ in group]
+            errors = len([error for _, error in group if error])
+            report["fingerprints"].append(
+                {
+                    "fingerprint": key,
+                    "count": len(group),
+                    "throughput": round(len(group) / elapsed, 2),
+                    "p50": round(percentile(durations, 0.5), 1),
+                    "p95": round(percentile(durations, 0.95), 1),
+                    "p99": round(percentile(durations, 0.99), 1),
+                    "error_rate": round(errors / len(group), 4),
+                }
+            )
+
+        self.stdout.write(
+            f"Replayed {report['searches']} searches in {report['duration']}s "
+            f"({report['throughput']}/s, concurrency {report['concurrency']})"
+        )
+        self.stdout.write(
+            f"{'count':>7} {'per s':>8} {'p50':>10} {'p95':>10} {'p99':>10} "
+            f"{'errors':>7}  view.action / fingerprint"
+        )
+        for row in report["fingerprints"]:
+            self.stdout.write(
+                f"{row['count']:>7} {row['throughput']:>8.2f} {row['p50']:>10.1f} "
+                f"{row['p95']:>10.1f} {row['p99']:>10.1f} "
+                f"{row['error_rate']:>7.1%}  {row['fingerprint']}"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
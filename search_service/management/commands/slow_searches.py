@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from ...functions import Percentile
+from ...models import SlowSearch
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the count, median, 95th percentile and maximum durations (ms) "
+        "of the slow searches of each view, action and search fingerprint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=float,
+            default=7,
+            help="Only include slow searches of the last number of days.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Number of fingerprints to report, slowest (by p95) first.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete the slow searches older than --days.",
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options["days"])
+        if options["clear"]:
+            deleted, _ = SlowSearch.objects.filter(created__lt=since).delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} slow searches."))
+            return
+        fingerprints = (
+            SlowSearch.objects.filter(created__gte=since)
+            .values("view", "action", "fingerprint")
+            .annotate(
+                count=Count("id"),
+                p50=Percentile("duration", 0.5),
+                p95=Percentile("duration", 0.95),
+                max=Max("duration"),
+            )
+            .order_by("-p95")[: options["limit"]]
+        )
+        self.stdout.write(
+            f"{'count':>7} {'p50':>10} {'p95':>10} {'max':>10}  view.action / fingerprint"
+        )
+        for row in fingerprints:
+            self.stdout.write(
+                f"{row['count']:>7} {row['p50']:>10.1f} {row['p95']:>10.1f} "
+                f"{row['max']:>10.1f}  {row['view']}.{row['action']} / {row['fingerprint']}"
+            )
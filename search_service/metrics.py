@@ -0,0 +1,442 @@
+"""
+search_service/metrics.py - Registry of the indexing and search metrics, for Prometheus.
+
+The metrics are counters, gauges and histograms, with labels, that are kept
+in memory by each process. Where `METRICS_DIR` is set (e.g. for multi-process
+gunicorn workers), each process also writes its values to its own file in
+that directory (at most every `METRICS_FLUSH_INTERVAL` seconds, and at the
+end of that interval after its last change), and the values of all of the
+processes are aggregated when they are collected: the counters and
+histograms are summed over all of the files, and the gauges over those of
+processes that are still running. The files of processes that have exited
+are merged into a single archive file as they are collected, so that their
+counts are kept without a file for each (recycled) worker.
+"""
+
+import atexit
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import monotonic
+
+from .settings import search_service_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+
+class Metric(object):
+    type = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def label_values(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def merge(self, value, other):
+        return value + other
+
+    def initial_value(self):
+        return 0.0
+
+    def update(self, labels, update):
+        key = self.label_values(labels)
+        with self.registry.lock:
+            self.values[key] = update(self.values.get(key, self.initial_value()))
+        self.registry.changed()
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        self.update(labels, lambda value: value + amount)
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, amount=1, **labels):
+        self.update(labels, lambda value: value + amount)
+
+    def dec(self, amount=1, **labels):
+        self.update(labels, lambda value: value - amount)
+
+    def set(self, value, **labels):
+        self.update(labels, lambda _: value)
+
+
+class Histogram(Metric):
+    """Histogram of observations, whose value (for each set of labels) is the
+    (non-cumulative) count of each bucket, with a last bucket for +Inf, and
+    then the sum of the observations.
+    """
+
+    type = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=None):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets or DEFAULT_BUCKETS)
+
+    def initial_value(self):
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def merge(self, value, other):
+        return [v + o for v, o in zip(value, other)]
+
+    def observe(self, amount, **labels):
+        bucket = bisect_left(self.buckets, amount)
+
+        def add(value):
+            value = list(value)
+            value[bucket] += 1
+            value[-1] += amount
+            return value
+
+        self.update(labels, add)
+
+
+def escape_label_value(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = [f'{name}="{escape_label_value(value)}"' for name, value in labels]
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def is_process_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MetricsRegistry(object):
+    archive_file_name = "metrics_archive.json"
+
+    def __init__(self, metrics_dir=None, flush_interval=5):
+        self.metrics = {}
+        self.lock = threading.RLock()
+        self.metrics_dir = metrics_dir
+        self.flush_interval = flush_interval
+        self.last_flush = None
+        self.flush_timer = None
+
+    def register(self, metric_class, name, *args, **kwargs):
+        with self.lock:
+            if name not in self.metrics:
+                self.metrics[name] = metric_class(self, name, *args, **kwargs)
+            return self.metrics[name]
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=None):
+        return self.register(Histogram, name, documentation, labelnames, buckets)
+
+    @property
+    def file_path(self):
+        return os.path.join(self.metrics_dir, f"metrics_{os.getpid()}.json")
+
+    def snapshot(self):
+        """The values of the metrics of this process, as JSON serializable data."""
+        with self.lock:
+            return {
+                name: [[list(key), value] for key, value in metric.values.items()]
+                for name, metric in self.metrics.items()
+            }
+
+    def changed(self):
+        if self.metrics_dir is None:
+            return
+        with self.lock:
+            elapsed = None if self.last_flush is None else monotonic() - self.last_flush
+            if elapsed is None or elapsed >= self.flush_interval:
+                self.flush()
+            else:
+                self.schedule_flush(self.flush_interval - elapsed)
+
+    def schedule_flush(self, delay):
+        """Flush after `delay` seconds, unless a flush is already scheduled
+        (in this process), so that the last changes of an idle process are
+        written.
+        """
+        timer = self.flush_timer
+        if timer is not None and timer.pid == os.getpid() and timer.is_alive():
+            return
+        self.flush_timer = threading.Timer(delay, self.flush)
+        self.flush_timer.pid = os.getpid()
+        self.flush_timer.daemon = True
+        self.flush_timer.start()
+
+    def write_file(self, path, data):
+        """Write the data to the file at path, through a temporary file of
+        its own, so that the file is never read partly written.
+        """
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.metrics_dir, prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    def flush(self):
+        """Write the values of the metrics of this process to its file."""
+        if self.metrics_dir is None:
+            return
+        with self.lock:
+            self.last_flush = monotonic()
+            data = {"pid": os.getpid(), "metrics": self.snapshot()}
+            try:
+                self.write_file(self.file_path, data)
+            except OSError as e:
+                logger.error(f"Failed to write metrics: ({self.file_path=}, {e})")
+
+    def read_file(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def process_file_paths(self):
+        """The paths of the files of the other processes, with their pids."""
+        for file_name in os.listdir(self.metrics_dir):
+            if not (file_name.startswith("metrics_") and file_name.endswith(".json")):
+                continue
+            pid = file_name[len("metrics_") : -len(".json")]
+            if pid.isdigit() and int(pid) != os.getpid():
+                yield int(pid), os.path.join(self.metrics_dir, file_name)
+
+    def merge_snapshot(self, values, snapshot):
+        """Merge the counters and histograms of a snapshot into values."""
+        for name, metric_values in snapshot.items():
+            metric = self.metrics.get(name)
+            if metric is None or metric.type == "gauge":
+                continue
+            merged = dict((tuple(key), value) for key, value in values.get(name, []))
+            for key, value in metric_values:
+                key = tuple(key)
+                merged[key] = (
+                    metric.merge(merged[key], value) if key in merged else value
+                )
+            values[name] = [[list(key), value] for key, value in merged.items()]
+        return values
+
+    @contextmanager
+    def archive_lock(self, operation):
+        """Lock (with the flock `operation`) the files of the other processes
+        and the archive, which are read under a shared lock, and archived
+        under an exclusive one.
+        """
+        lock_path = os.path.join(self.metrics_dir, f"{self.archive_file_name}.lock")
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, operation)
+            yield
+
+    def archive_exited_processes(self):
+        """Merge the files of the processes that have exited into the archive
+        file, and remove them. This is done under an (exclusive) lock of the
+        archive, so that each file is only merged once.
+        """
+        if self.metrics_dir is None or not os.path.isdir(self.metrics_dir):
+            return
+        archive_path = os.path.join(self.metrics_dir, self.archive_file_name)
+        try:
+            with self.archive_lock(fcntl.LOCK_EX):
+                exited = [
+                    path
+                    for pid, path in self.process_file_paths()
+                    if not is_process_running(pid)
+                ]
+                if not exited:
+                    return
+                archive = (self.read_file(archive_path) or {}).get("metrics", {})
+                for path in exited:
+                    if (data := self.read_file(path)) is not None:
+                        archive = self.merge_snapshot(archive, data.get("metrics", {}))
+                self.write_file(archive_path, {"pid": None, "metrics": archive})
+                for path in exited:
+                    os.unlink(path)
+        except OSError as e:
+            logger.error(f"Failed to archive metrics: ({archive_path=}, {e})")
+
+    def read_process_snapshots(self):
+        """The snapshots of the other processes (and whether each is running),
+        and of the archive of those that have exited.
+        """
+        if self.metrics_dir is None or not os.path.isdir(self.metrics_dir):
+            return []
+        snapshots = []
+        archive_path = os.path.join(self.metrics_dir, self.archive_file_name)
+        try:
+            with self.archive_lock(fcntl.LOCK_SH):
+                for pid, path in self.process_file_paths():
+                    if (data := self.read_file(path)) is not None:
+                        snapshots.append(
+                            (is_process_running(pid), data.get("metrics", {}))
+                        )
+                if (data := self.read_file(archive_path)) is not None:
+                    snapshots.append((False, data.get("metrics", {})))
+        except OSError as e:
+            logger.error(f"Failed to read metrics: ({self.metrics_dir=}, {e})")
+        return snapshots
+
+    def collect(self):
+        """The aggregated values of the metrics of all of the processes, as a
+        dict of metric: {label values: value}.
+        """
+        self.archive_exited_processes()
+        snapshots = [(True, self.snapshot())] + self.read_process_snapshots()
+        collected = {}
+        with self.lock:
+            metrics = list(self.metrics.values())
+        for metric in metrics:
+            values = {}
+            for running, snapshot in snapshots:
+                if metric.type == "gauge" and not running:
+                    continue
+                for key, value in snapshot.get(metric.name, []):
+                    key = tuple(key)
+                    if key in values:
+                        values[key] = metric.merge(values[key], value)
+                    else:
+                        values[key] = value
+            collected[metric] = values
+        return collected
+
+    def exposition(self):
+        """The metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric, values in self.collect().items():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for key, value in sorted(values.items()):
+                labels = list(zip(metric.labelnames, key))
+                if metric.type != "histogram":
+                    lines.append(
+                        f"{metric.name}{format_labels(labels)} {format_number(value)}"
+                    )
+                    continue
+                cumulative = 0
+                for le, count in zip(metric.buckets + (float("inf"),), value):
+                    cumulative += count
+                    bucket_labels = format_labels(labels + [("le", format_number(le))])
+                    lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(
+                    f"{metric.name}_sum{format_labels(labels)} {format_number(value[-1])}"
+                )
+                lines.append(f"{metric.name}_count{format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(
+    metrics_dir=search_service_settings.METRICS_DIR,
+    flush_interval=search_service_settings.METRICS_FLUSH_INTERVAL,
+)
+atexit.register(registry.flush)
+
+# Indexing
+indexables_written = registry.counter(
+    "search_service_indexables_written_total",
+    "Number of indexables written by indexing tasks.",
+    ["model"],
+)
+indexing_duration = registry.histogram(
+    "search_service_indexing_duration_seconds",
+    "Duration of indexing tasks.",
+    ["model"],
+)
+indexing_failures = registry.counter(
+    "search_service_indexing_failures_total",
+    "Number of indexing tasks that failed.",
+    ["model"],
+)
+indexing_in_progress = registry.gauge(
+    "search_service_indexing_in_progress",
+    "Number of indexing tasks that are running.",
+    ["model"],
+)
+
+# Search
+search_duration = registry.histogram(
+    "search_service_search_duration_seconds",
+    "Duration of search requests.",
+    ["view", "action"],
+)
+facet_duration = registry.histogram(
+    "search_service_facet_duration_seconds",
+    "Duration of the facets stage of search requests.",
+    ["view"],
+)
+search_results = registry.histogram(
+    "search_service_search_results",
+    "Number of results of search requests.",
+    ["view"],
+    buckets=COUNT_BUCKETS,
+)
+search_timeouts = registry.counter(
+    "search_service_search_timeouts_total",
+    "Number of search stages cancelled by their statement timeout.",
+    ["view", "stage"],
+)
+search_cost_guard = registry.counter(
+    "search_service_search_cost_guard_total",
+    "Number of expensive searches rejected or rewritten by the cost guard.",
+    ["view", "result"],
+)
+cache_requests = registry.counter(
+    "search_service_cache_requests_total",
+    "Number of lookups in the in-process caches, by whether they were hits.",
+    ["cache", "result"],
+)
+
+
+def record_search_metrics(view, response, timings):
+    """Record the metrics of a search request from its timings (in ms)."""
+    from .slowlog import get_result_count
+
+    view_name = view.__class__.__name__
+    search_duration.observe(
+        timings["duration"] / 1000, view=view_name, action=view.action
+    )
+    for stage in timings["stages"]:
+        if stage["name"] == "facets":
+            facet_duration.observe(stage["duration"] / 1000, view=view_name)
+    result_count = get_result_count(getattr(response, "data", None))
+    if result_count is not None:
+        search_results.observe(result_count, view=view_name)
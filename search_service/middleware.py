@@ -0,0 +1,86 @@
+"""
+search_service/middleware.py - Middleware for inspecting the cost of search service requests.
+"""
+
+import logging
+import random
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .profiling import start_profile, stop_profile
+from .settings import search_service_settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCountMiddleware:
+    """Adds an `X-Query-Count` header with the number of database queries made
+    by the request. Only enabled when DEBUG is on, as every query is recorded.
+    """
+
+    header = "X-Query-Count"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DEBUG:
+            return self.get_response(request)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_response(request)
+        response[self.header] = str(len(queries))
+        return response
+
+
+class SamplingProfilerMiddleware:
+    """Profiles the requests to the views that set `profiled` (i.e. the search
+    and indexing viewsets) with the sampling profiler: a sample of them
+    (`PROFILE_SAMPLE_RATE`), those over the `PROFILE_THRESHOLD`, and, on the
+    views that set `allow_profile`, those with an `X-Profile` header. The
+    profiles are listed by the profiles endpoint.
+
+    Where neither the sample rate nor the threshold is set, and the header
+    isn't sent, a request isn't profiled and the sampler thread isn't run.
+    """
+
+    header = "X-Profile"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def get_profile_reason(self, request, view_class):
+        if getattr(view_class, "allow_profile", False) and request.headers.get(
+            self.header
+        ):
+            return "requested"
+        if random.random() < search_service_settings.PROFILE_SAMPLE_RATE:
+            return "sampled"
+        if search_service_settings.PROFILE_THRESHOLD is not None:
+            return "threshold"
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "cls", None)
+        if not getattr(view_class, "profiled", False):
+            return None
+        reason = self.get_profile_reason(request, view_class)
+        if reason is not None:
+            actions = getattr(view_func, "actions", None) or {}
+            request.search_service_profile = start_profile(
+                reason,
+                view=view_class.__name__,
+                action=actions.get(request.method.lower()),
+                method=request.method,
+                path=request.path,
+            )
+        return None
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            profile = getattr(request, "search_service_profile", None)
+            if profile is not None:
+                stop_profile(profile)
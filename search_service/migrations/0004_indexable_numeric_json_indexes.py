@@ -0,0 +1,26 @@
+# Generated by Django 4.1.13 on 2026-10-19 00:55
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search_service', '0003_jsonresource_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='indexable',
+            index=models.Index(fields=['type', 'subtype', 'indexable_int'], name='search_serv_type_b79e96_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indexable',
+            index=models.Index(fields=['type', 'subtype', 'indexable_float'], name='search_serv_type_411142_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='indexable',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['indexable_json'], name='indexable_json_path_ops', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.1.13 on 2026-10-19 00:57
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+from django.db.models import Q
+import django.db.models.deletion
+import django.db.models.functions.text
+import unicodedata
+from functools import reduce
+from operator import or_
+
+
+def populate_facet_values(apps, schema_editor):
+    """Backfill the FacetValue table from the existing facet type Indexables."""
+    from search_service.settings import search_service_settings
+
+    Indexable = apps.get_model("search_service", "Indexable")
+    FacetValue = apps.get_model("search_service", "FacetValue")
+    facet_values = []
+    facet_types_q = reduce(
+        or_,
+        [Q(type__iexact=t) for t in search_service_settings.FACET_VALUE_TYPES],
+        Q(pk__in=[]),
+    )
+    for indexable in Indexable.objects.filter(facet_types_q).iterator(
+        chunk_size=2000
+    ):
+        facet_values.append(
+            FacetValue(
+                indexable_id=indexable.id,
+                resource_content_type_id=indexable.resource_content_type_id,
+                resource_id=indexable.resource_id,
+                type=indexable.type,
+                subtype=indexable.subtype,
+                group_id=indexable.group_id,
+                value=indexable.indexable_text,
+                normalized_value=unicodedata.normalize(
+                    "NFC", indexable.indexable_text
+                ).casefold(),
+                language_iso639_2=indexable.language_iso639_2,
+                language_iso639_1=indexable.language_iso639_1,
+            )
+        )
+        if len(facet_values) >= 2000:
+            FacetValue.objects.bulk_create(facet_values)
+            facet_values = []
+    FacetValue.objects.bulk_create(facet_values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('search_service', '0004_indexable_numeric_json_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetValue',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('resource_id', models.UUIDField()),
+                ('type', models.CharField(max_length=64)),
+                ('subtype', models.CharField(max_length=256)),
+                ('group_id', models.CharField(blank=True, max_length=512, null=True)),
+                ('value', models.TextField()),
+                ('normalized_value', models.TextField()),
+                ('language_iso639_2', models.CharField(blank=True, max_length=3, null=True)),
+                ('language_iso639_1', models.CharField(blank=True, max_length=2, null=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='indexable',
+            name='search_serv_indexab_1e44d5_hash',
+        ),
+        migrations.AddField(
+            model_name='facetvalue',
+            name='indexable',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facet_values', to='search_service.indexable'),
+        ),
+        migrations.AddField(
+            model_name='facetvalue',
+            name='resource_content_type',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype'),
+        ),
+        migrations.AddIndex(
+            model_name='facetvalue',
+            index=models.Index(fields=['resource_id', 'type', 'subtype'], name='search_serv_resourc_5eef83_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facetvalue',
+            index=models.Index(django.db.models.functions.text.Upper('type'), django.db.models.functions.text.Upper('subtype'), name='facet_uppercase_type_subtype'),
+        ),
+        migrations.AddIndex(
+            model_name='facetvalue',
+            index=django.contrib.postgres.indexes.HashIndex(fields=['normalized_value'], name='search_serv_normali_3571ee_hash'),
+        ),
+        migrations.RunPython(populate_facet_values, migrations.RunPython.noop),
+    ]
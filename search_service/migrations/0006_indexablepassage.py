@@ -0,0 +1,33 @@
+# Generated by Django 4.1.13 on 2026-10-19 00:59
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search_service', '0005_facetvalue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexablePassage',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('word_offset', models.PositiveIntegerField()),
+                ('passage_text', models.TextField()),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(blank=True, null=True)),
+                ('indexable', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='passages', to='search_service.indexable')),
+            ],
+            options={
+                'ordering': ['word_offset'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='indexablepassage',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='search_serv_search__e78e1a_gin'),
+        ),
+    ]
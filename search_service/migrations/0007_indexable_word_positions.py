@@ -0,0 +1,30 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:02
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+def populate_word_positions(apps, schema_editor):
+    """Backfill the word positions of the existing Indexables with a box-selector."""
+    from search_service.functions import WordPositions
+
+    Indexable = apps.get_model("search_service", "Indexable")
+    Indexable.objects.filter(selector__has_key="box-selector").update(
+        word_positions=WordPositions()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search_service', '0006_indexablepassage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='indexable',
+            name='word_positions',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, null=True, size=None, verbose_name='Word index of each position in the search_vector'),
+        ),
+        migrations.RunPython(populate_word_positions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search_service", "0007_indexable_word_positions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="indexable",
+            name="packed_boxes",
+            field=models.BinaryField(
+                blank=True,
+                null=True,
+                verbose_name="Box-selector packed as int32 x, y, w, h values",
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.text
+
+
+def populate_facet_fields(apps, schema_editor):
+    """Backfill the FacetField catalog from the existing Indexables."""
+    Indexable = apps.get_model("search_service", "Indexable")
+    FacetField = apps.get_model("search_service", "FacetField")
+    FacetField.objects.bulk_create(
+        [
+            FacetField(
+                context_id=context_id,
+                type=type,
+                subtype=subtype,
+                indexable_count=count,
+            )
+            for context_id, type, subtype, count in Indexable.objects.exclude(
+                subtype=""
+            )
+            .order_by()
+            .values_list("contexts", "type", "subtype")
+            .annotate(count=models.Count("id"))
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search_service", "0008_indexable_packed_boxes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FacetField",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("type", models.CharField(max_length=64)),
+                ("subtype", models.CharField(max_length=256)),
+                ("indexable_count", models.IntegerField(default=0)),
+                (
+                    "context",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet_fields",
+                        to="search_service.context",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="facetfield",
+            index=models.Index(
+                django.db.models.functions.text.Upper("type"),
+                name="facet_field_uppercase_type",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="facetfield",
+            constraint=models.UniqueConstraint(
+                fields=("context", "type", "subtype"), name="unique_facet_field"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="facetfield",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("context__isnull", True)),
+                fields=("type", "subtype"),
+                name="unique_facet_field_without_context",
+            ),
+        ),
+        migrations.RunPython(populate_facet_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_facet_value_counts(apps, schema_editor):
+    """Backfill the FacetValueCount summary from the existing FacetValues."""
+    FacetValue = apps.get_model("search_service", "FacetValue")
+    FacetValueCount = apps.get_model("search_service", "FacetValueCount")
+    FacetValueCount.objects.bulk_create(
+        [
+            FacetValueCount(
+                context_id=context_id,
+                resource_content_type_id=resource_content_type_id,
+                type=type,
+                subtype=subtype,
+                group_id=group_id,
+                value=value,
+                language_iso639_2=language_iso639_2,
+                language_iso639_1=language_iso639_1,
+                indexable_count=count,
+            )
+            for (
+                context_id,
+                resource_content_type_id,
+                type,
+                subtype,
+                group_id,
+                value,
+                language_iso639_2,
+                language_iso639_1,
+                count,
+            ) in FacetValue.objects.order_by()
+            .values_list(
+                "indexable__contexts",
+                "resource_content_type",
+                "type",
+                "subtype",
+                "group_id",
+                "value",
+                "language_iso639_2",
+                "language_iso639_1",
+            )
+            .annotate(count=models.Count("id"))
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("search_service", "0009_facetfield"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FacetValueCount",
+            fields=[
+                ("indexable_count", models.IntegerField(default=0)),
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("type", models.CharField(max_length=64)),
+                ("subtype", models.CharField(max_length=256)),
+                ("group_id", models.CharField(blank=True, max_length=512, null=True)),
+                ("value", models.TextField()),
+                (
+                    "language_iso639_2",
+                    models.CharField(blank=True, max_length=3, null=True),
+                ),
+                (
+                    "language_iso639_1",
+                    models.CharField(blank=True, max_length=2, null=True),
+                ),
+                (
+                    "context",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet_value_counts",
+                        to="search_service.context",
+                    ),
+                ),
+                (
+                    "resource_content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="facetvaluecount",
+            index=models.Index(
+                fields=["context", "resource_content_type", "type"],
+                name="search_serv_context_b38538_idx",
+            ),
+        ),
+        migrations.RunPython(populate_facet_value_counts, migrations.RunPython.noop),
+    ]
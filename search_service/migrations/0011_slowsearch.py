@@ -0,0 +1,36 @@
+# Generated by Django 4.1.13 on 2026-10-19 01:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search_service", "0010_facetvaluecount"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowSearch",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("created", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("view", models.CharField(max_length=128)),
+                ("action", models.CharField(blank=True, max_length=64, null=True)),
+                ("fingerprint", models.CharField(max_length=1024)),
+                ("duration", models.FloatField(verbose_name="Duration (ms)")),
+                ("result_count", models.IntegerField(blank=True, null=True)),
+                ("timings", models.JSONField(default=list)),
+            ],
+            options={
+                "ordering": ["-created"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="slowsearch",
+            index=models.Index(
+                fields=["view", "action", "fingerprint"],
+                name="search_serv_view_261728_idx",
+            ),
+        ),
+    ]
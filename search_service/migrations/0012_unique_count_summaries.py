@@ -0,0 +1,98 @@
+# Generated by Django 4.1.13 on 2026-10-19 02:36
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+import uuid
+
+
+def merge_duplicate_facet_value_counts(apps, schema_editor):
+    """Count the blank group ids and languages of the FacetValueCount rows as
+    null, and merge the rows duplicated by concurrent indexing into one, with
+    their total count, before they are made unique.
+    """
+    FacetValueCount = apps.get_model("search_service", "FacetValueCount")
+    for field in ["group_id", "language_iso639_2", "language_iso639_1"]:
+        FacetValueCount.objects.filter(**{field: ""}).update(**{field: None})
+    fields = [
+        "context",
+        "resource_content_type",
+        "type",
+        "subtype",
+        "group_id",
+        "value",
+        "language_iso639_2",
+        "language_iso639_1",
+    ]
+    duplicates = (
+        FacetValueCount.objects.order_by()
+        .values(*fields)
+        .annotate(
+            rows=models.Count("id"),
+            total=models.Sum("indexable_count"),
+            first_id=models.Min("id"),
+        )
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates:
+        rows = FacetValueCount.objects.filter(
+            **{field: duplicate[field] for field in fields}
+        )
+        rows.exclude(id=duplicate["first_id"]).delete()
+        rows.update(indexable_count=duplicate["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search_service", "0011_slowsearch"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_facet_value_counts, migrations.RunPython.noop
+        ),
+        migrations.RemoveConstraint(
+            model_name="facetfield",
+            name="unique_facet_field",
+        ),
+        migrations.RemoveConstraint(
+            model_name="facetfield",
+            name="unique_facet_field_without_context",
+        ),
+        migrations.AddConstraint(
+            model_name="facetfield",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.comparison.Coalesce(
+                    "context",
+                    models.Value(uuid.UUID("00000000-0000-0000-0000-000000000000")),
+                ),
+                models.F("type"),
+                models.F("subtype"),
+                name="unique_facet_field",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="facetvaluecount",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.comparison.Coalesce(
+                    "context",
+                    models.Value(uuid.UUID("00000000-0000-0000-0000-000000000000")),
+                ),
+                models.F("resource_content_type"),
+                models.F("type"),
+                models.F("subtype"),
+                django.db.models.functions.comparison.Coalesce(
+                    "group_id", models.Value("")
+                ),
+                django.db.models.functions.text.MD5("value"),
+                django.db.models.functions.comparison.Coalesce(
+                    "language_iso639_2", models.Value("")
+                ),
+                django.db.models.functions.comparison.Coalesce(
+                    "language_iso639_1", models.Value("")
+                ),
+                name="unique_facet_value_count",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.13 on 2026-10-19 02:44
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search_service", "0012_unique_count_summaries"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="facetvalue",
+            name="facet_uppercase_type_subtype",
+        ),
+        migrations.AddIndex(
+            model_name="facetvalue",
+            index=models.Index(
+                django.db.models.functions.text.Upper("type"),
+                django.db.models.functions.text.Upper("subtype"),
+                models.F("normalized_value"),
+                django.db.models.functions.text.Upper("group_id"),
+                include=("resource_id",),
+                name="facet_value_covering",
+            ),
+        ),
+    ]
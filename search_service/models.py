@@ -1,14 +1,21 @@
 import logging
+import uuid
 
-from django.db import models
+from django.db import connection, models
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.indexes import GinIndex, HashIndex
 from django.contrib.postgres.search import SearchVectorField, SearchVector
-from django.db.models.functions import Upper
+from django.db.models.functions import MD5, Coalesce, NullIf, Upper
 from django.utils.translation import gettext_lazy as _
 from model_utils.models import TimeStampedModel, UUIDModel
 
+from .boxes import gather_boxes, pack_boxes, unpack_selector
+from .functions import WordPositions
+from .settings import search_service_settings
+from .utils import is_facet_value_type, normalize_facet_value
+
 logger = logging.getLogger(__name__)
 
 
@@ -67,8 +74,55 @@ class Indexable(UUIDModel, TimeStampedModel):
     language_display = models.CharField(max_length=64, blank=True, null=True)
     language_pg = models.CharField(max_length=64, blank=True, null=True)
     selector = models.JSONField(blank=True, null=True)
+    packed_boxes = models.BinaryField(
+        blank=True,
+        null=True,
+        verbose_name=_("Box-selector packed as int32 x, y, w, h values"),
+    )
+    word_positions = ArrayField(
+        models.IntegerField(),
+        blank=True,
+        null=True,
+        verbose_name=_("Word index of each position in the search_vector"),
+    )
+
+    def get_selector(self):
+        """The selector, with the box-selector unpacked if it has been packed."""
+        return unpack_selector(self.selector, self.packed_boxes)
+
+    def get_boxes(self, indexes):
+        """The box-selector boxes at the given word indexes."""
+        if self.packed_boxes is not None:
+            return gather_boxes(self.packed_boxes, indexes)
+        box_list = []
+        if self.selector and (boxes := self.selector.get("box-selector")) is not None:
+            for x in indexes:
+                try:
+                    box_list.append(boxes[x])
+                except (IndexError, ValueError, TypeError):
+                    pass
+        return box_list
+
+    def pack_box_selector(self):
+        """Move the box-selector from the selector JSON to the `packed_boxes`,
+        if the `PACK_BOX_SELECTORS` setting is enabled. A box-selector in the
+        selector JSON always replaces any previously packed boxes.
+        """
+        if not (self.selector and "box-selector" in self.selector):
+            return
+        packed = None
+        if search_service_settings.PACK_BOX_SELECTORS:
+            packed = pack_boxes(self.selector["box-selector"])
+        self.packed_boxes = packed
+        if packed is not None:
+            self.selector = {
+                k: v for k, v in self.selector.items() if k != "box-selector"
+            }
 
     def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if "update_fields" not in kwargs:
+            self.pack_box_selector()
         super().save(*args, **kwargs)
         if (
             "update_fields" not in kwargs
@@ -80,7 +134,58 @@ class Indexable(UUIDModel, TimeStampedModel):
                 )
             else:
                 self.search_vector = SearchVector("indexable_text", weight="A")
-            self.save(update_fields=["search_vector"])
+            # Word positions are only needed to find the boxes of matched words
+            if self.packed_boxes is not None or (
+                self.selector and "box-selector" in self.selector
+            ):
+                self.word_positions = WordPositions()
+            else:
+                self.word_positions = None
+            self.save(update_fields=["search_vector", "word_positions"])
+            self.update_facet_value(adding=adding)
+
+    def set_passages(self, passages):
+        """Replace the passages of this indexable, where `passages` is a
+        list of dicts with the `word_offset` and `passage_text` of each.
+        """
+        self.passages.all().delete()
+        IndexablePassage.objects.bulk_create(
+            [
+                IndexablePassage(
+                    indexable=self,
+                    word_offset=passage["word_offset"],
+                    passage_text=passage["passage_text"],
+                )
+                for passage in passages
+            ]
+        )
+        if self.language_pg:
+            search_vector = SearchVector(
+                "passage_text", weight="A", config=self.language_pg
+            )
+        else:
+            search_vector = SearchVector("passage_text", weight="A")
+        self.passages.all().update(search_vector=search_vector)
+
+    def update_facet_value(self, adding=False):
+        """Keep the FacetValue for this indexable in step with its
+        facet fields, for the types set in `FACET_VALUE_TYPES`.
+        """
+        if not adding:
+            self.facet_values.all().delete()
+        if is_facet_value_type(self.type):
+            FacetValue.objects.create(
+                indexable=self,
+                resource_content_type_id=self.resource_content_type_id,
+                resource_id=self.resource_id,
+                type=self.type,
+                subtype=self.subtype,
+                group_id=self.group_id,
+                value=self.indexable_text,
+                normalized_value=normalize_facet_value(self.indexable_text),
+                language_iso639_2=self.language_iso639_2,
+                language_iso639_1=self.language_iso639_1,
+            )
 
     class Meta:
         ordering = ["-modified"]
@@ -102,10 +207,319 @@ class Indexable(UUIDModel, TimeStampedModel):
             models.Index(
                 Upper("type"), Upper("subtype"), name="uppercase_type_subtype"
             ),
-            HashIndex(fields=["indexable_text"]),
+            models.Index(fields=["type", "subtype", "indexable_int"]),
+            models.Index(fields=["type", "subtype", "indexable_float"]),
+            GinIndex(
+                fields=["indexable_json"],
+                opclasses=["jsonb_path_ops"],
+                name="indexable_json_path_ops",
+            ),
         ]
 
 
+class IndexablePassage(models.Model):
+    """A bounded length passage of the `indexable_text` of a long Indexable,
+    starting at `word_offset` words into that text. Where an indexable has
+    passages, ranking and headlines use its best matching passage rather
+    than the whole text.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    indexable = models.ForeignKey(
+        Indexable, on_delete=models.CASCADE, related_name="passages"
+    )
+    word_offset = models.PositiveIntegerField()
+    passage_text = models.TextField()
+    search_vector = SearchVectorField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["word_offset"]
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+        ]
+
+
+class FacetValue(models.Model):
+    """Narrow copy of the facet fields of an Indexable, for the indexable
+    types set in `FACET_VALUE_TYPES`. Facet filtering and facet counts
+    are run against this table rather than the wide Indexable table.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    indexable = models.ForeignKey(
+        Indexable, on_delete=models.CASCADE, related_name="facet_values"
+    )
+    resource_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    resource_id = models.UUIDField()
+    resource = GenericForeignKey("resource_content_type", "resource_id")
+
+    type = models.CharField(max_length=64)
+    subtype = models.CharField(max_length=256)
+    group_id = models.CharField(max_length=512, blank=True, null=True)
+    value = models.TextField()
+    normalized_value = models.TextField()
+    language_iso639_2 = models.CharField(max_length=3, blank=True, null=True)
+    language_iso639_1 = models.CharField(max_length=2, blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["resource_id", "type", "subtype"]),
+            # Covers the facet filters and counts (whose type, subtype and
+            # group id lookups are iexact), with index-only scans
+            models.Index(
+                Upper("type"),
+                Upper("subtype"),
+                models.F("normalized_value"),
+                Upper("group_id"),
+                name="facet_value_covering",
+                include=["resource_id"],
+            ),
+            HashIndex(fields=["normalized_value"]),
+        ]
+
+
+# The context (in the unique constraints of the summaries) of the indexables
+# without one, which no Context (with a uuid4) has
+NULL_CONTEXT = uuid.UUID(int=0)
+NULL_CONTEXT_SQL = f"COALESCE({{}}, '{NULL_CONTEXT}'::uuid)"
+
+
+class IndexableCountSummary(models.Model):
+    """Abstract base for tables of the number of rows of the
+    `count_source_model` (i.e. indexables) for each combination of the values
+    of the `count_fields`, which are (summary field name, source lookup)
+    pairs. The counts are kept up to date by applying the change in the
+    counts for the indexables of a resource as it is indexed or deleted,
+    and can be rebuilt from the whole of the source table.
+    """
+
+    count_source_model = None
+    count_fields = []
+    # SQL of the count fields in the unique constraint of the summary, where
+    # it isn't their column, i.e. the COALESCE of the nullable fields, as
+    # nulls are distinct in a unique constraint, or a hash of a long value
+    count_unique_expressions = {}
+
+    indexable_count = models.IntegerField(default=0)
+
+    @classmethod
+    def get_count_source(cls, queryset):
+        return queryset
+
+    @classmethod
+    def indexable_counts(cls, queryset):
+        """Get the number of rows in the (count source) queryset for each
+        combination of the values of the count fields.
+        """
+        return {
+            tuple(row[:-1]): row[-1]
+            for row in cls.get_count_source(queryset)
+            .order_by()
+            .values_list(*[lookup for _, lookup in cls.count_fields])
+            .annotate(count=models.Count("id"))
+        }
+
+    @classmethod
+    def add_count(cls, key_fields, delta):
+        """Add `delta` to the count of the row of the key fields, inserting
+        the row where there isn't one, in a single INSERT ... ON CONFLICT
+        (on the unique constraint of the count fields), so that rows added by
+        concurrent indexing are counted, rather than duplicated.
+        """
+        quote_name = connection.ops.quote_name
+        table = quote_name(cls._meta.db_table)
+        columns = {
+            field_name: quote_name(cls._meta.get_field(field_name).column)
+            for field_name in key_fields
+        }
+        target = [
+            cls.count_unique_expressions.get(field_name, "{}").format(column)
+            for field_name, column in columns.items()
+        ]
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns.values())}, indexable_count) "
+            f"VALUES ({', '.join(['%s'] * (len(columns) + 1))}) "
+            f"ON CONFLICT ({', '.join(f'({column})' for column in target)}) "
+            "DO UPDATE SET indexable_count = "
+            f"{table}.indexable_count + EXCLUDED.indexable_count"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*key_fields.values(), delta])
+
+    @classmethod
+    def apply_count_deltas(cls, before, after):
+        """Apply the change in the indexable counts from `before` to `after`
+        (as returned by `indexable_counts`) to the summary, adding the rows
+        that are new, and removing those that no longer have indexables.
+        """
+        field_names = [field_name for field_name, _ in cls.count_fields]
+        for key in set(before) | set(after):
+            if not (delta := after.get(key, 0) - before.get(key, 0)):
+                continue
+            key_fields = dict(zip(field_names, key))
+            if delta > 0:
+                cls.add_count(key_fields, delta)
+            else:
+                rows = cls.objects.filter(**key_fields)
+                rows.update(indexable_count=models.F("indexable_count") + delta)
+                rows.filter(indexable_count__lte=0).delete()
+
+    @classmethod
+    def rebuild(cls):
+        """Recreate the summary from the counts of the whole source table."""
+        field_names = [field_name for field_name, _ in cls.count_fields]
+        cls.objects.all().delete()
+        cls.objects.bulk_create(
+            [
+                cls(**dict(zip(field_names, key)), indexable_count=count)
+                for key, count in cls.indexable_counts(
+                    cls.count_source_model.objects.all()
+                ).items()
+            ],
+            batch_size=1000,
+        )
+
+    class Meta:
+        abstract = True
+
+
+class FacetField(IndexableCountSummary):
+    """Catalog of the (context, type, subtype) fields of the Indexables, with
+    the number of indexables for each, so that the facet fields available in
+    a set of contexts can be listed without a distinct scan of the Indexables.
+    Indexables without contexts are counted against a null context.
+
+    The counts are kept up to date by the indexing tasks, the writes of the
+    indexable API and the deletion of resources, and can be rebuilt with the
+    `rebuild_facet_fields` command.
+    """
+
+    count_source_model = Indexable
+    count_fields = [
+        ("context_id", "contexts"),
+        ("type", "type"),
+        ("subtype", "subtype"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    context = models.ForeignKey(
+        Context,
+        on_delete=models.CASCADE,
+        related_name="facet_fields",
+        blank=True,
+        null=True,
+    )
+    type = models.CharField(max_length=64)
+    subtype = models.CharField(max_length=256)
+
+    count_unique_expressions = {"context_id": NULL_CONTEXT_SQL}
+
+    @classmethod
+    def get_count_source(cls, queryset):
+        return queryset.exclude(subtype="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Coalesce("context", models.Value(NULL_CONTEXT)),
+                models.F("type"),
+                models.F("subtype"),
+                name="unique_facet_field",
+            ),
+        ]
+        indexes = [
+            models.Index(Upper("type"), name="facet_field_uppercase_type"),
+        ]
+
+
+class FacetValueCount(IndexableCountSummary):
+    """Summary of the facet value counts of the FacetValues in each context,
+    by resource type, so that the facet counts of a search that only
+    browses a context (with no fulltext, facet or other filters) can be
+    read from it, rather than aggregated from every FacetValue in the
+    context. The facet values are counted in the contexts of their
+    Indexable, which are those of its resource.
+
+    The counts are kept up to date by the indexing tasks, the writes of the
+    indexable API and the deletion of resources, and can be rebuilt with the
+    `rebuild_facet_value_counts` command.
+    """
+
+    count_source_model = FacetValue
+    count_fields = [
+        ("context_id", "indexable__contexts"),
+        ("resource_content_type_id", "resource_content_type"),
+        ("type", "type"),
+        ("subtype", "subtype"),
+        # Blank (rather than null) group ids and languages are counted as
+        # null, as they are the same in the unique constraint
+        ("group_id", NullIf("group_id", models.Value(""))),
+        ("value", "value"),
+        ("language_iso639_2", NullIf("language_iso639_2", models.Value(""))),
+        ("language_iso639_1", NullIf("language_iso639_1", models.Value(""))),
+    ]
+    count_unique_expressions = {
+        "context_id": NULL_CONTEXT_SQL,
+        "group_id": "COALESCE({}, '')",
+        "value": "md5({})",
+        "language_iso639_2": "COALESCE({}, '')",
+        "language_iso639_1": "COALESCE({}, '')",
+    }
+
+    id = models.BigAutoField(primary_key=True)
+    context = models.ForeignKey(
+        Context,
+        on_delete=models.CASCADE,
+        related_name="facet_value_counts",
+        blank=True,
+        null=True,
+    )
+    resource_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    type = models.CharField(max_length=64)
+    subtype = models.CharField(max_length=256)
+    group_id = models.CharField(max_length=512, blank=True, null=True)
+    value = models.TextField()
+    language_iso639_2 = models.CharField(max_length=3, blank=True, null=True)
+    language_iso639_1 = models.CharField(max_length=2, blank=True, null=True)
+
+    class Meta:
+        # The values are hashed, as they may be too long for a btree index
+        constraints = [
+            models.UniqueConstraint(
+                Coalesce("context", models.Value(NULL_CONTEXT)),
+                models.F("resource_content_type"),
+                models.F("type"),
+                models.F("subtype"),
+                Coalesce("group_id", models.Value("")),
+                MD5("value"),
+                Coalesce("language_iso639_2", models.Value("")),
+                Coalesce("language_iso639_1", models.Value("")),
+                name="unique_facet_value_count",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["context", "resource_content_type", "type"]),
+        ]
+
+
+def get_summary_counts(indexables, facet_values):
+    """Get the counts of the (querysets of) indexables and facet values for
+    each of the IndexableCountSummary tables.
+    """
+    return {
+        FacetField: FacetField.indexable_counts(indexables),
+        FacetValueCount: FacetValueCount.indexable_counts(facet_values),
+    }
+
+
+def apply_summary_count_deltas(before, after):
+    """Apply the change from the `before` to the `after` summary counts
+    (as returned by `get_summary_counts`) to the summary tables.
+    """
+    for summary in set(before) | set(after):
+        summary.apply_count_deltas(before.get(summary, {}), after.get(summary, {}))
+
+
 class ResourceRelationship(UUIDModel, TimeStampedModel):
     """Model-agnostic relationship between resources."""
 
@@ -132,6 +546,12 @@ class BaseSearchResource(UUIDModel, TimeStampedModel):
         object_id_field="resource_id",
         related_query_name="%(class)s",
     )
+    facet_values = GenericRelation(
+        FacetValue,
+        content_type_field="resource_content_type",
+        object_id_field="resource_id",
+        related_query_name="%(class)s",
+    )
     relationship_sources = GenericRelation(
         ResourceRelationship,
         content_type_field="source_content_type",
@@ -146,6 +566,16 @@ class BaseSearchResource(UUIDModel, TimeStampedModel):
     )
     contexts = models.ManyToManyField(Context)
 
+    def get_summary_counts(self):
+        """Get the counts of the indexables of the resource for each of the
+        IndexableCountSummary tables.
+        """
+        return get_summary_counts(self.indexables, self.facet_values)
+
+    @staticmethod
+    def apply_summary_count_deltas(before, after):
+        apply_summary_count_deltas(before, after)
+
     class Meta:
         abstract = True
         ordering = ["-modified"]
@@ -157,3 +587,25 @@ class JSONResource(BaseSearchResource):
     label = models.CharField(max_length=50)
     type = models.CharField(max_length=64, default="")
     data = models.JSONField(blank=True)
+
+
+class SlowSearch(models.Model):
+    """A search request that took longer than the `SLOW_SEARCH_THRESHOLD`,
+    with the normalized fingerprint of the search, its stage timings and the
+    number of results. Reported on by the `slow_searches` command.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+    view = models.CharField(max_length=128)
+    action = models.CharField(max_length=64, blank=True, null=True)
+    fingerprint = models.CharField(max_length=1024)
+    duration = models.FloatField(verbose_name=_("Duration (ms)"))
+    result_count = models.IntegerField(blank=True, null=True)
+    timings = models.JSONField(default=list)
+
+    class Meta:
+        ordering = ["-created"]
+        indexes = [
+            models.Index(fields=["view", "action", "fingerprint"]),
+        ]
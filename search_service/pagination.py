@@ -1,10 +1,13 @@
 import logging
+from contextlib import nullcontext
 
 # from django.conf import settings
 
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from .settings import search_service_settings
+from .timeouts import SearchTimeout
+from .timing import timed
 
 logger = logging.getLogger(__name__)
 
@@ -23,18 +26,62 @@ class MadocPagination(PageNumberPagination):
 
     page_size_query_param = "page_size"
     max_page_size = search_service_settings.MAX_PAGE_SIZE
+    view = None
+    search_timer = None
+    count_unavailable = False
+
+    def statement_timeout(self, stage):
+        if not hasattr(self.view, "statement_timeout"):
+            return nullcontext()
+        return self.view.statement_timeout(stage)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Time the count and the fetch of the page for the search timings
+        self.view = view
+        self.search_timer = getattr(view, "search_timer", None)
+        self.count_unavailable = False
+        with timed(self.search_timer, "page"), self.statement_timeout("page"):
+            return super().paginate_queryset(queryset, request, view)
+
+    def get_page_number(self, request, paginator):
+        with timed(self.search_timer, "count"):
+            try:
+                with self.statement_timeout("count"):
+                    paginator.count
+            except SearchTimeout:
+                self.count_unavailable = True
+                self.set_lower_bound_count(request, paginator)
+        return super().get_page_number(request, paginator)
+
+    def set_lower_bound_count(self, request, paginator):
+        """Where the count of the results is cancelled, count them only up to
+        the result after the requested page, so that the page (and whether
+        there is a next page) can still be found.
+        """
+        try:
+            page_number = max(1, int(request.query_params.get(self.page_query_param)))
+        except (TypeError, ValueError):
+            page_number = 1
+        limit = page_number * paginator.per_page + 1
+        paginator.count = paginator.object_list[:limit].count()
 
     def get_paginated_response(self, data):
-        return Response(
+        paginator = self.page.paginator
+        response = Response(
             {
                 "pagination": {
                     "page": self.page.number,
-                    "pageSize": self.page.paginator.per_page,
+                    "pageSize": paginator.per_page,
                     "next": self.get_next_link(),
                     "previous": self.get_previous_link(),
-                    "totalPages": self.page.paginator.num_pages,
-                    "totalResults": self.page.paginator.count,
+                    "totalPages": (
+                        None if self.count_unavailable else paginator.num_pages
+                    ),
+                    "totalResults": None if self.count_unavailable else paginator.count,
                 },
                 "results": data,
             }
         )
+        if self.count_unavailable:
+            response.data["unavailable"] = ["count"]
+        return response
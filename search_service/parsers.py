@@ -17,10 +17,17 @@ from django.utils.translation import get_language
 # DRF Imports
 from rest_framework.exceptions import ParseError
 from rest_framework.parsers import JSONParser
+from rest_framework.utils import json as drf_json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .models import BaseSearchResource
+from .renderers import FastJSONRenderer
 from .settings import search_service_settings
+from .utils import is_facet_value_type, normalize_facet_value
 
 
 default_lang = get_language()
@@ -28,6 +35,9 @@ default_lang = get_language()
 logger = logging.getLogger(__name__)
 
 
+FACET_VALUE_QUERY_FIELDS = ["type", "subtype", "group_id", "indexable_text", "value"]
+
+
 def date_query_value(q_key, value):
     """
     To aid in the faceting, if you get a query type that is date, return a datetime parsed using dateutil,
@@ -78,6 +88,8 @@ def facet_operator(q_key, field_lookup):
             return field_lookup
         else:
             return "exact"
+    elif q_key in ["indexable_json"]:
+        return "contains"
     elif q_key in ["indexable_date_range_start", "indexable_date_range_year"]:
         if field_lookup in [
             "day",
@@ -97,7 +109,83 @@ def facet_operator(q_key, field_lookup):
         return "iexact"
 
 
-def parse_facets(facet_queries, prefix_q=""):
+def is_facet_value_query(facet_query):
+    """
+    Whether a single facet query can be answered from the FacetValue table,
+    i.e. it is for one of the `FACET_VALUE_TYPES` and only queries the fields
+    that are copied to that table.
+    """
+    return is_facet_value_type(facet_query.get("type", "")) and all(
+        [k in FACET_VALUE_QUERY_FIELDS + ["field_lookup"] for k in facet_query]
+    )
+
+
+def facet_value_q(q_key, value, field_lookup, prefix_q):
+    """
+    Generate the Q for a single field of a facet query against the FacetValue
+    table. Case insensitive value matches use the `normalized_value`.
+    """
+    if q_key in ["value", "indexable_text"]:
+        operator = facet_operator("value", field_lookup)
+        if operator == "iexact":
+            return Q(**{f"{prefix_q}normalized_value": normalize_facet_value(value)})
+        return Q(**{f"{prefix_q}value__{operator}": value})
+    return Q(**{f"{prefix_q}{q_key}__iexact": value})
+
+
+def facet_query_q(facet_query, prefix_q="", facet_value_prefix_q=None):
+    """
+    AND together all of the fields within a single facet query. If a
+    `facet_value_prefix_q` is provided and the facet query can be answered
+    from the FacetValue table it is queried there rather than on the Indexable.
+    """
+    field_lookup = facet_query.get("field_lookup", "iexact")
+    if facet_value_prefix_q is not None and is_facet_value_query(facet_query):
+        return reduce(
+            and_,
+            (
+                facet_value_q(
+                    q_key=k,
+                    value=v,
+                    field_lookup=field_lookup,
+                    prefix_q=facet_value_prefix_q,
+                )
+                for k, v in facet_query.items()
+                if k in FACET_VALUE_QUERY_FIELDS
+            ),
+        )
+    return reduce(
+        and_,
+        (
+            Q(  # Iterate the keys in the facet dict to generate the Q()
+                **{
+                    f"{prefix_q}"
+                    f"{(lambda k: 'indexable_text' if k == 'value' else k)(k)}__"
+                    f"{facet_operator(k, field_lookup)}": date_query_value(
+                        q_key=k, value=v
+                    )
+                }  # You can pass in something other than iexact
+                # using the field_lookup key
+            )
+            for k, v in facet_query.items()
+            if k
+            in [
+                "type",
+                "subtype",
+                "group_id",
+                "indexable_text",
+                "value",
+                "indexable_int",
+                "indexable_float",
+                "indexable_json",
+                "indexable_date_range_start",
+                "indexable_date_range_end",
+            ]  # These are the fields to query
+        ),
+    )
+
+
+def parse_facets(facet_queries, prefix_q="", facet_value_prefix_q=None):
     """
     Parse the facet component of a search request into a set of reduced Q filters.
     """
@@ -128,34 +216,10 @@ def parse_facets(facet_queries, prefix_q=""):
                 reduce(  # All of the queries with the same field are OR'd together
                     or_,
                     [
-                        reduce(  # All of the fields within a single facet query are
-                            # AND'd together
-                            and_,
-                            (
-                                Q(  # Iterate the keys in the facet dict to generate the Q()
-                                    **{
-                                        f"{prefix_q}"
-                                        f"{(lambda k: 'indexable_text' if k == 'value' else k)(k)}__"
-                                        f"{facet_operator(k, sorted_facet_query.get('field_lookup', 'iexact'))}": date_query_value(
-                                            q_key=k, value=v
-                                        )
-                                    }  # You can pass in something other than iexact
-                                    # using the field_lookup key
-                                )
-                                for k, v in sorted_facet_query.items()
-                                if k
-                                in [
-                                    "type",
-                                    "subtype",
-                                    "group_id",
-                                    "indexable_text",
-                                    "value",
-                                    "indexable_int",
-                                    "indexable_float",
-                                    "indexable_date_range_start",
-                                    "indexable_date_range_end",
-                                ]  # These are the fields to query
-                            ),
+                        facet_query_q(
+                            sorted_facet_query,
+                            prefix_q=prefix_q,
+                            facet_value_prefix_q=facet_value_prefix_q,
                         )
                         for sorted_facet_query in sorted_facet_queries
                     ],
@@ -165,6 +229,28 @@ def parse_facets(facet_queries, prefix_q=""):
     return
 
 
+def parse_field_names(field_names):
+    """Parse a list, or comma separated string, of field names for a sparse
+    fieldset (the `fields` and `exclude` of a search request).
+    """
+    if not field_names:
+        return None
+    if isinstance(field_names, str):
+        field_names = field_names.split(",")
+    if not isinstance(field_names, list):
+        raise ParseError(detail="Field names must be a list or comma separated string")
+    return [str(f).strip() for f in field_names if str(f).strip()]
+
+
+def parse_flag(value, default):
+    """Parse a boolean request flag, which may be a string from a query param."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() not in ["false", "0", "no", ""]
+    return bool(value)
+
+
 def is_latin(text):
     """
     Function to evaluate whether a piece of text is all Latin characters, numbers or punctuation.
@@ -185,7 +271,40 @@ def is_latin(text):
     )
 
 
-class SearchParser(JSONParser):
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes with orjson where it is installed, falling back
+    to the stdlib `json` decoding of the JSONParser otherwise.
+
+    Anything orjson rejects is decoded again with `json`, so that the same
+    documents are accepted (and the same errors raised) with either. Note that
+    orjson decodes integers beyond the 64 bit range as floats.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        content = stream.read()
+        try:
+            if codecs.lookup(encoding).name != "utf-8":
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+        except (LookupError, ValueError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+        try:
+            if isinstance(content, bytes):
+                content = content.decode(encoding)
+            return drf_json.loads(content)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class SearchParser(FastJSONParser):
     """
     Generic search parser that makes no assumptions about the shape of the resource
     that is linked to the Indexable.
@@ -203,11 +322,33 @@ class SearchParser(JSONParser):
     default_facet_types = search_service_settings.DEFAULT_FACET_TYPES
     raw_query_prefixes = ("indexables__", "type__", "id__")
     q_prefix = ""
+    facet_value_q_prefix = "facet_values__"
+    # Search options whose use (but not their values) is the fingerprint of a search
+    fingerprint_options = [
+        "fulltext",
+        "search_type",
+        "search_language",
+        "facets",
+        "date_start",
+        "date_end",
+        "date_exact",
+        "integer",
+        "float",
+        "json",
+        "raw",
+        "resource_filters",
+        "contexts",
+        "contexts_all",
+        "facet_on",
+        "facet_types",
+        "facet_fields",
+        "facet_languages",
+    ]
 
     def float_filter_kwargs(self, request_data, key="float", default_value=None):
         f_kwargs = {}
         if query := request_data.get(key, default_value):
-            if (value := query.get("value")) and (
+            if (value := query.get("value")) is not None and (
                 operator := query.get("operator", "exact")
             ) in self.numerical_operators:
                 f_kwargs[f"{self.q_prefix}indexable_float__{operator}"] = value
@@ -216,10 +357,20 @@ class SearchParser(JSONParser):
     def integer_filter_kwargs(self, request_data, key="integer", default_value=None):
         f_kwargs = {}
         if query := request_data.get(key, default_value):
-            if (value := query.get("value")) and (
+            if (value := query.get("value")) is not None and (
                 operator := query.get("operator", "exact")
             ) in self.numerical_operators:
-                f_kwargs[f"{self.q_prefix}indexable_integer__{operator}"] = value
+                f_kwargs[f"{self.q_prefix}indexable_int__{operator}"] = value
+        return f_kwargs
+
+    def json_filter_kwargs(self, request_data, key="json", default_value=None):
+        """Containment query against the `indexable_json`, which is supported
+        by the `jsonb_path_ops` GIN index on the Indexable.
+        """
+        f_kwargs = {}
+        if query := request_data.get(key, default_value):
+            if isinstance(query, (dict, list)):
+                f_kwargs[f"{self.q_prefix}indexable_json__contains"] = query
         return f_kwargs
 
     def date_filter_kwargs(self, request_data, key="date_exact", default_value=None):
@@ -278,12 +429,27 @@ class SearchParser(JSONParser):
         return {
             **self.float_filter_kwargs(request_data),
             **self.integer_filter_kwargs(request_data),
+            **self.json_filter_kwargs(request_data),
             **self.date_filter_kwargs(request_data, key="date_start"),
             **self.date_filter_kwargs(request_data, key="date_end"),
             **self.date_filter_kwargs(request_data, key="date_exact"),
             **self.raw_filter_kwargs(request_data),
         }
 
+    def is_vector_search(self, request_data, search_string):
+        """Whether the fulltext is searched for in the search_vector, rather
+        than with an `icontains` of each of its tokens.
+        """
+        non_latin_fulltext = request_data.get(
+            "non_latin_fulltext", search_service_settings.NONLATIN_FULLTEXT
+        )
+        search_multiple_fields = request_data.get(
+            "search_multiple_fields", search_service_settings.SEARCH_MULTIPLE_FIELDS
+        )
+        return (
+            non_latin_fulltext or is_latin(search_string)
+        ) and not search_multiple_fields
+
     def parse_search_query(self, request_data):
         non_vector_search = [Q()]
         filter_kwargs = {}
@@ -291,17 +457,9 @@ class SearchParser(JSONParser):
             "search_language", self.default_search_language
         )
         search_type = request_data.get("search_type", self.default_search_type)
-        non_latin_fulltext = request_data.get(
-            "non_latin_fulltext", search_service_settings.NONLATIN_FULLTEXT
-        )
-        search_multiple_fields = request_data.get(
-            "search_multiple_fields", search_service_settings.SEARCH_MULTIPLE_FIELDS
-        )
 
         if search_string := request_data.get("fulltext", None):
-            if (
-                non_latin_fulltext or is_latin(search_string)
-            ) and not search_multiple_fields:
+            if self.is_vector_search(request_data, search_string):
                 logger.debug(f"Search string {search_string}")
                 if search_language:
                     filter_kwargs = {
@@ -357,7 +515,9 @@ class SearchParser(JSONParser):
         facet_filters = None
         if facet_queries := request_data.get("facets", None):
             facet_filters = parse_facets(
-                facet_queries=facet_queries, prefix_q=self.q_prefix
+                facet_queries=facet_queries,
+                prefix_q=self.q_prefix,
+                facet_value_prefix_q=self.facet_value_q_prefix,
             )
 
         return facet_filters
@@ -415,8 +575,30 @@ class SearchParser(JSONParser):
                 contexts_queries.append(Q(**{"contexts__urn__iexact": c}))
         return contexts_queries
 
+    def get_fingerprint(self, request_data):
+        """A normalized fingerprint of the shape of a search, of the search
+        options that it uses, without their values (other than the number of
+        facets and resource filters), and the stages of the search it skips.
+        """
+        parts = []
+        for option in self.fingerprint_options:
+            if (value := request_data.get(option)) in [None, "", [], {}]:
+                continue
+            if option in ["facets", "resource_filters"] and isinstance(value, list):
+                parts.append(f"{option}:{len(value)}")
+            else:
+                parts.append(option)
+        if parse_flag(request_data.get("count_only"), False):
+            parts.append("count_only")
+        else:
+            for stage in ["results", "facet_counts"]:
+                if not parse_flag(request_data.get(stage), True):
+                    parts.append(f"no_{stage}")
+        return "+".join(parts) or "browse"
+
     def parse_data(self, request_data):
         logger.debug(f"Parsing filter data from: ({request_data})")
+        count_only = parse_flag(request_data.get("count_only"), False)
         filter_data = {
             "filter_query": self.get_filter_query(
                 request_data
@@ -425,6 +607,8 @@ class SearchParser(JSONParser):
             "headline_query": self.get_headline_query(request_data),  # fulltext
             "facet_filters": self.get_facet_filters(request_data),  # facets
             "contexts_query": self.get_contexts_query(request_data),  # contexts
+            "contexts": request_data.get("contexts"),
+            "contexts_all": request_data.get("contexts_all"),
             "facet_on": self.get_facet_on_query(
                 request_data
             ),  # query that identifies the queryset to facet over
@@ -433,6 +617,16 @@ class SearchParser(JSONParser):
             "facet_languages": request_data.get("facet_languages"),
             "num_facets": request_data.get("num_facets", 10),
             "query_prefix": self.q_prefix,
+            "fields": parse_field_names(request_data.get("fields")),  # sparse fieldset
+            "exclude": parse_field_names(request_data.get("exclude")),
+            # Stages of the search to run
+            "count_only": count_only,
+            "results": parse_flag(request_data.get("results"), True) and not count_only,
+            "facet_counts": parse_flag(request_data.get("facet_counts"), True)
+            and not count_only,
+            # Explain the queries of the search (where the view allows it)
+            "explain": parse_flag(request_data.get("explain"), False),
+            "fingerprint": self.get_fingerprint(request_data),
         }
 
         logger.debug(f"Parsed search filter data: ({filter_data})")
@@ -440,6 +634,9 @@ class SearchParser(JSONParser):
 
     def parse(self, stream, media_type=None, parser_context={}):
         request_data = super().parse(stream, media_type, parser_context)
+        # Rejected or rewritten by the cost guard of the view, if it has one
+        if hasattr(view := parser_context.get("view"), "guard_search_data"):
+            request_data = view.guard_search_data(self, request_data)
         return self.parse_data(request_data)
 
 
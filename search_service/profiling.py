@@ -0,0 +1,172 @@
+"""
+search_service/profiling.py - Sampling profiler of search and indexing requests.
+
+The stack of the thread serving a profiled request is sampled, every
+`PROFILE_INTERVAL` milliseconds, by a single (daemon) sampler thread, which
+only runs while there are requests being profiled. The samples are collapsed
+into `module:function;module:function...` stacks with their counts (the
+"folded" format of flame graph tools), and the profile of each request is
+kept in an in-process buffer of the most recent profiles, and, where
+`PROFILE_DIR` is set, written to a `.folded` file in the directory.
+
+Requests over the `PROFILE_THRESHOLD` are only sampled once they have run
+for the threshold, so that the requests that finish within it aren't
+sampled at all, and their profiles are of where the slow requests spent
+the time after it.
+"""
+
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from time import perf_counter
+
+from .explain import PlanBuffer
+from .settings import search_service_settings
+
+logger = logging.getLogger(__name__)
+
+# Number of the leaf functions (i.e. self time) listed in the profiles.
+TOP_FUNCTIONS = 20
+
+
+def collapse_stack(frame):
+    """The stack of the frame, outermost first, as a `;` separated string of
+    the module and (qualified) name of the function of each frame.
+    """
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(
+            f"{frame.f_globals.get('__name__', '?')}:"
+            f"{getattr(code, 'co_qualname', code.co_name)}"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Profile(object):
+    def __init__(self, thread_id, reason, delay=0.0, **details):
+        self.thread_id = thread_id
+        self.reason = reason
+        self.details = details
+        self.start = perf_counter()
+        # Seconds after the start before which the thread isn't sampled
+        self.sample_from = self.start + delay
+        self.stacks = Counter()
+
+    def sample(self, frame):
+        self.stacks[collapse_stack(frame)] += 1
+
+    def get_entry(self, duration):
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return {
+            "time": datetime.now(timezone.utc).isoformat(),
+            **self.details,
+            "reason": self.reason,
+            "duration": round(duration * 1000, 3),
+            "interval": search_service_settings.PROFILE_INTERVAL,
+            "samples": sum(self.stacks.values()),
+            "top": leaves.most_common(TOP_FUNCTIONS),
+            "stacks": dict(self.stacks.most_common()),
+        }
+
+
+class StackSampler(object):
+    """Samples the stacks of the threads of the active profiles, from a
+    thread that is started with the first profile, and waits (without
+    sampling) while none of the profiles are due to be sampled.
+    """
+
+    def __init__(self):
+        self.profiles = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def start_profile(self, profile):
+        with self.lock:
+            self.profiles[profile.thread_id] = profile
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="search-service-profiler", daemon=True
+                )
+                self.thread.start()
+        self.wakeup.set()
+
+    def stop_profile(self, profile):
+        with self.lock:
+            if self.profiles.get(profile.thread_id) is profile:
+                del self.profiles[profile.thread_id]
+
+    def run(self):
+        while True:
+            self.wakeup.clear()
+            with self.lock:
+                profiles = list(self.profiles.values())
+            if not profiles:
+                self.wakeup.wait()
+                continue
+            now = perf_counter()
+            due = [profile for profile in profiles if profile.sample_from <= now]
+            if not due:
+                # Until the first profile is due, or another is started
+                self.wakeup.wait(min(p.sample_from for p in profiles) - now)
+                continue
+            frames = sys._current_frames()
+            for profile in due:
+                frame = frames.get(profile.thread_id)
+                if frame is not None:
+                    profile.sample(frame)
+            del frames, frame
+            self.wakeup.wait(search_service_settings.PROFILE_INTERVAL / 1000)
+
+
+sampler = StackSampler()
+recorded_profiles = PlanBuffer(search_service_settings.PROFILE_BUFFER_SIZE)
+
+
+def start_profile(reason, **details):
+    """Start profiling the current thread, for the `reason` (i.e. "sampled",
+    "requested" or "threshold", which is only sampled after the threshold).
+    """
+    delay = 0.0
+    if reason == "threshold":
+        delay = search_service_settings.PROFILE_THRESHOLD / 1000
+    profile = Profile(threading.get_ident(), reason, delay=delay, **details)
+    sampler.start_profile(profile)
+    return profile
+
+
+def write_profile(entry, directory=None):
+    directory = directory or search_service_settings.PROFILE_DIR
+    name = (
+        f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}_{entry.get('view')}"
+        f"_{os.getpid()}_{threading.get_ident()}.folded"
+    )
+    path = os.path.join(directory, name)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in entry["stacks"].items():
+                f.write(f"{stack} {count}\n")
+    except OSError as e:
+        logger.error(f"Failed to write profile: ({path=}, {e})")
+
+
+def stop_profile(profile):
+    """Stop the profile, and record it, unless it was only to be sampled
+    after the threshold and the request finished within it.
+    """
+    sampler.stop_profile(profile)
+    duration = perf_counter() - profile.start
+    if profile.reason == "threshold" and perf_counter() < profile.sample_from:
+        return None
+    entry = profile.get_entry(duration)
+    recorded_profiles.append(entry)
+    if search_service_settings.PROFILE_DIR:
+        write_profile(entry)
+    return entry
@@ -0,0 +1,76 @@
+"""
+search_service/ranking.py - Rank and headline expressions for Indexables.
+
+Where an Indexable has been split into IndexablePassages, the rank and headlines
+are taken from its best matching passage, so that their cost is bounded by the
+passage length rather than the length of the whole text. Indexables without
+(matching) passages fall back to the whole indexable.
+"""
+
+import logging
+
+from django.contrib.postgres.search import SearchRank, SearchHeadline
+from django.db.models import (
+    F,
+    OuterRef,
+    Subquery,
+    Value,
+    CharField,
+    FloatField,
+    IntegerField,
+)
+from django.db.models.functions import Coalesce
+
+from .models import IndexablePassage
+
+logger = logging.getLogger(__name__)
+
+
+def best_passages(search_query):
+    """Passages of the outer Indexable that match the search query, best first,
+    and (for equal ranks) in the order of the text, so that the rank, headline
+    and word offset subqueries pick the same passage.
+    """
+    return (
+        IndexablePassage.objects.filter(
+            indexable=OuterRef("pk"), search_vector=search_query
+        )
+        .annotate(
+            rank=SearchRank(F("search_vector"), search_query, cover_density=True)
+        )
+        .order_by("-rank", "word_offset")
+    )
+
+
+def indexable_rank(search_query):
+    return Coalesce(
+        Subquery(best_passages(search_query).values("rank")[:1]),
+        SearchRank(F("search_vector"), search_query, cover_density=True),
+        output_field=FloatField(),
+    )
+
+
+def indexable_headline(search_query, field="indexable_text", **headline_kwargs):
+    """Headline from the best passage, or from `field` on the Indexable."""
+    return Coalesce(
+        Subquery(
+            best_passages(search_query)
+            .annotate(
+                headline=SearchHeadline(
+                    "passage_text", search_query, **headline_kwargs
+                )
+            )
+            .values("headline")[:1]
+        ),
+        SearchHeadline(field, search_query, **headline_kwargs),
+        output_field=CharField(),
+    )
+
+
+def indexable_word_offset(search_query):
+    """Word offset into the `indexable_text` of the text used for headlines."""
+    return Coalesce(
+        Subquery(best_passages(search_query).values("word_offset")[:1]),
+        Value(0),
+        output_field=IntegerField(),
+    )
@@ -0,0 +1,149 @@
+"""
+search_service/recording.py - Recording of the requests to the search viewsets, for replaying.
+
+Where `SEARCH_RECORDING_FILE` is set, a sample (`SEARCH_RECORDING_SAMPLE_RATE`)
+of the requests to the search viewsets are appended to the file as NDJSON,
+with the method, path, query string and body of each, and the fingerprint of
+the parsed search, so that the recorded mix of searches can be replayed
+against another instance with the `replay_searches` command.
+
+With `SEARCH_RECORDING_ANONYMIZE` the fulltext and the values of the facets
+and filters (including the string values of the `raw` and `json` filters) are
+replaced with (keyed) hashes, which are the same for the same value, so that
+the shape of the searches is kept, though they won't match the same resources
+when they are replayed.
+"""
+
+import json
+import logging
+import random
+import threading
+from datetime import datetime, timezone
+
+from django.utils.crypto import salted_hmac
+
+from .settings import search_service_settings
+
+logger = logging.getLogger(__name__)
+
+# Keys (of the body and query params) whose values are anonymized
+ANONYMIZED_KEYS = ["fulltext", "value", "values"]
+# Keys of the filters whose (nested) string values are anonymized, keeping
+# their keys (i.e. the lookups and JSON keys), and their numbers
+ANONYMIZED_FILTER_KEYS = ["raw", "json"]
+# Query param of the bar separated facets, e.g. metadata|place|glasgow, whose
+# last component (the value) is anonymized
+FACET_QUERY_PARAM = "facet"
+RECORDED_HEADERS = ["Content-Type", "Accept", "X-Context"]
+
+recording_lock = threading.Lock()
+
+
+def anonymize_value(value):
+    if isinstance(value, str):
+        return "anon-" + salted_hmac("search_service.recording", value).hexdigest()[:16]
+    if isinstance(value, list):
+        return [anonymize_value(v) for v in value]
+    return value
+
+
+def anonymize_filter(data):
+    """Anonymize the string values of the (nested) data of a filter."""
+    if isinstance(data, dict):
+        return {k: anonymize_filter(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [anonymize_filter(v) for v in data]
+    return anonymize_value(data)
+
+
+def anonymize_facet_param(facet):
+    *components, value = facet.split("|")
+    return "|".join(components + [anonymize_value(value)])
+
+
+def anonymize(data):
+    """Anonymize the values of the ANONYMIZED_KEYS of the (nested) data."""
+    if isinstance(data, dict):
+        anonymized = {}
+        for k, v in data.items():
+            if k in ANONYMIZED_KEYS:
+                anonymized[k] = anonymize_value(v)
+            elif k in ANONYMIZED_FILTER_KEYS:
+                anonymized[k] = anonymize_filter(v)
+            elif k == FACET_QUERY_PARAM and isinstance(v, list):
+                anonymized[k] = [anonymize_facet_param(facet) for facet in v]
+            else:
+                anonymized[k] = anonymize(v)
+        return anonymized
+    if isinstance(data, list):
+        return [anonymize(v) for v in data]
+    return data
+
+
+def write_recording(record, path=None):
+    path = path or search_service_settings.SEARCH_RECORDING_FILE
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        with recording_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError as e:
+        logger.error(f"Failed to record search: ({path=}, {e})")
+
+
+class SearchRecordingMixin(object):
+    """Records a sample of the requests to a search viewset, where
+    `SEARCH_RECORDING_FILE` is set. The raw body is read before it is parsed,
+    and the request is recorded (with the fingerprint of the parsed search)
+    once it has been handled.
+    """
+
+    recorded_body = None
+
+    def is_recorded(self):
+        return bool(search_service_settings.SEARCH_RECORDING_FILE) and (
+            random.random() < search_service_settings.SEARCH_RECORDING_SAMPLE_RATE
+        )
+
+    def initialize_request(self, request, *args, **kwargs):
+        if self.is_recorded():
+            # Read (and so cache) the body before it is consumed by the parsers
+            self.recorded_body = request.body
+        return super().initialize_request(request, *args, **kwargs)
+
+    def get_recorded_search(self, request, response):
+        body = None
+        if self.recorded_body:
+            try:
+                body = json.loads(self.recorded_body)
+            except ValueError:
+                body = self.recorded_body.decode("utf-8", errors="replace")
+        query = {k: request.query_params.getlist(k) for k in request.query_params}
+        if search_service_settings.SEARCH_RECORDING_ANONYMIZE:
+            body, query = anonymize(body), anonymize(query)
+        data = getattr(request, "data", None)
+        fingerprint = "browse"
+        if isinstance(data, dict):
+            fingerprint = data.get("fingerprint") or fingerprint
+        return {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "view": self.__class__.__name__,
+            "action": self.action,
+            "fingerprint": fingerprint,
+            "method": request.method,
+            "path": request.path,
+            "query": query,
+            "headers": {
+                header: request.headers[header]
+                for header in RECORDED_HEADERS
+                if header in request.headers
+            },
+            "body": body,
+            "status": response.status_code,
+        }
+
+    def dispatch(self, request, *args, **kwargs):
+        self.recorded_body = None
+        response = super().dispatch(request, *args, **kwargs)
+        if self.recorded_body is not None:
+            write_recording(self.get_recorded_search(self.request, response))
+        return response
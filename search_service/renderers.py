@@ -0,0 +1,147 @@
+"""
+search_service/renderers.py - Renderers for search service responses.
+"""
+
+import csv
+import json
+import logging
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson where it is installed, falling
+    back to the stdlib `json` encoding of the JSONRenderer otherwise.
+
+    Types that orjson doesn't encode the same way as DRF (datetimes, dates,
+    times, Decimals, lazy strings, QuerySets, etc.) are passed to the DRF
+    encoder. UUIDs, dict and list subclasses (e.g. the ReturnDict and
+    ReturnList of serializers, or the defaultdicts of the facets) and non
+    string keys are encoded by orjson itself.
+
+    orjson output is always compact and unescaped UTF-8, so indented
+    responses (such as those of the browsable API), and those for
+    UNICODE_JSON = False or COMPACT_JSON = False, use the stdlib encoding,
+    as does any data that orjson can't encode (e.g. integers over 64 bits).
+    """
+
+    if orjson is not None:
+        orjson_options = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+            is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=self.orjson_options,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # As for the JSONRenderer, fully escape U+2028 and U+2029 so that the
+        # output is a strict javascript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Renders rows (dicts) as newline delimited JSON. `stream` renders each
+    row as it is generated, for a StreamingHttpResponse.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+    json_renderer_class = FastJSONRenderer
+
+    def stream(self, rows, header=None):
+        json_renderer = self.json_renderer_class()
+        for row in rows:
+            yield json_renderer.render(row) + b"\n"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return b"".join(self.stream(data if isinstance(data, list) else [data]))
+
+
+class EchoBuffer:
+    """File-like object that returns what is written to it, for the csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(BaseRenderer):
+    """Renders rows (dicts) as CSV, with a header row of the `header` field
+    names (or the keys of the first row). Nested values are written as JSON.
+    `stream` renders each row as it is generated, for a StreamingHttpResponse.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    @staticmethod
+    def cell(value):
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return str(value)
+
+    def stream(self, rows, header=None):
+        writer = csv.writer(EchoBuffer())
+        if header is not None:
+            yield writer.writerow(header).encode(self.charset)
+        for row in rows:
+            if header is None:
+                header = list(row)
+                yield writer.writerow(header).encode(self.charset)
+            yield writer.writerow(
+                [self.cell(row.get(field_name)) for field_name in header]
+            ).encode(self.charset)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return b"".join(self.stream(data if isinstance(data, list) else [data]))
+
+
+class PrometheusTextRenderer(BaseRenderer):
+    """Renders metrics, already in the Prometheus text exposition format (or
+    other data, e.g. of an error response, as JSON).
+    """
+
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not isinstance(data, str):
+            data = json.dumps(data)
+        return data.encode(self.charset)
@@ -21,6 +21,7 @@ from ..signals import (
 
 from .fields import (
     ContextsField,
+    SelectorField,
 )
 
 
@@ -80,8 +81,8 @@ class BaseResourceAPISerializer(
         self.signal_completed(instance)
         return instance
 
-    def update(self, validated_data):
-        instance = super().update(validated_data)
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
         self.signal_completed(instance)
         return instance
 
@@ -122,6 +123,7 @@ class IndexableAPISerializer(serializers.HyperlinkedModelSerializer):
     """
 
     contexts = ContextsField(many=True, slug_field="urn", required=False)
+    selector = SelectorField(required=False, allow_null=True)
 
     class Meta:
         model = Indexable
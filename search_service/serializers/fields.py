@@ -37,3 +37,27 @@ class ContextsField(serializers.SlugRelatedField):
             return queryset.get_or_create(**context_data)[0]
         except (TypeError, ValueError):
             self.fail("invalid")
+
+
+class SelectorField(serializers.JSONField):
+    """The selector of an Indexable, serialized out with any packed box-selector
+    unpacked, so that the representation is the same whether or not the
+    box-selector has been packed.
+    """
+
+    # The model columns that the selector is serialized from
+    source_fields = ["selector", "packed_boxes"]
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        return self.to_representation_value(instance.get_selector())
+
+    def to_representation_value(self, selector):
+        return super().to_representation(selector)
+
+    def to_internal_value(self, data):
+        # A new selector replaces any packed box-selector, which is repacked on save
+        return {"selector": super().to_internal_value(data), "packed_boxes": None}
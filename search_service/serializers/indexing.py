@@ -15,21 +15,55 @@ from ..models import (
     Context,
     Indexable,
 )
+from ..settings import search_service_settings
 
 logger = logging.getLogger(__name__)
 
 
+class IndexablePassageSerializer(serializers.Serializer):
+    word_offset = serializers.IntegerField(min_value=0)
+    passage_text = serializers.CharField()
+
+
 class IndexableCreateUpdateSerializer(serializers.ModelSerializer):
     contexts = serializers.PrimaryKeyRelatedField(
         queryset=Context.objects.all(), many=True, allow_empty=True
     )
+    passages = IndexablePassageSerializer(many=True, required=False, write_only=True)
 
     class Meta:
         model = Indexable
-        fields = "__all__"
+        # Word positions are derived from the indexable_text, and the packed
+        # boxes from the selector, on save
+        exclude = ["word_positions", "packed_boxes"]
+
+    def create(self, validated_data):
+        passages = validated_data.pop("passages", None)
+        instance = super().create(validated_data)
+        if passages:
+            instance.set_passages(passages)
+        return instance
+
+    def update(self, instance, validated_data):
+        passages = validated_data.pop("passages", None)
+        if "selector" in validated_data:
+            validated_data["packed_boxes"] = None
+        instance = super().update(instance, validated_data)
+        if passages is not None:
+            instance.set_passages(passages)
+        return instance
 
 
 class BaseModelToIndexableSerializer(serializers.Serializer):
+    """Generates the data for the Indexables of an instance.
+
+    If `passage_length` is set, any `indexable_text` longer than that number of
+    words is also split into passages of at most `passage_length` words, which
+    are used for ranking and headlines in place of the whole text.
+    """
+
+    passage_length = search_service_settings.PASSAGE_LENGTH
+
     @property
     def data(self):
         """Bypasses the wrapping of the returned value with a ReturnDict from
@@ -44,6 +78,23 @@ class BaseModelToIndexableSerializer(serializers.Serializer):
     def to_indexables(self, instance):
         return [{}]
 
+    def to_passages(self, indexable_text):
+        """Split the text on spaces (as for the word indexes of a box-selector)
+        into passages of at most `passage_length` words.
+        """
+        words = indexable_text.split(" ") if isinstance(indexable_text, str) else []
+        if not self.passage_length or len(words) <= self.passage_length:
+            return []
+        return [
+            {
+                "word_offset": word_offset,
+                "passage_text": " ".join(
+                    words[word_offset : word_offset + self.passage_length]
+                ),
+            }
+            for word_offset in range(0, len(words), self.passage_length)
+        ]
+
     def to_representation(self, instance):
         resource_fields = {
             "resource_id": instance.id,
@@ -55,6 +106,10 @@ class BaseModelToIndexableSerializer(serializers.Serializer):
             indexable_language = format_indexable_language_fields(
                 indexable.pop("language", None)
             )
+            if "passages" not in indexable and (
+                passages := self.to_passages(indexable.get("indexable_text"))
+            ):
+                indexable["passages"] = passages
             indexables_data.append(
                 {**resource_fields, **indexable_language, **indexable}
             )
@@ -57,3 +57,8 @@ class FacetedSearchQueryParamDataSerializer(serializers.Serializer):
 
     fulltext = StringQueryParamSerializer(required=False)
     facets = MetadataFacetQueryParamSerializer(source="facet", required=False)
+    fields = StringQueryParamSerializer(required=False)
+    exclude = StringQueryParamSerializer(required=False)
+    count_only = StringQueryParamSerializer(required=False)
+    results = StringQueryParamSerializer(required=False)
+    facet_counts = StringQueryParamSerializer(required=False)
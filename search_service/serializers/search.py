@@ -3,6 +3,7 @@ search_service/serializers/search.py - Serializer classes for Indexables and Res
 """
 
 import logging
+from collections import defaultdict
 
 from django.utils.module_loading import import_string
 from django.contrib.contenttypes.models import ContentType
@@ -12,8 +13,10 @@ from django.contrib.postgres.search import (
     SearchHeadline,
 )
 from django.db.models import (
+    Case,
     F,
     Value,
+    When,
     CharField,
 )
 
@@ -29,6 +32,14 @@ from ..models import (
     BaseSearchResource,
     JSONResource,
 )
+from ..functions import MatchedWordIndexes
+from .fields import SelectorField
+from ..ranking import (
+    indexable_headline,
+    indexable_rank,
+    indexable_word_offset,
+)
+from ..timing import timed
 
 
 logger = logging.getLogger(__name__)
@@ -36,34 +47,30 @@ logger = logging.getLogger(__name__)
 
 def calc_offsets(obj):
     """
-    The search "hit" should have a 'fullsnip' annotation which is a the entire
-    text of the indexable resource, with <start_sel> and <end_sel> wrapping each
-    highlighted word.
+    The search "hit" should either have a 'word_indexes' annotation, which is the
+    list of the indexes of the words in the text matching the search, or a
+    'fullsnip' annotation which is a the entire text of the indexable resource,
+    with <start_sel> and <end_sel> wrapping each highlighted word.
+
+    Where the 'fullsnip' is taken from a passage of the indexable text, the
+    'word_offset' annotation is the index of the first word of that passage.
 
     Check if there's a selector on the indexable, and then if there's a box-selector
-    use this to generate a list of xywh coordinates by retrieving the selector by
-    its index from a list of lists
+    (packed or in the selector JSON) use this to generate a list of xywh coordinates
+    by retrieving the selector by its index
     """
-    if hasattr(obj, "fullsnip"):
+    offsets = []
+    if (word_indexes := getattr(obj, "word_indexes", None)) is not None:
+        offsets = word_indexes
+    elif getattr(obj, "fullsnip", None):
         words = obj.fullsnip.split(" ")
-        offsets = []
-        if words:
-            for i, word in enumerate(words):
-                if "<start_sel>" in word and "<end_sel>" in word:
-                    offsets.append(i)
-            if offsets:
-                if obj.selector:
-                    if (boxes := obj.selector.get("box-selector")) is not None:
-                        box_list = []
-                        for x in offsets:
-                            try:
-                                box_list.append(boxes[x])
-                            except (IndexError, ValueError):
-                                pass
-                        if box_list:
-                            return box_list  # [boxes[x] for x in offsets if boxes[x]]
-                        else:
-                            return
+        word_offset = getattr(obj, "word_offset", 0) or 0
+        for i, word in enumerate(words):
+            if "<start_sel>" in word and "<end_sel>" in word:
+                offsets.append(i + word_offset)
+    if offsets:
+        if box_list := obj.get_boxes(offsets):
+            return box_list
     return
 
 
@@ -115,6 +122,8 @@ class IndexableAPISearchSerializer(BaseRankSnippetSearchSerializer):
     Serializer for the Indexable with the snippets and ranks included
     """
 
+    selector = SelectorField(read_only=True)
+
     class Meta:
         model = Indexable
         fields = [
@@ -197,37 +206,72 @@ class ResourceSearchHitsSerializer(serializers.Serializer):
         filter_kwargs = {"rank__gt": 0.0}
         return (
             queryset.annotate(
-                rank=SearchRank(F("search_vector"), search_query, cover_density=True),
+                rank=indexable_rank(search_query),
                 snippet=Concat(
                     Value("'"),
-                    SearchHeadline(
-                        "original_content",
+                    indexable_headline(
                         search_query,
+                        field="original_content",
                         max_words=50,
                         min_words=25,
                         max_fragments=3,
                     ),
                     output_field=CharField(),
                 ),
-                fullsnip=SearchHeadline(
-                    "indexable_text",
-                    search_query,
-                    start_sel="<start_sel>",
-                    stop_sel="<end_sel>",
-                    highlight_all=True,
+                # The highlighted fulltext is only needed to find the matched
+                # words where they can't be found from the word positions.
+                fullsnip=Case(
+                    When(word_positions__isnull=False, then=Value(None)),
+                    default=indexable_headline(
+                        search_query,
+                        start_sel="<start_sel>",
+                        stop_sel="<end_sel>",
+                        highlight_all=True,
+                    ),
+                    output_field=CharField(),
                 ),
+                word_offset=indexable_word_offset(search_query),
+                word_indexes=MatchedWordIndexes(search_query),
             )
             .filter(search_vector=search_query, **filter_kwargs)
             .order_by("-rank")
         )
 
+    def prefetch_hits(self, resources):
+        """Query the hits of all of the `resources` (e.g. a page or a chunk of
+        the results) at once, rather than once per resource, and set them as
+        the `search_hits` of each resource.
+        """
+        search_query = self.context.get("request").data.get("headline_query", None)
+        if not search_query or not resources:
+            return
+        with timed(getattr(self.context.get("view"), "search_timer", None), "hits"):
+            resource_ids = defaultdict(list)
+            for resource in resources:
+                content_type = ContentType.objects.get_for_model(resource).id
+                resource_ids[content_type].append(resource.id)
+            hits = defaultdict(list)
+            for content_type, ids in resource_ids.items():
+                qs = Indexable.objects.filter(
+                    resource_id__in=ids, resource_content_type=content_type
+                )
+                for indexable in self.annotate_indexable_queryset(qs, search_query):
+                    hits[(content_type, indexable.resource_id)].append(indexable)
+            for resource in resources:
+                content_type = ContentType.objects.get_for_model(resource).id
+                resource.search_hits = hits[(content_type, resource.id)]
+
     def to_representation(self, resource):
         search_query = self.context.get("request").data.get("headline_query", None)
         if search_query:
-            qs = self.get_indexable_queryset(resource)
-            qs = self.annotate_indexable_queryset(qs, search_query)
-            serializer = self.serializer_class(qs, many=True)
-            return serializer.data
+            # Timed as a stage of the search, separately from the results
+            with timed(getattr(self.context.get("view"), "search_timer", None), "hits"):
+                qs = getattr(resource, "search_hits", None)
+                if qs is None:
+                    qs = self.get_indexable_queryset(resource)
+                    qs = self.annotate_indexable_queryset(qs, search_query)
+                serializer = self.serializer_class(qs, many=True)
+                return serializer.data
         else:
             return []
 
@@ -0,0 +1,148 @@
+"""
+search_service/serializers/values.py - Fast serialization of search results from `.values()` rows.
+"""
+
+import logging
+from urllib.parse import quote
+
+from django.urls.resolvers import RFC3986_SUBDELIMS
+from rest_framework import serializers
+from rest_framework.relations import HyperlinkedIdentityField
+from rest_framework.reverse import reverse
+
+from ..boxes import unpack_selector
+from .fields import SelectorField
+
+logger = logging.getLogger(__name__)
+
+# Fields whose representation of a (non null) value is a plain conversion.
+SIMPLE_CONVERTERS = {
+    serializers.CharField: str,
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+    serializers.BooleanField: bool,
+    serializers.ReadOnlyField: None,
+}
+
+# Fields whose own `to_representation` is used for each (non null) value.
+REPRESENTATION_FIELDS = (
+    serializers.UUIDField,
+    serializers.DateTimeField,
+    serializers.DateField,
+    serializers.DecimalField,
+    serializers.JSONField,
+)
+
+URL_LOOKUP_PLACEHOLDER = "__lookup_value__"
+
+
+def nullable(converter):
+    def convert(value):
+        return None if value is None else converter(value)
+
+    return convert
+
+
+class ValuesRowFormatter:
+    """Formats the `.values()` rows of a search queryset into the same
+    representation as the serializer that it is created from, without
+    instantiating a model, or calling `reverse()`, for each row.
+
+    The columns to fetch and a converter for each field are compiled once per
+    request. Hyperlinks are built from a URL template that is reversed once.
+    Use `for_serializer` to create one, which returns None where the
+    serializer has fields that can't be formatted from a row.
+    """
+
+    def __init__(self, columns, converters):
+        self.columns = columns
+        self.converters = converters
+
+    @classmethod
+    def for_serializer(cls, serializer, queryset):
+        model = serializer.Meta.model
+        pk_name = model._meta.pk.name
+        model_fields = [f.name for f in model._meta.concrete_fields]
+        annotations = queryset.query.annotations
+        columns = {pk_name}
+        converters = []
+        for field_name, field in serializer.fields.items():
+            if isinstance(field, SelectorField):
+                columns.update(field.source_fields)
+                converters.append((field_name, cls.selector_converter(field)))
+            elif isinstance(field, HyperlinkedIdentityField):
+                if field.lookup_field not in model_fields:
+                    return None
+                columns.add(field.lookup_field)
+                converters.append(
+                    (field_name, cls.url_converter(field, serializer.context))
+                )
+            elif (
+                converter := cls.field_converter(field)
+            ) is not None and field.source in model_fields + list(annotations):
+                columns.add(field.source)
+                converters.append((field_name, cls.column_converter(field, converter)))
+            elif converter is not None and getattr(field, "default", None) is None:
+                # Fields defaulting to None, for annotations that weren't made
+                converters.append((field_name, lambda row: None))
+            else:
+                return None
+        return cls(sorted(columns), converters)
+
+    @staticmethod
+    def field_converter(field):
+        if "." in field.source or field.source == "*":
+            return None
+        if type(field) in SIMPLE_CONVERTERS:
+            return SIMPLE_CONVERTERS[type(field)] or (lambda value: value)
+        if isinstance(field, REPRESENTATION_FIELDS):
+            return field.to_representation
+        return None
+
+    @staticmethod
+    def column_converter(field, converter):
+        column = field.source
+        convert = nullable(converter)
+
+        def convert_column(row):
+            return convert(row[column])
+
+        return convert_column
+
+    @staticmethod
+    def selector_converter(field):
+        selector_column, packed_column = field.source_fields
+
+        def convert_selector(row):
+            return field.to_representation_value(
+                unpack_selector(row[selector_column], row[packed_column])
+            )
+
+        return convert_selector
+
+    @staticmethod
+    def url_converter(field, context):
+        request = context.get("request")
+        url_format = context.get("format")
+        if url_format and field.format and field.format != url_format:
+            url_format = field.format
+        url = reverse(
+            field.view_name,
+            kwargs={field.lookup_url_kwarg: URL_LOOKUP_PLACEHOLDER},
+            request=request,
+            format=url_format,
+        )
+        prefix, _, suffix = url.rpartition(URL_LOOKUP_PLACEHOLDER)
+        column = field.lookup_field
+
+        def convert_url(row):
+            lookup_value = quote(str(row[column]), safe=RFC3986_SUBDELIMS + "/~:@")
+            return serializers.Hyperlink(f"{prefix}{lookup_value}{suffix}", None)
+
+        return convert_url
+
+    def __call__(self, row):
+        return {field_name: convert(row) for field_name, convert in self.converters}
+
+    def format_rows(self, rows):
+        return [self(row) for row in rows]
@@ -11,6 +11,63 @@ DEFAULT_SETTINGS = {
     "DEFAULT_SEARCH_TYPE": "websearch",
     "DEFAULT_FACET_TYPES": ["metadata"],
     "MAX_PAGE_SIZE": 25,
+    # Indexable types copied to the narrow FacetValue table for faceting.
+    "FACET_VALUE_TYPES": ["metadata", "entity", "tag"],
+    # Number of words above which indexable_text is split into passages.
+    "PASSAGE_LENGTH": None,
+    # Store word-level box-selectors as packed int32 values rather than JSON.
+    "PACK_BOX_SELECTORS": False,
+    # Number of rows fetched from the server-side cursor at a time by exports.
+    "EXPORT_CHUNK_SIZE": 2000,
+    # Maximum number of searches in a msearch, and of threads to run them in.
+    "MSEARCH_MAX_SEARCHES": 20,
+    "MSEARCH_MAX_WORKERS": 1,
+    # Seconds for which the facet fields listed from the FacetField catalog
+    # are cached in-process (None or 0 to disable).
+    "FACET_FIELD_CACHE_TTL": 60,
+    # Time the stages of searches, for the Server-Timing header and logs, and
+    # add the timings to the `debug` of the search responses.
+    "SEARCH_TIMINGS": True,
+    "SEARCH_TIMINGS_IN_RESPONSE": False,
+    # Fraction of searches whose queries are explained, and the number of
+    # explained searches kept for the search_explain endpoint.
+    "EXPLAIN_SAMPLE_RATE": 0.0,
+    "EXPLAIN_BUFFER_SIZE": 50,
+    # Milliseconds over which (timed) searches are recorded in the slow search
+    # log (None to disable, as each slow search is written to the database).
+    "SLOW_SEARCH_THRESHOLD": None,
+    # Directory that each process writes its metrics to, so that the metrics
+    # endpoint aggregates those of all of the (e.g. gunicorn worker) processes
+    # (None to only report those of the process serving the request), and the
+    # seconds between the writes.
+    "METRICS_DIR": None,
+    "METRICS_FLUSH_INTERVAL": 5,
+    # File that the requests to the search viewsets are appended to (as
+    # NDJSON), for the replay_searches command (None to disable), the fraction
+    # of the requests that are recorded, and whether the search terms and
+    # values are anonymized.
+    "SEARCH_RECORDING_FILE": None,
+    "SEARCH_RECORDING_SAMPLE_RATE": 1.0,
+    "SEARCH_RECORDING_ANONYMIZE": False,
+    # Fraction of the search and indexing requests that are profiled by the
+    # SamplingProfilerMiddleware, milliseconds over which they are profiled
+    # (None to disable), milliseconds between the samples of their stacks,
+    # the number of profiles kept for the profiles endpoint, and a directory
+    # that the profiles are also written to (None to only keep them).
+    "PROFILE_SAMPLE_RATE": 0.0,
+    "PROFILE_THRESHOLD": None,
+    "PROFILE_INTERVAL": 5,
+    "PROFILE_BUFFER_SIZE": 50,
+    "PROFILE_DIR": None,
+    # Milliseconds after which the queries of each stage of a search ("page",
+    # which includes the "count", or "facets") are cancelled, e.g.
+    # {"page": 10000, "count": 2000}. Cancelled counts and facets are left
+    # out of the search response.
+    "STATEMENT_TIMEOUTS": {},
+    # Policy of the cost guard of the search viewsets, over the
+    # DEFAULT_COST_POLICY of search_service.cost, e.g. {"action": "rewrite"}
+    # (None to only guard the viewsets that set a `cost_policy`).
+    "SEARCH_COST_POLICY": None,
 }
 
 
@@ -1,5 +1,6 @@
 import logging
 
+from django.db.models.signals import pre_delete
 from django.dispatch import (
     Signal,
     receiver,
@@ -18,3 +19,11 @@ def index_json_resource(sender, instance, **kwargs):
     logger.info(f"Running indexing task for: ({instance})")
     task = JSONResourceIndexingTask(instance.id)
     task.run()
+
+
+@receiver(pre_delete, sender=JSONResource)
+def remove_json_resource_summary_counts(sender, instance, **kwargs):
+    """Remove the counts of the indexables of a resource from the summary
+    tables, before they are deleted along with it.
+    """
+    instance.apply_summary_count_deltas(instance.get_summary_counts(), {})
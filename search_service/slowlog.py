@@ -0,0 +1,60 @@
+"""
+search_service/slowlog.py - Log of the search requests slower than the SLOW_SEARCH_THRESHOLD.
+
+Slow searches are logged (as JSON) to the `search_service.slowlog` logger, and
+recorded as SlowSearch rows, with the normalized fingerprint of the search
+(from the SearchParser), so that the `slow_searches` command can aggregate the
+durations of each shape of search.
+"""
+
+import json
+import logging
+
+from django.db import DatabaseError
+
+from .models import SlowSearch
+from .settings import search_service_settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_result_count(data):
+    """The number of results in the (search) response data, if it has any."""
+    if not isinstance(data, dict):
+        return None
+    if isinstance(pagination := data.get("pagination"), dict):
+        return pagination.get("totalResults")
+    if isinstance(count := data.get("count"), int):
+        return count
+    if isinstance(results := data.get("results"), list):
+        return len(results)
+    return None
+
+
+def record_slow_search(view, response, timings):
+    """Log and record the search of the view as a SlowSearch, where the
+    duration of its `timings` (in milliseconds) is over the threshold.
+    """
+    threshold = search_service_settings.SLOW_SEARCH_THRESHOLD
+    if threshold is None or timings["duration"] < threshold:
+        return None
+    request_data = getattr(view.request, "data", None)
+    fingerprint = "browse"
+    if isinstance(request_data, dict):
+        fingerprint = request_data.get("fingerprint") or fingerprint
+    slow_search = {
+        "view": view.__class__.__name__,
+        "action": view.action,
+        "fingerprint": fingerprint,
+        "duration": timings["duration"],
+        "result_count": get_result_count(getattr(response, "data", None)),
+        "timings": timings["stages"],
+    }
+    logger.warning(
+        f"Slow search: {json.dumps(slow_search)}", extra={"slow_search": slow_search}
+    )
+    try:
+        return SlowSearch.objects.create(**slow_search)
+    except DatabaseError as e:
+        logger.error(f"Failed to record slow search: ({e})")
+        return None
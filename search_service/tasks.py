@@ -1,5 +1,14 @@
 import logging
+from time import perf_counter
 
+from django.db import transaction
+
+from .metrics import (
+    indexables_written,
+    indexing_duration,
+    indexing_failures,
+    indexing_in_progress,
+)
 from .models import (
     JSONResource,
 )
@@ -44,6 +53,32 @@ class BaseSearchServiceIndexingTask(object):
         instance.indexables.all().delete()
 
     def run(self):
+        """Run the indexing, recording its duration, and the number of
+        indexables written or the failure, in the indexing metrics.
+        """
+        model_name = self.model.__name__
+        indexing_in_progress.inc(model=model_name)
+        start = perf_counter()
+        try:
+            data, written = self.index()
+        except Exception:
+            indexing_failures.inc(model=model_name)
+            raise
+        finally:
+            indexing_in_progress.dec(model=model_name)
+            indexing_duration.observe(perf_counter() - start, model=model_name)
+        if written:
+            indexables_written.inc(len(data), model=model_name)
+        else:
+            indexing_failures.inc(model=model_name)
+        return data
+
+    def index(self):
+        """Replace the Indexables of the object, and apply the change in the
+        counts of its indexables to the summary tables (e.g. the FacetField
+        catalog). Returns the indexables data (or the errors), and whether
+        they were written.
+        """
         instance = self.get_object()
         instance_indexables = self.get_serializer(instance)
         indexables_serializer = IndexableCreateUpdateSerializer(
@@ -51,13 +86,18 @@ class BaseSearchServiceIndexingTask(object):
         )
         if indexables_serializer.is_valid():
             logger.info(indexables_serializer.validated_data)
-            self.delete_existing_indexables(instance)
-            indexables_serializer.save()
-            return indexables_serializer.data
+            with transaction.atomic():
+                summary_counts = instance.get_summary_counts()
+                self.delete_existing_indexables(instance)
+                indexables_serializer.save()
+                instance.apply_summary_count_deltas(
+                    summary_counts, instance.get_summary_counts()
+                )
+            return indexables_serializer.data, True
         else:
             logger.error("Failed to create indexables")
             logger.info(indexables_serializer.errors)
-            return indexables_serializer.errors
+            return indexables_serializer.errors, False
 
 
 class JSONResourceIndexingTask(BaseSearchServiceIndexingTask):
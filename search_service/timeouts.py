@@ -0,0 +1,72 @@
+"""
+search_service/timeouts.py - Statement timeouts of the stages of searches.
+
+The queries of a stage of a search (e.g. the "page", "count" or "facets") are
+run with the Postgres `statement_timeout` of the stage (`SET LOCAL`, in a
+transaction, or a savepoint where one is already open), so that a single
+pathological query is cancelled rather than holding a connection. A cancelled
+stage raises a SearchTimeout, which, unless the viewset degrades the response
+without the stage (i.e. without the facets or the total), is a 503 response.
+"""
+
+import logging
+from contextlib import contextmanager
+
+from django.db import OperationalError, connection, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .metrics import search_timeouts
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE of the error of a query cancelled by the statement_timeout.
+QUERY_CANCELED = "57014"
+
+
+class SearchTimeout(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The search took too long to run, and was cancelled."
+    default_code = "search_timeout"
+
+
+def is_statement_timeout(exc):
+    return getattr(exc.__cause__, "pgcode", None) == QUERY_CANCELED
+
+
+@contextmanager
+def statement_timeout(timeout, view=None, stage=None):
+    """Context manager that cancels the queries run in it after `timeout`
+    milliseconds (if set), raising a SearchTimeout.
+    """
+    if not timeout:
+        yield
+        return
+    nested = connection.in_atomic_block
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT current_setting('statement_timeout'), "
+                    "set_config('statement_timeout', %s, true)",
+                    [f"{int(timeout)}ms"],
+                )
+                previous, _ = cursor.fetchone()
+            yield
+            if nested:
+                # Released savepoints keep the setting until the end of the
+                # enclosing transaction, so restore that of the enclosing stage
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT set_config('statement_timeout', %s, true)",
+                        [previous],
+                    )
+    except OperationalError as e:
+        if not is_statement_timeout(e):
+            raise
+        search_timeouts.inc(view=view, stage=stage)
+        logger.warning(
+            f"Search stage cancelled by its statement timeout: "
+            f"({view=}, {stage=}, {timeout=})"
+        )
+        raise SearchTimeout() from e
@@ -0,0 +1,180 @@
+"""
+search_service/timing.py - Per-stage timing of the search pipeline.
+
+A SearchTimer records the wall time of each (named) stage of a search, and
+the number and time of the SQL queries run in it. Stages can be nested, in
+which case the time of a stage excludes that of the stages nested in it, and
+each query is counted against the innermost stage that it is run in. Stages
+with the same name (e.g. the hits of each result) are summed.
+"""
+
+import json
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+from django.db import connection
+from rest_framework.response import Response
+
+from .metrics import record_search_metrics
+from .settings import search_service_settings
+from .slowlog import record_slow_search
+
+logger = logging.getLogger(__name__)
+
+# Name of the stage for queries that are run outside of any stage.
+UNTIMED_STAGE = "other"
+
+
+def timed(timer, name):
+    """Context manager that times a stage with the timer, if there is one."""
+    if timer is None:
+        return nullcontext()
+    return timer.stage(name)
+
+
+class SearchTimer(object):
+    def __init__(self):
+        self.stages = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.start = perf_counter()
+        self.duration = None
+
+    @property
+    def stack(self):
+        # Stages run in other threads (i.e. by a msearch) are nested separately
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def record(self, name, duration=0.0, queries=0, sql_duration=0.0):
+        with self.lock:
+            stage = self.stages.setdefault(
+                name, {"duration": 0.0, "queries": 0, "sql_duration": 0.0}
+            )
+            stage["duration"] += duration
+            stage["queries"] += queries
+            stage["sql_duration"] += sql_duration
+
+    @contextmanager
+    def stage(self, name):
+        stack = self.stack
+        # The name of the stage and the time of the stages nested in it
+        stack.append([name, 0.0])
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            _, nested = stack.pop()
+            self.record(name, duration=elapsed - nested)
+            if stack:
+                stack[-1][1] += elapsed
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """Database execute wrapper that counts each query against the stage
+        that it is run in.
+        """
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stack = self.stack
+            self.record(
+                stack[-1][0] if stack else UNTIMED_STAGE,
+                queries=1,
+                sql_duration=perf_counter() - start,
+            )
+
+    def stop(self):
+        self.duration = perf_counter() - self.start
+
+    def get_timings(self):
+        """The timings of the stages, in the order they were first run, with
+        the durations in milliseconds.
+        """
+        with self.lock:
+            stages = [
+                {
+                    "name": name,
+                    "duration": round(stage["duration"] * 1000, 3),
+                    "queries": stage["queries"],
+                    "sql_duration": round(stage["sql_duration"] * 1000, 3),
+                }
+                for name, stage in self.stages.items()
+            ]
+        duration = self.duration if self.duration is not None else 0.0
+        return {"duration": round(duration * 1000, 3), "stages": stages}
+
+    def get_server_timing(self):
+        """The timings as the value of a Server-Timing header."""
+        timings = self.get_timings()
+        metrics = [
+            f'{stage["name"]};dur={stage["duration"]};'
+            f'desc="{stage["queries"]} queries, {stage["sql_duration"]}ms SQL"'
+            for stage in timings["stages"]
+        ]
+        metrics.append(f'total;dur={timings["duration"]}')
+        return ", ".join(metrics)
+
+
+class SearchTimingMixin(object):
+    """Times the stages of the requests to a search viewset with a SearchTimer,
+    where `SEARCH_TIMINGS` is set. The timings are sent in a Server-Timing
+    header and logged (as JSON) to the `search_service.timing` logger, and
+    with `SEARCH_TIMINGS_IN_RESPONSE` are added to the `debug` of the
+    response data. Searches over the `SLOW_SEARCH_THRESHOLD` are recorded
+    in the slow search log, and all searches in the search metrics.
+
+    The parsing of the request, each of the filter backends, and rendering
+    are timed here. The other stages are timed with `timed` by the viewset.
+    """
+
+    search_timer = None
+
+    def timed(self, name):
+        return timed(self.search_timer, name)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.search_timer is not None:
+            with self.timed("parse"):
+                request.data
+
+    def filter_queryset(self, queryset):
+        for backend in list(self.filter_backends):
+            with self.timed(f"filter.{backend.__name__}"):
+                queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    def dispatch(self, request, *args, **kwargs):
+        if not search_service_settings.SEARCH_TIMINGS:
+            return super().dispatch(request, *args, **kwargs)
+        self.search_timer = timer = SearchTimer()
+        with connection.execute_wrapper(timer.execute_wrapper):
+            response = super().dispatch(request, *args, **kwargs)
+            if isinstance(response, Response):
+                if search_service_settings.SEARCH_TIMINGS_IN_RESPONSE and isinstance(
+                    response.data, dict
+                ):
+                    timer.stop()
+                    response.data.setdefault("debug", {})[
+                        "timings"
+                    ] = timer.get_timings()
+                with self.timed("render"):
+                    response.render()
+        timer.stop()
+        response["Server-Timing"] = timer.get_server_timing()
+        timings = {
+            "view": self.__class__.__name__,
+            "action": self.action,
+            **timer.get_timings(),
+        }
+        logger.info(
+            f"Search timings: {json.dumps(timings)}", extra={"search_timings": timings}
+        )
+        record_search_metrics(self, response, timings)
+        record_slow_search(self, response, timings)
+        return response
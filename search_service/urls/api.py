@@ -12,6 +12,9 @@ from ..views import (
     ContentTypeAPIViewSet,
     IndexableAPISearchViewSet,
     JSONResourceAPISearchViewSet,
+    SearchExplainViewSet,
+    ProfileViewSet,
+    MetricsViewSet,
     # Sandboxed viewsets
     SandboxedJSONResourceAPIViewSet,
     SandboxedIndexableAPIViewSet,
@@ -48,6 +51,9 @@ router.register(
     JSONResourceAPISearchViewSet,
     basename="jsonresource_search",
 )
+router.register("search_explain", SearchExplainViewSet, basename="search_explain")
+router.register("profiles", ProfileViewSet, basename="profiles")
+router.register("metrics", MetricsViewSet, basename="metrics")
 
 # Only included in the example_project for testing
 # Authentication classes should be set globally,
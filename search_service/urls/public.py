@@ -4,6 +4,7 @@ search_service/urls/public.py SimpleRouter registration of Public Viewsets.
 from rest_framework import routers
 
 from ..views import (
+    GenericFacetsViewSet,
     IndexablePublicSearchViewSet,
     JSONResourcePublicSearchViewSet,
 )
@@ -17,5 +18,6 @@ router.register(
 router.register(
     "json_resource_search", JSONResourcePublicSearchViewSet, basename="json_search"
 )
+router.register("facets", GenericFacetsViewSet, basename="facets")
 
 urlpatterns = router.urls
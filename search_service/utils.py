@@ -1,8 +1,69 @@
 import logging
+import threading
+import time
+import unicodedata
+
+from .metrics import cache_requests
+from .settings import search_service_settings
 
 logger = logging.getLogger(__name__)
 
 
+def is_facet_value_type(indexable_type):
+    """Whether indexables of this type are copied to the FacetValue table."""
+    return str(indexable_type).lower() in [
+        t.lower() for t in search_service_settings.FACET_VALUE_TYPES
+    ]
+
+
+def normalize_facet_value(value):
+    """Normalise a facet value for case-insensitive equality lookups
+    against the `normalized_value` of a FacetValue. Values are casefolded,
+    so (unlike the UPPER() of an iexact lookup on the Indexable) e.g. "ß"
+    matches "SS" and "ss".
+    """
+    return unicodedata.normalize("NFC", str(value)).casefold()
+
+
+class TTLCache(object):
+    """Thread-safe in-process cache whose entries expire `ttl` seconds after
+    they are set. Entries are only evicted on expiry, so the keys should be
+    drawn from a bounded set. Where the cache is `name`d, its hits and misses
+    are counted in the `cache_requests` metric.
+    """
+
+    def __init__(self, ttl, name=None):
+        self.ttl = ttl
+        self.name = name
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get_or_set(self, key, default):
+        """Get the cached value for the key, or cache and return the value
+        of calling `default`.
+        """
+        if not self.ttl:
+            return default()
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+        hit = entry is not None and entry[0] > now
+        if self.name is not None:
+            cache_requests.inc(cache=self.name, result="hit" if hit else "miss")
+        if hit:
+            return entry[1]
+        value = default()
+        with self.lock:
+            entries = {k: v for k, v in self.entries.items() if v[0] > now}
+            entries[key] = (now + self.ttl, value)
+            self.entries = entries
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+
+
 class ActionBasedSerializerMixin(object):
 
     serializer_mapping = {
@@ -16,3 +77,100 @@ class ActionBasedSerializerMixin(object):
             return serializer_class
         else:
             return self.serializer_class
+
+
+class QuerysetOptimizationMixin(object):
+    """Applies the `prefetch_related_fields` of a viewset to its queryset, and
+    for list actions defers the (large) `deferred_fields`, which are then also
+    left out of the serialized results. Deferred fields can be requested with
+    a comma separated `include` query param, e.g. `?include=search_vector`.
+    """
+
+    prefetch_related_fields = []
+    deferred_fields = []
+    include_query_param = "include"
+
+    def get_included_fields(self):
+        include = self.request.query_params.get(self.include_query_param, "")
+        return [f.strip() for f in include.split(",") if f.strip()]
+
+    def get_deferred_fields(self):
+        if self.action != "list":
+            return []
+        included = self.get_included_fields()
+        return [f for f in self.deferred_fields if f not in included]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        if deferred_fields := self.get_deferred_fields():
+            queryset = queryset.defer(*deferred_fields)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if deferred_fields := self.get_deferred_fields():
+            fields = getattr(serializer, "child", serializer).fields
+            for field_name in deferred_fields:
+                fields.pop(field_name, None)
+        return serializer
+
+
+def is_field_included(request_data, field_name):
+    """Whether a field is in the sparse fieldset of a search request, i.e. it is
+    in the requested `fields` (if any) and not in the `exclude`d fields. No
+    fields are included where the results aren't requested.
+    """
+    if request_data.get("results") is False:
+        return False
+    if (fields := request_data.get("fields")) and field_name not in fields:
+        return False
+    if (exclude := request_data.get("exclude")) and field_name in exclude:
+        return False
+    return True
+
+
+class SparseFieldsetMixin(object):
+    """Trims the serialized results of a search viewset to the `fields` and
+    `exclude` of the (parsed) search request, and defers the model columns of
+    the fields that are left out. Serializer fields whose `source` is not a
+    single column can list their columns in a `source_fields` attribute.
+    """
+
+    def get_excluded_fields(self, field_names):
+        data = self.request.data
+        if not (data.get("fields") or data.get("exclude")):
+            return []
+        return [f for f in field_names if not is_field_included(data, f)]
+
+    def get_excluded_columns(self):
+        data = self.request.data
+        if not (data.get("fields") or data.get("exclude")):
+            return []
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        model_fields = [
+            f.name
+            for f in serializer.Meta.model._meta.concrete_fields
+            if not f.primary_key
+        ]
+        columns = []
+        for field_name in self.get_excluded_fields(serializer.fields):
+            field = serializer.fields[field_name]
+            for source in getattr(field, "source_fields", [field.source]):
+                if source in model_fields:
+                    columns.append(source)
+        return columns
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if columns := self.get_excluded_columns():
+            queryset = queryset.defer(*columns)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = getattr(serializer, "child", serializer).fields
+        for field_name in self.get_excluded_fields(list(fields)):
+            fields.pop(field_name)
+        return serializer
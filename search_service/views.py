@@ -1,14 +1,24 @@
 # Django Django Imports
 
+import copy
 import logging
 import itertools
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext
+from functools import reduce
+from operator import or_
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldError, ValidationError as DjangoValidationError
+from django.db import DataError, DatabaseError, connection, connections, transaction
+from django.http import StreamingHttpResponse
 
 from django.db.models import (
     Count,
+    F,
     Q,
+    Sum,
 )
 
 # DRF Imports
@@ -18,7 +28,9 @@ from rest_framework import (
     mixins,
 )
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ParseError
 from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
 from rest_framework.response import Response
 
 from django_filters.rest_framework import DjangoFilterBackend
@@ -26,17 +38,24 @@ from django_filters.rest_framework import DjangoFilterBackend
 # Local imports
 from .models import (
     Context,
+    FacetField,
+    FacetValue,
+    FacetValueCount,
     Indexable,
     ResourceRelationship,
     JSONResource,
+    apply_summary_count_deltas,
+    get_summary_counts,
 )
 
 from .parsers import (
+    FastJSONParser,
     SearchParser,
     IndexableSearchParser,
     ResourceSearchParser,
 )
 from .pagination import MadocPagination
+from .renderers import CSVRenderer, NDJSONRenderer, PrometheusTextRenderer
 
 from .serializers.api import (
     ContentTypeAPISerializer,
@@ -48,15 +67,23 @@ from .serializers.api import (
 from .serializers.query_param import (
     FacetedSearchQueryParamDataSerializer,
 )
+from .serializers.values import ValuesRowFormatter
 from .serializers.search import (
     JSONResourceRelationshipSerializer,
     IndexableAPISearchSerializer,
     IndexablePublicSearchSerializer,
     JSONResourceAPISearchSerializer,
     JSONResourcePublicSearchSerializer,
+    ResourceSearchHitsSerializer,
     AutocompleteSerializer,
 )
-from .utils import ActionBasedSerializerMixin
+from .utils import (
+    ActionBasedSerializerMixin,
+    QuerysetOptimizationMixin,
+    SparseFieldsetMixin,
+    TTLCache,
+    is_facet_value_type,
+)
 
 from .filters import (
     GenericFilter,
@@ -64,25 +91,37 @@ from .filters import (
     AuthContextsFilter,
     ContextsFilter,
     FacetFilter,
-    GenericFacetListFilter,
+    FacetFieldContextsFilter,
     RankSnippetFilter,
 )
 from .authentication import (
     ContextsHeaderAuthentication,
 )
 from .settings import search_service_settings
+from .explain import SearchExplainMixin, explained_plans
+from .metrics import registry
+from .profiling import recorded_profiles
+from .recording import SearchRecordingMixin
+from .timing import SearchTimingMixin, timed
+from .timeouts import SearchTimeout, is_statement_timeout, statement_timeout
+from .cost import SearchCostGuardMixin
 
 logger = logging.getLogger(__name__)
 
 
-class JSONResourceAPIViewSet(viewsets.ModelViewSet):
+class JSONResourceAPIViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = JSONResource.objects.all()
     serializer_class = JSONResourceAPISerializer
+    prefetch_related_fields = ["contexts"]
     filter_backends = [AuthContextsFilter]
     filterset_fields = [
         "resource_id",
     ]
     lookup_field = "id"
+    # The requests that write resources (and so index them) are profiled by
+    # the SamplingProfilerMiddleware.
+    profiled = True
+    allow_profile = True
 
     @action(detail=False, methods=["post"])
     def create_nested(self, request, *args, **kwargs):
@@ -125,10 +164,14 @@ class SandboxedJSONResourceAPIViewSet(JSONResourceAPIViewSet):
     authentication_classes = [ContextsHeaderAuthentication]
 
 
-class IndexableAPIViewSet(viewsets.ModelViewSet):
+class IndexableAPIViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = Indexable.objects.all()
     serializer_class = IndexableAPISerializer
+    prefetch_related_fields = ["contexts"]
+    deferred_fields = ["search_vector", "original_content"]
     lookup_field = "id"
+    profiled = True
+    allow_profile = True
     filter_backends = [AuthContextsFilter, DjangoFilterBackend]
     filterset_fields = [
         "resource_id",
@@ -137,6 +180,41 @@ class IndexableAPIViewSet(viewsets.ModelViewSet):
         "subtype",
     ]
 
+    def get_summary_counts(self, resource_ids):
+        return get_summary_counts(
+            Indexable.objects.filter(resource_id__in=resource_ids),
+            FacetValue.objects.filter(resource_id__in=resource_ids),
+        )
+
+    @contextmanager
+    def summary_counts_updated(self, *resource_ids):
+        """Apply the change in the counts of the indexables of the resources,
+        from the writes in the context, to the summary tables (e.g. the
+        FacetField catalog), as the indexing tasks do.
+        """
+        with transaction.atomic():
+            summary_counts = self.get_summary_counts(resource_ids)
+            yield
+            apply_summary_count_deltas(
+                summary_counts, self.get_summary_counts(resource_ids)
+            )
+
+    def perform_create(self, serializer):
+        with self.summary_counts_updated(serializer.validated_data.get("resource_id")):
+            serializer.save()
+
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        with self.summary_counts_updated(
+            instance.resource_id,
+            serializer.validated_data.get("resource_id", instance.resource_id),
+        ):
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with self.summary_counts_updated(instance.resource_id):
+            instance.delete()
+
 
 class SandboxedIndexableAPIViewSet(IndexableAPIViewSet):
     authentication_classes = [ContextsHeaderAuthentication]
@@ -160,6 +238,41 @@ class ContentTypeAPIViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_field = "id"
 
 
+class SearchExplainViewSet(viewsets.ViewSet):
+    """
+    Lists the query plans of the most recently explained searches (of this
+    process), most recent first.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return Response(explained_plans.list())
+
+
+class ProfileViewSet(viewsets.ViewSet):
+    """
+    Lists the collapsed stack profiles of the most recently profiled search
+    and indexing requests (of this process), most recent first.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return Response(recorded_profiles.list())
+
+
+class MetricsViewSet(viewsets.ViewSet):
+    """
+    Exposes the indexing and search metrics (of all of the processes, where
+    `METRICS_DIR` is set), in the Prometheus text exposition format.
+    """
+
+    renderer_classes = [PrometheusTextRenderer]
+
+    def list(self, request, *args, **kwargs):
+        return Response(
+            registry.exposition(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
 class QueryParamDataMixin(object):
     """
     Gets the request's query params, effect a transform using
@@ -189,27 +302,122 @@ class QueryParamDataMixin(object):
                     logger.debug(
                         f"Parsing serialised data: ({p.__class__}, {query_serializer.data})"
                     )
-                    request.data.update(p.parse_data(query_serializer.data))
-
-
-class BaseSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+                    with timed(getattr(self, "search_timer", None), "parse"):
+                        data = query_serializer.data
+                        if hasattr(self, "guard_search_data"):
+                            data = self.guard_search_data(p, data)
+                        request.data.update(p.parse_data(data))
+
+
+class BaseSearchViewSet(
+    SearchRecordingMixin,
+    SearchTimingMixin,
+    SearchExplainMixin,
+    SearchCostGuardMixin,
+    SparseFieldsetMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
     """
     Base class for search viewsets, implements only a `list` and `create`
     to allow for GET and POST searches. Detail views for models are to be
     implemented by other viewsets.
+
+    The results can be trimmed to a sparse fieldset with the `fields` and
+    `exclude` of the search request.
+
+    The stages of each search are timed by the SearchTimingMixin, and the
+    queries of sampled (or, with `allow_explain`, flagged) searches are
+    explained by the SearchExplainMixin. The SearchRecordingMixin records
+    the searches for replaying, where `SEARCH_RECORDING_FILE` is set.
+
+    The queries of the page, count and facets stages are cancelled after
+    their statement timeouts, in which case the facets, or the total of the
+    pagination, are left out of the response (and listed as `unavailable`),
+    rather than failing the search.
+
+    Searches that are guaranteed to be expensive are rejected (or rewritten)
+    by the SearchCostGuardMixin, where a cost policy is set.
     """
 
     lookup_field = "id"
+    # Profiled by the SamplingProfilerMiddleware
+    profiled = True
     parser_classes = [SearchParser]
     filter_backends = [AuthContextsFilter, GenericFilter]
+    # Format the results from `.values()` rows rather than model instances,
+    # where the serializer's fields allow it.
+    values_serialization = False
+
+    # Read the facet counts of searches that browse a context from the
+    # FacetValueCount summary.
+    facet_summaries = False
 
     default_facets = ["metadata", "entity"]
 
+    # Statement timeouts (ms) of the stages of the searches, which override
+    # those of the `STATEMENT_TIMEOUTS` setting.
+    statement_timeouts = {}
+
+    def get_statement_timeout(self, stage):
+        return {
+            **search_service_settings.STATEMENT_TIMEOUTS,
+            **self.statement_timeouts,
+        }.get(stage)
+
+    def statement_timeout(self, stage):
+        return statement_timeout(
+            self.get_statement_timeout(stage),
+            view=self.__class__.__name__,
+            stage=stage,
+        )
+
+    def get_facet_summary_context(self, request):
+        """Get the urn of the one context that the search is restricted to
+        where it is otherwise unfiltered (i.e. it browses a context), or None.
+        Facet counts for these searches are read from the FacetValueCount
+        summary, where `facet_summaries` is set.
+        """
+        data = request.data
+        if not self.facet_summaries or any(
+            [
+                data.get(key)
+                for key in [
+                    "filter_query",
+                    "headline_query",
+                    "resource_filters",
+                    "facet_filters",
+                    "facet_on",
+                ]
+            ]
+        ):
+            return None
+        auth_contexts = set()
+        if request.auth and (contexts := request.auth.get("contexts")):
+            auth_contexts = set(contexts)
+        contexts = set()
+        if ContextsFilter in self.filter_backends:
+            if data.get("contexts_all"):
+                return None
+            contexts = set(data.get("contexts") or [])
+        if not contexts:
+            contexts = auth_contexts
+        elif auth_contexts and not contexts <= auth_contexts:
+            return None
+        if len(contexts) == 1:
+            return contexts.pop()
+        return None
+
     def get_facet_indexable_data(self, request, queryset):
-        """Get"""
+        """Get the facet value counts for the queryset. These are aggregated
+        from the narrow FacetValue table where all of the requested facet types
+        are `FACET_VALUE_TYPES`, otherwise from the Indexables. Where the
+        search only browses a context, they are read from the FacetValueCount
+        summary of the context.
+        """
+        facet_types = request.data.get("facet_types", self.default_facets)
         facet_filters = [
-            Q(resource_id__in=queryset),
-            Q(type__in=request.data.get("facet_types", self.default_facets)),
+            Q(type__in=facet_types),
         ]
         if facet_fields := request.data.get("facet_fields"):
             facet_filters.append(Q(subtype__in=facet_fields))
@@ -229,14 +437,31 @@ class BaseSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
                 facet_language_filter |= Q(language_iso639_2__in=iso639_2_codes)
             facet_filters.append(facet_language_filter)
 
-        indexables = (
-            Indexable.objects.filter(*facet_filters)
-            .values("type", "subtype", "group_id", "indexable_text")
-            .annotate(n=Count("id", distinct=True))
-            .order_by("type", "subtype", "group_id", "-n", "indexable_text")
-        )
+        if not all([is_facet_value_type(facet_type) for facet_type in facet_types]):
+            indexables = Indexable.objects.filter(
+                *facet_filters, resource_id__in=queryset
+            ).values("type", "subtype", "group_id", "indexable_text")
+        elif (context := self.get_facet_summary_context(request)) is not None:
+            return (
+                FacetValueCount.objects.filter(
+                    *facet_filters,
+                    context__urn=context,
+                    resource_content_type=ContentType.objects.get_for_model(
+                        queryset.model
+                    ),
+                )
+                .values("type", "subtype", "group_id", indexable_text=F("value"))
+                .annotate(n=Sum("indexable_count"))
+                .order_by("type", "subtype", "group_id", "-n", "indexable_text")
+            )
+        else:
+            indexables = FacetValue.objects.filter(
+                *facet_filters, resource_id__in=queryset
+            ).values("type", "subtype", "group_id", indexable_text=F("value"))
 
-        return indexables
+        return indexables.annotate(n=Count("id", distinct=True)).order_by(
+            "type", "subtype", "group_id", "-n", "indexable_text"
+        )
 
     def format_facet_data(self, request, indexables):
         grouped_facets = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
@@ -262,38 +487,258 @@ class BaseSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
 
     def get_search_data(self, request, queryset):
         """Create a dictionary of search related fields to include in the response."""
-        return {"facets": self.get_facets(request, queryset)}
+        if request.data.get("facet_counts") is False:
+            return {}
+        try:
+            with self.statement_timeout("facets"):
+                return {"facets": self.get_facets(request, queryset)}
+        except SearchTimeout:
+            return {"facets": {}, "unavailable": ["facets"]}
+
+    def get_row_formatter(self, queryset):
+        """Get a ValuesRowFormatter for the serializer, or None if the results
+        are to be serialized from model instances.
+        """
+        if not self.values_serialization:
+            return None
+        return ValuesRowFormatter.for_serializer(self.get_serializer(), queryset)
+
+    def prefetch_hits(self, serializer, instances):
+        """Query the hits of the instances at once, where the (result)
+        serializer has them.
+        """
+        hits = serializer.fields.get("hits")
+        if isinstance(hits, ResourceSearchHitsSerializer):
+            hits.prefetch_hits(instances)
+
+    def get_results_data(self, results, row_formatter=None):
+        if row_formatter is not None:
+            return row_formatter.format_rows(results)
+        serializer = self.get_serializer(results, many=True)
+        self.prefetch_hits(serializer.child, results)
+        return serializer.data
 
     def list(self, request, *args, **kwargs):
         """Duplicates the functionality of the list method
         from the `ListMethodMixin`, but includes fields
         created by the get_search_data in the response alongside
         results.
+
+        With `count_only` only the number of results is returned, and with
+        `results` false only the search data (i.e. the facets).
         """
         queryset = self.filter_queryset(self.get_queryset())
+        self.check_plan_cost(queryset)
 
-        search_data = self.get_search_data(request, queryset)
+        if request.data.get("count_only"):
+            with self.timed("count"), self.statement_timeout("count"):
+                return Response({"count": queryset.count()})
+
+        with self.timed("facets"):
+            search_data = self.get_search_data(request, queryset)
+
+        if request.data.get("results") is False:
+            return Response(search_data)
+
+        if (row_formatter := self.get_row_formatter(queryset)) is not None:
+            queryset = queryset.prefetch_related(None).values(*row_formatter.columns)
 
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            page_resp = self.get_paginated_response(serializer.data)
+            with self.timed("serialize"):
+                page_resp = self.get_paginated_response(
+                    self.get_results_data(page, row_formatter)
+                )
+            unavailable = page_resp.data.get("unavailable", []) + search_data.get(
+                "unavailable", []
+            )
             page_resp.data.update(search_data)
+            if unavailable:
+                page_resp.data["unavailable"] = unavailable
             return page_resp
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({"results": serializer.data, **search_data})
+        with self.timed("page"), self.statement_timeout("page"):
+            queryset = list(queryset)
+        with self.timed("serialize"):
+            results = self.get_results_data(queryset, row_formatter)
+        return Response({"results": results, **search_data})
 
     def create(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
+    def get_export_rows(self, queryset):
+        """Generate the serialized rows of every result of the queryset, fetched
+        in chunks from a server-side cursor.
+        """
+        chunk_size = search_service_settings.EXPORT_CHUNK_SIZE
+        if (row_formatter := self.get_row_formatter(queryset)) is not None:
+            values = queryset.prefetch_related(None).values(*row_formatter.columns)
+            for row in values.iterator(chunk_size=chunk_size):
+                yield row_formatter(row)
+        else:
+            serializer = self.get_serializer()
+            instances = queryset.iterator(chunk_size=chunk_size)
+            while chunk := list(itertools.islice(instances, chunk_size)):
+                self.prefetch_hits(serializer, chunk)
+                for instance in chunk:
+                    yield serializer.to_representation(instance)
+
+    @action(
+        detail=False,
+        methods=["get", "post"],
+        renderer_classes=[NDJSONRenderer, CSVRenderer],
+    )
+    def export(self, request, *args, **kwargs):
+        """Streams all of the results of the search (without pagination or
+        facets) as NDJSON, or as CSV (with `?format=csv` or `Accept: text/csv`).
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        self.check_plan_cost(queryset)
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type += f"; charset={renderer.charset}"
+        response = StreamingHttpResponse(
+            renderer.stream(
+                self.get_export_rows(queryset),
+                header=list(self.get_serializer().fields),
+            ),
+            content_type=content_type,
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="{self.basename}.{renderer.format}"'
+        return response
+
+    def get_search_parser(self):
+        """The parser (of the viewset, rather than the action) that parses
+        search bodies into search data.
+        """
+        for parser_class in self.__class__.parser_classes:
+            if hasattr(parser_class, "parse_data"):
+                return parser_class()
+
+    def get_msearch_view(self, request, search_body):
+        """Get a copy of this view, with a copy of the request for the search
+        body. The authentication of the request is shared. The `page` and
+        `page_size` of the search body are used as the pagination query params.
+        """
+        if not isinstance(search_body, dict):
+            raise ParseError(detail="Each search must be a JSON object")
+        http_request = copy.copy(request._request)
+        query_params = http_request.GET.copy()
+        for param in ["page", "page_size"]:
+            if param in search_body:
+                query_params[param] = str(search_body[param])
+        http_request.GET = query_params
+        search_request = Request(
+            http_request, parser_context=dict(request.parser_context)
+        )
+        search_request.user = request.user
+        search_request.auth = request.auth
+        search_request._authenticator = request._authenticator
+        search_request.accepted_renderer = request.accepted_renderer
+        search_request.accepted_media_type = request.accepted_media_type
+        search_request.version = request.version
+        search_request.versioning_scheme = request.versioning_scheme
+        parser = self.get_search_parser()
+        search_request._full_data = parser.parse_data(
+            self.guard_search_data(parser, search_body)
+        )
+        view = copy.copy(self)
+        view.request = search_request
+        view.__dict__.pop("_paginator", None)
+        return view
+
+    @contextmanager
+    def msearch_execute_wrappers(self):
+        """Install the execute wrappers that `dispatch` installs on the
+        connection of the request (those of its SearchTimer and explained
+        plans) on the connection of a msearch worker thread.
+        """
+        with ExitStack() as stack:
+            if self.search_timer is not None:
+                stack.enter_context(
+                    connection.execute_wrapper(self.search_timer.execute_wrapper)
+                )
+                stack.enter_context(
+                    connection.execute_wrapper(self.explain_execute_wrapper)
+                )
+            yield
+
+    def run_msearch(self, request, search_body, close_connections=False):
+        """Run a search of a msearch, returning its response data, or its error
+        and status code. An error fails only its own search, which is run in a
+        savepoint where a transaction is open so that the others can still run.
+        """
+        wrappers = self.msearch_execute_wrappers() if close_connections else nullcontext()
+        try:
+            with wrappers:
+                view = self.get_msearch_view(request, search_body)
+                with transaction.atomic() if connection.in_atomic_block else nullcontext():
+                    return view.list(view.request).data
+        except APIException as exc:
+            return {"status": exc.status_code, "error": exc.detail}
+        except (FieldError, DjangoValidationError) as exc:
+            logger.info(f"Invalid search of a msearch: {exc}")
+            messages = exc.messages if isinstance(exc, DjangoValidationError) else [str(exc)]
+            return {"status": status.HTTP_400_BAD_REQUEST, "error": messages}
+        except DataError as exc:
+            logger.info(f"Invalid search of a msearch: {exc}")
+            return {
+                "status": status.HTTP_400_BAD_REQUEST,
+                "error": "A value of the search is invalid.",
+            }
+        except DatabaseError as exc:
+            if is_statement_timeout(exc):
+                exc = SearchTimeout()
+                return {"status": exc.status_code, "error": exc.detail}
+            logger.exception("Search of a msearch failed")
+            return {
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "error": "A server error occurred.",
+            }
+        finally:
+            if close_connections:
+                connections.close_all()
+
+    @action(detail=False, methods=["post"], parser_classes=[FastJSONParser])
+    def msearch(self, request, *args, **kwargs):
+        """Runs a list of search bodies, returning a list of their responses.
+
+        With the `MSEARCH_MAX_WORKERS` setting above 1, the searches are run
+        concurrently in threads (each with its own database connection).
+        """
+        searches = request.data
+        if not isinstance(searches, list):
+            raise ParseError(detail="Expected a list of searches")
+        if len(searches) > search_service_settings.MSEARCH_MAX_SEARCHES:
+            raise ParseError(
+                detail=f"No more than {search_service_settings.MSEARCH_MAX_SEARCHES} searches can be run at once"
+            )
+        max_workers = min(search_service_settings.MSEARCH_MAX_WORKERS, len(searches))
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(
+                    executor.map(
+                        lambda search_body: self.run_msearch(
+                            request, search_body, close_connections=True
+                        ),
+                        searches,
+                    )
+                )
+        else:
+            results = [self.run_msearch(request, body) for body in searches]
+        return Response(results)
+
 
 class BaseAPISearchViewSet(BaseSearchViewSet):
     """
     BaseClass for Search Service APIs.
     """
 
-    pass
+    allow_explain = True
+    allow_profile = True
 
 
 class BasePublicSearchViewSet(QueryParamDataMixin, BaseSearchViewSet):
@@ -313,6 +758,7 @@ class IndexableAPISearchViewSet(BaseAPISearchViewSet):
     parser_classes = [IndexableSearchParser]
     filter_backends = [AuthContextsFilter, GenericFilter]
     serializer_class = IndexableAPISearchSerializer
+    values_serialization = True
 
 
 class SandboxedIndexableAPISearchViewSet(IndexableAPISearchViewSet):
@@ -321,6 +767,8 @@ class SandboxedIndexableAPISearchViewSet(IndexableAPISearchViewSet):
 
 class IndexablePublicSearchViewSet(BaseAPISearchViewSet):
     queryset = Indexable.objects.all().distinct()
+    allow_explain = False
+    allow_profile = False
     parser_classes = [IndexableSearchParser]
     filter_backends = [AuthContextsFilter, GenericFilter]
     serializer_class = IndexablePublicSearchSerializer
@@ -339,6 +787,8 @@ class JSONResourceAPISearchViewSet(BaseAPISearchViewSet):
         RankSnippetFilter,
     ]
     serializer_class = JSONResourceAPISearchSerializer
+    values_serialization = True
+    facet_summaries = True
 
 
 class SandboxedJSONResourceAPISearchViewSet(JSONResourceAPISearchViewSet):
@@ -359,48 +809,72 @@ class JSONResourcePublicSearchViewSet(BasePublicSearchViewSet):
         RankSnippetFilter,
     ]
     serializer_class = JSONResourcePublicSearchSerializer
+    facet_summaries = True
 
 
-class GenericFacetsViewSet(BasePublicSearchViewSet):
+class GenericFacetsViewSet(
+    SearchTimingMixin, QueryParamDataMixin, viewsets.GenericViewSet
+):
     """
-    Simple read only view to return a list of facet fields
+    Simple read only view to return the facet fields (subtypes) of each of
+    the requested `facet_types`, in the `contexts` (and `contexts_all`) of
+    the request. These are listed from the FacetField catalog, and cached
+    for `FACET_FIELD_CACHE_TTL` seconds.
     """
 
+    queryset = FacetField.objects.all()
+    permission_classes = [AllowAny]
     parser_classes = [SearchParser]
-    filter_backends = [AuthContextsFilter, GenericFacetListFilter]
-    serializer_class = IndexableAPISerializer
+    query_param_serializer_class = FacetedSearchQueryParamDataSerializer
+    filter_backends = [FacetFieldContextsFilter]
+    facet_fields_cache = TTLCache(
+        search_service_settings.FACET_FIELD_CACHE_TTL, name="facet_fields"
+    )
+
+    def get_facet_types(self, request):
+        # If we haven't been provided a list of facet types via a POST
+        # just list the metadata subtypes
+        return request.data.get("facet_types") or ["metadata"]
+
+    def get_facet_fields_cache_key(self, request):
+        auth_contexts = request.auth.get("contexts") if request.auth else None
+        return tuple(
+            tuple(sorted(map(str, values or [])))
+            for values in [
+                auth_contexts,
+                request.data.get("contexts"),
+                request.data.get("contexts_all"),
+                self.get_facet_types(request),
+            ]
+        )
 
     def get_facet_list(self, request):
         facet_dict = defaultdict(list)
-        # If we haven't been provided a list of facet fields via a POST
-        # just generate the list by querying the unique list of metadata subtypes
-        # Make a copy of the query so we aren't running the get_queryset logic every time
-        facetable_q = self.filter_queryset(queryset=self.get_queryset())
-        facet_fields = []
-        if not request.data.get("facet_types", None):
-            request.data["facet_types"] = ["metadata"]
-        for facet_type in request.data["facet_types"]:
-            for t in (
-                facetable_q.filter(type__iexact=facet_type).values("subtype").distinct()
-            ):
-                for _, v in t.items():
-                    if v and v != "":
-                        facet_fields.append((facet_type, v))
-        facet_l = sorted(list(set(facet_fields)))
-        for i in facet_l:
-            facet_dict[i[0]].append(i[1])
+        facet_types = self.get_facet_types(request)
+        fields = (
+            self.filter_queryset(self.get_queryset())
+            .filter(reduce(or_, [Q(type__iexact=t) for t in facet_types]))
+            .order_by()
+            .values_list("type", "subtype")
+            .distinct()
+        )
+        facet_fields = set()
+        for field_type, subtype in fields:
+            for facet_type in facet_types:
+                if facet_type.lower() == field_type.lower():
+                    facet_fields.add((facet_type, subtype))
+        for facet_type, subtype in sorted(facet_fields):
+            facet_dict[facet_type].append(subtype)
         return facet_dict
 
     def list(self, request, *args, **kwargs):
-        response = super(GenericFacetsViewSet, self).list(request, args, kwargs)
-        response.data = self.get_facet_list(request=request)
-        logger.info("Facets")
-        logger.info(self.get_facet_list(request=request))
-        return response
+        with self.timed("facets"):
+            facet_list = self.facet_fields_cache.get_or_set(
+                self.get_facet_fields_cache_key(request),
+                lambda: self.get_facet_list(request),
+            )
+        logger.debug(f"Facets: ({facet_list})")
+        return Response(facet_list)
 
     def create(self, request, *args, **kwargs):
-        response = super(GenericFacetsViewSet, self).list(request, args, kwargs)
-        response.data = self.get_facet_list(request=request)
-        logger.info("Facets")
-        logger.info(self.get_facet_list(request=request))
-        return response
+        return self.list(request, *args, **kwargs)
@@ -0,0 +1,124 @@
+"""
+In-process tests, run against a local Postgres database with pytest-django.
+
+The database is configured with the same environment variables as the
+example_project's `.env` (`POSTGRES_HOST`, `POSTGRES_PORT`, `POSTGRES_DB`,
+`POSTGRES_USER` and `POSTGRES_PASSWORD`), and pytest-django creates (and
+destroys) a test database alongside it.
+"""
+
+import os
+import pathlib
+import sys
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+api_endpoint = "/api/search_service"
+
+# Enough resources that a per-row query is run for several of them
+resource_count = 5
+
+
+def pytest_configure():
+    from django.conf import settings
+
+    settings.configure(
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "rest_framework",
+            "django_filters",
+            "search_service",
+        ],
+        DATABASES={
+            "default": {
+                "ENGINE": "django.db.backends.postgresql",
+                "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+                "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+                "NAME": os.environ.get("POSTGRES_DB", "postgres"),
+                "USER": os.environ.get("POSTGRES_USER", "postgres"),
+                "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            }
+        },
+        ROOT_URLCONF="urls",
+        REST_FRAMEWORK={
+            "DEFAULT_RENDERER_CLASSES": ["search_service.renderers.FastJSONRenderer"],
+            "DEFAULT_PARSER_CLASSES": ["search_service.parsers.FastJSONParser"],
+            "DEFAULT_PAGINATION_CLASS": "search_service.pagination.MadocPagination",
+            "PAGE_SIZE": 25,
+            "UNAUTHENTICATED_USER": None,
+        },
+        SEARCH_SERVICE={"SLOW_SEARCH_THRESHOLD": None},
+        ALLOWED_HOSTS=["*"],
+        # For the static files handler of the live_server
+        STATIC_URL="/static/",
+        USE_TZ=True,
+        DEFAULT_AUTO_FIELD="django.db.models.BigAutoField",
+        SECRET_KEY="tests",
+    )
+
+
+@pytest.fixture
+def api_client():
+    from rest_framework.test import APIClient
+
+    return APIClient()
+
+
+@pytest.fixture
+def resources(api_client):
+    from django.contrib.contenttypes.models import ContentType
+
+    from search_service.models import JSONResource
+
+    content_type = ContentType.objects.get_for_model(JSONResource).pk
+    ids = []
+    for i in range(resource_count):
+        response = api_client.post(
+            f"{api_endpoint}/json_resource/",
+            {
+                "label": f"Query Count Resource {i}",
+                "contexts": [{"urn": f"urn:query-count:site:{i % 2}"}],
+                "data": {
+                    "indexables": [
+                        {
+                            "type": "text",
+                            "subtype": "transcript",
+                            "original_content": f"A counted wombat {i}",
+                            "indexable_text": f"A counted wombat {i}",
+                            "language": "en",
+                        },
+                        {
+                            "type": "metadata",
+                            "subtype": "query count",
+                            "original_content": f"Value {i % 2}",
+                            "indexable_text": f"Value {i % 2}",
+                        },
+                        {
+                            "type": "tag",
+                            "subtype": "animals",
+                            "original_content": "Wombat",
+                            "indexable_text": "Wombat",
+                        },
+                    ]
+                },
+            },
+            format="json",
+        )
+        assert response.status_code == 201, response.content
+        ids.append(response.json()["id"])
+    response = api_client.post(
+        f"{api_endpoint}/resource_relationship/",
+        {
+            "source_id": ids[0],
+            "source_content_type": content_type,
+            "target_id": ids[1],
+            "target_content_type": content_type,
+            "type": "part_of",
+        },
+        format="json",
+    )
+    assert response.status_code == 201, response.content
+    return ids
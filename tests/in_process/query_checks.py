@@ -0,0 +1,73 @@
+"""
+Checks of the SQL queries captured (with CaptureQueriesContext) from a request.
+"""
+
+import json
+import re
+
+from django.db import connection, transaction
+
+INDEXABLE_TABLE = "search_service_indexable"
+
+# Literals of the (interpolated) SQL, replaced to compare the shapes of queries
+_literals = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\?(?:\s*,\s*\?)*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_sql(sql):
+    """The shape of the query, without its literal values."""
+    for pattern, replacement in _literals:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def repeated_queries(queries):
+    """The shapes of the queries that were run more than once, i.e. once per
+    row of a result, with the number of times each was run.
+    """
+    counts = {}
+    for query in queries:
+        shape = normalize_sql(query["sql"])
+        counts[shape] = counts.get(shape, 0) + 1
+    return {shape: count for shape, count in counts.items() if count > 1}
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(sql):
+    """The plan of the query, with sequential scans disabled, so that any
+    sequential scan left in the plan is of a table with no usable index.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def indexable_seq_scans(queries):
+    """The SELECT queries whose plans sequentially scan the Indexable table."""
+    scans = []
+    for query in queries:
+        sql = query["sql"]
+        if not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        if f'"{INDEXABLE_TABLE}"' not in sql:
+            continue
+        if any(
+            node["Node Type"] == "Seq Scan"
+            and node.get("Relation Name") == INDEXABLE_TABLE
+            for node in plan_nodes(explain(sql))
+        ):
+            scans.append(sql)
+    return scans
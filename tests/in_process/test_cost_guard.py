@@ -0,0 +1,116 @@
+"""
+The cost guard of the search viewsets, which rejects (or rewrites) the
+searches that are guaranteed to be expensive before they are run.
+"""
+
+import pytest
+
+from conftest import api_endpoint, resource_count
+
+search_endpoint = f"{api_endpoint}/json_resource_search/"
+public_search_endpoint = "/search_service/json_resource_search/"
+
+
+@pytest.fixture
+def search_view(monkeypatch):
+    from search_service.views import JSONResourceAPISearchViewSet
+
+    monkeypatch.setattr(JSONResourceAPISearchViewSet, "cost_policy", {})
+    return JSONResourceAPISearchViewSet
+
+
+def search(api_client, body, endpoint=search_endpoint):
+    return api_client.post(endpoint, body, format="json")
+
+
+@pytest.mark.django_db
+def test_cost_guard_not_set(api_client, resources):
+    # Single character (non-latin) tokens are searched for with icontains
+    response = search(api_client, {"fulltext": "犬"})
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_cost_guard_short_tokens(api_client, resources, search_view):
+    response = search(api_client, {"fulltext": "犬"})
+    assert response.status_code == 400
+    data = response.json()
+    assert data["costs"] == {"short_tokens": 1000}
+    assert data["cost"] > data["max_cost"]
+    # Searched for in the search_vector, rather than with icontains
+    response = search(api_client, {"fulltext": "a wombat"})
+    assert response.status_code == 200
+    assert response.json()["pagination"]["totalResults"] == resource_count
+
+
+@pytest.mark.django_db
+def test_cost_guard_raw_filters(api_client, resources, search_view):
+    response = search(
+        api_client, {"raw": {"indexables__indexable_text__icontains": "wombat"}}
+    )
+    assert response.status_code == 400
+    assert response.json()["costs"] == {"unindexed_raw": 1000}
+    response = search(api_client, {"raw": {"indexables__subtype__iexact": "animals"}})
+    assert response.status_code == 200
+    assert response.json()["pagination"]["totalResults"] == resource_count
+    # Only indexed by the (case sensitive) value of the field
+    response = search(api_client, {"raw": {"indexables__content_id__iexact": "a"}})
+    assert response.status_code == 400
+    assert response.json()["costs"] == {"unindexed_raw": 1000}
+    response = search(api_client, {"raw": {"indexables__group_id__iexact": "a"}})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_cost_guard_contexts(api_client, resources, search_view):
+    contexts = [f"urn:query-count:site:{i}" for i in range(101)]
+    response = search(api_client, {"contexts": contexts})
+    assert response.status_code == 400
+    assert response.json()["costs"] == {"contexts": 101}
+    response = search(api_client, {"contexts": contexts[:2]})
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_cost_guard_rewrite(api_client, resources, search_view, monkeypatch):
+    monkeypatch.setattr(search_view, "cost_policy", {"action": "rewrite"})
+    response = search(api_client, {"fulltext": "wombat", "num_facets": 1000})
+    assert response.status_code == 200
+    assert response.json()["pagination"]["totalResults"] == resource_count
+    response = search(api_client, {"fulltext": "犬 猫猫"})
+    assert response.status_code == 200
+    # Rejected where there are only short tokens
+    response = search(api_client, {"fulltext": "犬 猫"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_cost_guard_query_params(api_client, resources, monkeypatch):
+    from search_service.views import JSONResourcePublicSearchViewSet
+
+    monkeypatch.setattr(JSONResourcePublicSearchViewSet, "cost_policy", {})
+    response = api_client.get(f"{public_search_endpoint}?fulltext=犬")
+    assert response.status_code == 400
+    response = api_client.get(f"{public_search_endpoint}?fulltext=wombat")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_cost_guard_msearch(api_client, resources, search_view):
+    response = search(
+        api_client,
+        [{"fulltext": "wombat"}, {"fulltext": "犬"}],
+        endpoint=f"{search_endpoint}msearch/",
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert results[0]["pagination"]["totalResults"] == resource_count
+    assert results[1]["status"] == 400
+
+
+@pytest.mark.django_db
+def test_cost_guard_plan_cost(api_client, resources, search_view, monkeypatch):
+    monkeypatch.setattr(search_view, "cost_policy", {"max_plan_cost": 0.01})
+    response = search(api_client, {"fulltext": "wombat"})
+    assert response.status_code == 400
+    assert response.json()["plan_cost"] > 0.01
@@ -0,0 +1,127 @@
+"""
+The IndexableCountSummary tables (the FacetField catalog and FacetValueCount
+summary), whose counts are added to (rather than duplicated) when a row is
+written by concurrent indexing.
+"""
+
+import pytest
+from django.db import IntegrityError, transaction
+
+from conftest import api_endpoint, resource_count
+
+
+def facet_value_key(**fields):
+    from django.contrib.contenttypes.models import ContentType
+
+    from search_service.models import JSONResource
+
+    return {
+        "context_id": None,
+        "resource_content_type_id": ContentType.objects.get_for_model(JSONResource).pk,
+        "type": "metadata",
+        "subtype": "query count",
+        "group_id": None,
+        "value": "Value 0",
+        "language_iso639_2": None,
+        "language_iso639_1": None,
+        **fields,
+    }
+
+
+@pytest.mark.django_db
+def test_facet_value_count_unique():
+    from search_service.models import FacetValueCount
+
+    FacetValueCount.objects.create(**facet_value_key(), indexable_count=1)
+    with pytest.raises(IntegrityError), transaction.atomic():
+        FacetValueCount.objects.create(**facet_value_key(), indexable_count=1)
+    # Blank group ids are the same as null ones in the unique constraint
+    with pytest.raises(IntegrityError), transaction.atomic():
+        FacetValueCount.objects.create(
+            **facet_value_key(group_id=""), indexable_count=1
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "fields",
+    [
+        pytest.param({}, id="nulls"),
+        pytest.param(
+            {"group_id": "group", "language_iso639_2": "eng"}, id="some_nulls"
+        ),
+        pytest.param(
+            {
+                "group_id": "group",
+                "value": "A long value " * 1000,
+                "language_iso639_2": "eng",
+                "language_iso639_1": "en",
+            },
+            id="no_nulls",
+        ),
+    ],
+)
+def test_facet_value_count_add_count(resources, fields):
+    from search_service.models import Context, FacetValueCount
+
+    for context in [None, Context.objects.first().pk]:
+        key = facet_value_key(**fields, context_id=context)
+        FacetValueCount.add_count(key, 2)
+        FacetValueCount.add_count(key, 3)
+        assert FacetValueCount.objects.get(**key).indexable_count == 5
+        FacetValueCount.apply_count_deltas({tuple(key.values()): 5}, {})
+        assert not FacetValueCount.objects.filter(**key).exists()
+
+
+@pytest.mark.django_db
+def test_facet_field_add_count(resources):
+    from search_service.models import Context, FacetField
+
+    key = {"context_id": None, "type": "metadata", "subtype": "added"}
+    FacetField.add_count(key, 1)
+    FacetField.add_count(key, 1)
+    assert FacetField.objects.get(**key).indexable_count == 2
+    # Indexed in 2 of the resources in the context
+    context = Context.objects.get(urn="urn:query-count:site:1")
+    key = {"context_id": context.pk, "type": "tag", "subtype": "animals"}
+    FacetField.add_count(key, 1)
+    assert FacetField.objects.get(**key).indexable_count == 3
+
+
+@pytest.mark.django_db
+def test_indexable_api_writes(api_client, resources):
+    from search_service.models import FacetField, FacetValueCount, Indexable
+
+    def facet_field_count(subtype):
+        return sum(
+            FacetField.objects.filter(type="tag", subtype=subtype).values_list(
+                "indexable_count", flat=True
+            )
+        )
+
+    indexable = Indexable.objects.filter(type="tag").first()
+    response = api_client.patch(
+        f"{api_endpoint}/indexable/{indexable.id}/",
+        {"subtype": "marsupials"},
+        format="json",
+    )
+    assert response.status_code == 200, response.content
+    assert facet_field_count("animals") == resource_count - 1
+    assert facet_field_count("marsupials") == 1
+    assert FacetValueCount.objects.filter(type="tag", subtype="marsupials").exists()
+    response = api_client.delete(f"{api_endpoint}/indexable/{indexable.id}/")
+    assert response.status_code == 204
+    assert facet_field_count("marsupials") == 0
+    assert not FacetValueCount.objects.filter(type="tag", subtype="marsupials").exists()
+
+
+@pytest.mark.django_db
+def test_facet_value_count_blank_as_null(resources):
+    from search_service.models import FacetValue, FacetValueCount
+
+    FacetValue.objects.update(group_id="", language_iso639_1="")
+    counts = FacetValueCount.indexable_counts(FacetValue.objects.all())
+    assert counts
+    assert all(key[4] is None and key[7] is None for key in counts)
+    FacetValueCount.rebuild()
+    assert not FacetValueCount.objects.filter(group_id="").exists()
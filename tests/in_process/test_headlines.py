@@ -0,0 +1,53 @@
+"""
+Headlines of the Indexables of the GenericFilter, from their best matching
+passage (of the `indexable_text`) or from the whole Indexable.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def passage_indexable(resources):
+    from search_service.models import Indexable
+
+    indexable = Indexable.objects.filter(type="text").first()
+    indexable.original_content = "The original wombat"
+    indexable.save()
+    indexable.set_passages(
+        [
+            {"word_offset": 0, "passage_text": "A counted"},
+            {"word_offset": 2, "passage_text": "wombat 0"},
+        ]
+    )
+    return indexable
+
+
+@pytest.mark.django_db
+def test_generic_filter_headlines(passage_indexable):
+    from django.contrib.postgres.search import SearchQuery
+    from django.db.models import Q
+
+    from search_service.filters import GenericFilter
+    from search_service.models import Indexable
+
+    search_query = SearchQuery("wombat")
+    request = SimpleNamespace(
+        data={"filter": Q(search_vector=search_query), "headline_query": search_query}
+    )
+    indexables = GenericFilter().filter_queryset(
+        request, Indexable.objects.filter(type="text"), None
+    )
+    headlines = {
+        indexable.pk: (indexable.snippet, indexable.fullsnip)
+        for indexable in indexables
+    }
+    # The fullsnip is from the passage of the indexable_text, and the snippet
+    # from the whole original_content, which isn't split into passages
+    snippet, fullsnip = headlines.pop(passage_indexable.pk)
+    assert snippet == "'original <b>wombat</b>"
+    assert fullsnip == "<b>wombat</b> 0"
+    for snippet, fullsnip in headlines.values():
+        assert "counted <b>wombat</b>" in snippet
+        assert fullsnip.startswith("A counted <b>wombat</b>")
@@ -0,0 +1,90 @@
+"""
+The multi-process metrics files of the MetricsRegistry (where `METRICS_DIR`
+is set): flushed after the last change of an idle process, written whole by
+concurrent threads, and archived once their process has exited.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def registry(tmp_path):
+    from search_service.metrics import MetricsRegistry
+
+    registry = MetricsRegistry(metrics_dir=str(tmp_path), flush_interval=0.2)
+    registry.counter("requests_total", "Requests.", ["view"])
+    registry.gauge("in_progress", "In progress.", ["view"])
+    return registry
+
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def read_counter(path):
+    with open(path) as f:
+        return json.load(f)["metrics"]["requests_total"]
+
+
+def test_idle_process_flushed(registry):
+    counter = registry.metrics["requests_total"]
+    counter.inc(view="search")
+    counter.inc(view="search")
+    # The first change is written, and the second once the interval is over
+    assert read_counter(registry.file_path) == [[["search"], 1]]
+    time.sleep(0.5)
+    assert read_counter(registry.file_path) == [[["search"], 2]]
+
+
+def test_concurrent_flushes(registry, tmp_path):
+    counter = registry.metrics["requests_total"]
+
+    def update():
+        for _ in range(50):
+            counter.inc(view="search")
+            registry.flush()
+
+    threads = [threading.Thread(target=update) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert read_counter(registry.file_path) == [[["search"], 400]]
+    assert os.listdir(tmp_path) == [os.path.basename(registry.file_path)]
+
+
+def test_exited_processes_archived(registry, tmp_path):
+    counter, gauge = registry.metrics["requests_total"], registry.metrics["in_progress"]
+    counter.inc(view="search")
+    for pid in [exited_pid(), exited_pid()]:
+        with open(tmp_path / f"metrics_{pid}.json", "w") as f:
+            json.dump(
+                {
+                    "pid": pid,
+                    "metrics": {
+                        "requests_total": [[["search"], 2]],
+                        "in_progress": [[["search"], 1]],
+                    },
+                },
+                f,
+            )
+    for _ in range(2):
+        collected = registry.collect()
+        assert collected[counter] == {("search",): 5}
+        assert collected[gauge] == {}
+        assert sorted(os.listdir(tmp_path)) == sorted(
+            [
+                os.path.basename(registry.file_path),
+                "metrics_archive.json",
+                "metrics_archive.json.lock",
+            ]
+        )
@@ -0,0 +1,56 @@
+"""
+The searches of a msearch, whose errors fail only their own search, and whose
+queries are timed whether run inline or in worker threads.
+"""
+
+import pytest
+
+from conftest import api_endpoint, resource_count
+
+msearch_endpoint = f"{api_endpoint}/json_resource_search/msearch/"
+searches = [
+    {"fulltext": "wombat"},
+    {"raw": {"indexables__no_such_field": 1}},
+    {"raw": {"indexables__original_content__regex": "("}},
+    {"fulltext": "wombat", "facet_types": ["metadata"]},
+]
+
+
+def server_timing_queries(response):
+    """The number of queries of each stage of the Server-Timing header."""
+    return {
+        metric.split(";")[0]: int(metric.split('desc="')[1].split()[0])
+        for metric in response["Server-Timing"].split(", ")
+        if "desc=" in metric
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_msearch_errors(api_client, resources, monkeypatch, max_workers):
+    from search_service.settings import search_service_settings
+
+    monkeypatch.setattr(search_service_settings, "MSEARCH_MAX_WORKERS", max_workers)
+    response = api_client.post(msearch_endpoint, searches, format="json")
+    assert response.status_code == 200
+    results = response.json()
+    assert results[0]["pagination"]["totalResults"] == resource_count
+    assert results[1]["status"] == 400
+    assert results[2]["status"] == 400
+    assert results[3]["pagination"]["totalResults"] == resource_count
+    # The queries of the searches are counted against their stages
+    assert server_timing_queries(response)["page"] >= 2
+
+
+@pytest.mark.django_db
+def test_msearch_errors_in_transaction(api_client, resources):
+    # The failed search is rolled back to its savepoint, so that the searches
+    # after it can run in the (test case's) transaction
+    response = api_client.post(msearch_endpoint, searches, format="json")
+    assert response.status_code == 200
+    assert [result.get("status") for result in response.json()] == [
+        None,
+        400,
+        400,
+        None,
+    ]
@@ -0,0 +1,173 @@
+"""
+Upper bounds on the number of SQL queries of each endpoint of the search
+service, and checks that the queries aren't run once per row of the results,
+and that those on the Indexable table can use an index, so that a new N+1
+query or unindexed filter fails the tests.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import resource_count
+from query_checks import indexable_seq_scans, repeated_queries
+
+api_endpoint = "/api/search_service"
+public_endpoint = "/search_service"
+
+search_body = {"fulltext": "wombat", "facet_types": ["metadata", "tag"]}
+facet_body = {
+    "facet_types": ["metadata"],
+    "facets": [{"type": "metadata", "subtype": "query count", "value": "Value 1"}],
+}
+
+
+def endpoint(name, method, path, body=None, budget=0, seq_scan=False, per_row=False):
+    """A request to an endpoint, with its query `budget`, and whether it may
+    sequentially scan the Indexable table (`seq_scan`) or run a query for
+    each result (`per_row`).
+    """
+    return pytest.param(method, path, body, budget, seq_scan, per_row, id=name)
+
+
+endpoints = [
+    # Paged in the order of the (unindexed) modified timestamp
+    endpoint(
+        "indexable_list", "get", f"{api_endpoint}/indexable/", budget=3, seq_scan=True
+    ),
+    endpoint(
+        "indexable_detail", "get", f"{api_endpoint}/indexable/{{indexable}}/", budget=2
+    ),
+    endpoint(
+        "indexable_filter",
+        "get",
+        f"{api_endpoint}/indexable/?resource_id={{resource}}",
+        budget=3,
+    ),
+    endpoint("context_list", "get", f"{api_endpoint}/context/", budget=2),
+    endpoint("context_detail", "get", f"{api_endpoint}/context/{{context}}/", budget=1),
+    endpoint(
+        "resource_relationship_list",
+        "get",
+        f"{api_endpoint}/resource_relationship/",
+        budget=2,
+    ),
+    endpoint("content_type_list", "get", f"{api_endpoint}/content_type/", budget=2),
+    endpoint("json_resource_list", "get", f"{api_endpoint}/json_resource/", budget=3),
+    endpoint(
+        "json_resource_detail",
+        "get",
+        f"{api_endpoint}/json_resource/{{resource}}/",
+        budget=2,
+    ),
+    # The GenericFilter of the indexable searches reads a `filter` that the
+    # IndexableSearchParser doesn't set, so these list all of the Indexables
+    endpoint(
+        "indexable_search",
+        "post",
+        f"{api_endpoint}/indexable_search/",
+        {"fulltext": "wombat"},
+        budget=3,
+        seq_scan=True,
+    ),
+    endpoint(
+        "json_resource_search",
+        "post",
+        f"{api_endpoint}/json_resource_search/",
+        search_body,
+        budget=3,
+    ),
+    endpoint(
+        "json_resource_search_facets",
+        "post",
+        f"{api_endpoint}/json_resource_search/",
+        facet_body,
+        budget=3,
+    ),
+    # Each search is run in a savepoint (of the transaction of the test case)
+    endpoint(
+        "json_resource_msearch",
+        "post",
+        f"{api_endpoint}/json_resource_search/msearch/",
+        [search_body, facet_body],
+        budget=6 + 2 * 2,
+    ),
+    endpoint(
+        "json_resource_export",
+        "post",
+        f"{api_endpoint}/json_resource_search/export/",
+        {"fulltext": "wombat"},
+        budget=1,
+    ),
+    endpoint("search_explain", "get", f"{api_endpoint}/search_explain/"),
+    endpoint("profiles", "get", f"{api_endpoint}/profiles/"),
+    endpoint("metrics", "get", f"{api_endpoint}/metrics/"),
+    # The hits of the results of the public searches are queried once per page
+    endpoint(
+        "public_json_resource_search",
+        "post",
+        f"{public_endpoint}/json_resource_search/",
+        search_body,
+        budget=5,
+    ),
+    endpoint(
+        "public_json_resource_search_query_params",
+        "get",
+        f"{public_endpoint}/json_resource_search/?fulltext=wombat",
+        budget=5,
+    ),
+    # and once per chunk of the exported results
+    endpoint(
+        "public_json_resource_export",
+        "post",
+        f"{public_endpoint}/json_resource_search/export/",
+        {"fulltext": "wombat"},
+        budget=3,
+    ),
+    endpoint(
+        "public_indexable_search",
+        "post",
+        f"{public_endpoint}/indexable_search/",
+        {"fulltext": "wombat"},
+        budget=3,
+        seq_scan=True,
+    ),
+    endpoint("public_facets_list", "get", f"{public_endpoint}/facets/"),
+    endpoint(
+        "public_facets",
+        "post",
+        f"{public_endpoint}/facets/",
+        {"facet_types": ["metadata", "tag"]},
+    ),
+]
+
+
+def request(api_client, method, path, body):
+    response = getattr(api_client, method)(path, body, format="json")
+    # Consume streaming responses, so that all of their queries are run
+    content = b"".join(response) if response.streaming else response.content
+    assert response.status_code == 200, content
+    return response
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("method, path, body, budget, seq_scan, per_row", endpoints)
+def test_query_count(
+    api_client, resources, method, path, body, budget, seq_scan, per_row
+):
+    from search_service.models import Context, Indexable
+
+    path = path.format(
+        resource=resources[0],
+        indexable=Indexable.objects.filter(resource_id=resources[0]).first().id,
+        context=Context.objects.order_by("urn").first().urn,
+    )
+    # Warm the per-process caches (e.g. of ContentTypes)
+    request(api_client, method, path, body)
+    with CaptureQueriesContext(connection) as queries:
+        request(api_client, method, path, body)
+    assert len(queries) <= budget, "\n".join(q["sql"] for q in queries)
+    if not per_row:
+        assert not repeated_queries(queries.captured_queries)
+    if not seq_scan:
+        assert not indexable_seq_scans(queries.captured_queries)
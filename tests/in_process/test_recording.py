@@ -0,0 +1,107 @@
+"""
+Recording of the requests to the search viewsets (with their anonymization),
+and replaying them with the `replay_searches` command.
+"""
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from conftest import api_endpoint
+
+search_endpoint = f"{api_endpoint}/json_resource_search/"
+search_body = {
+    "fulltext": "wombat",
+    "facets": [{"type": "metadata", "subtype": "query count", "value": "Value 1"}],
+    "raw": {"indexables__subtype__iexact": "animals", "indexables__indexable_int": 1},
+    "json": {"place": {"name": "Glasgow"}, "tags": ["wombat"]},
+}
+
+
+@pytest.fixture
+def recording_file(tmp_path, monkeypatch):
+    from search_service.settings import search_service_settings
+
+    path = tmp_path / "searches.ndjson"
+    monkeypatch.setattr(search_service_settings, "SEARCH_RECORDING_FILE", str(path))
+    return path
+
+
+def read_recording(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_anonymize():
+    from search_service.recording import anonymize, anonymize_value
+
+    anonymized = anonymize(
+        {**search_body, "facet": ["metadata|place|Glasgow"], "page_size": 10}
+    )
+    assert anonymized["fulltext"] == anonymize_value("wombat")
+    assert anonymized["fulltext"].startswith("anon-")
+    assert anonymized["facets"] == [
+        {
+            "type": "metadata",
+            "subtype": "query count",
+            "value": anonymize_value("Value 1"),
+        }
+    ]
+    # The lookups and JSON keys, and the numbers, are kept
+    assert anonymized["raw"] == {
+        "indexables__subtype__iexact": anonymize_value("animals"),
+        "indexables__indexable_int": 1,
+    }
+    assert anonymized["json"] == {
+        "place": {"name": anonymize_value("Glasgow")},
+        "tags": [anonymize_value("wombat")],
+    }
+    assert anonymized["facet"] == [f"metadata|place|{anonymize_value('Glasgow')}"]
+    assert anonymized["page_size"] == 10
+
+
+@pytest.mark.django_db
+def test_recording_anonymized(api_client, resources, recording_file, monkeypatch):
+    from search_service.settings import search_service_settings
+
+    monkeypatch.setattr(search_service_settings, "SEARCH_RECORDING_ANONYMIZE", True)
+    response = api_client.post(search_endpoint, search_body, format="json")
+    assert response.status_code == 200
+    (recorded,) = read_recording(recording_file)
+    assert recorded["view"] == "JSONResourceAPISearchViewSet"
+    assert recorded["method"] == "POST"
+    assert recorded["path"] == search_endpoint
+    assert recorded["status"] == 200
+    assert "wombat" not in json.dumps(recorded["body"])
+    assert "Glasgow" not in json.dumps(recorded["body"])
+    assert list(recorded["body"]["raw"]) == list(search_body["raw"])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_record_and_replay(
+    api_client, resources, recording_file, live_server, tmp_path
+):
+    body = {"fulltext": "wombat", "facet_types": ["metadata"]}
+    for _ in range(2):
+        response = api_client.post(search_endpoint, body, format="json")
+        assert response.status_code == 200
+    response = api_client.get("/search_service/json_resource_search/?fulltext=wombat")
+    assert response.status_code == 200
+    recorded = read_recording(recording_file)
+    assert [search["method"] for search in recorded] == ["POST", "POST", "GET"]
+    assert recorded[0]["body"] == body
+
+    report_file = tmp_path / "report.json"
+    call_command(
+        "replay_searches",
+        str(recording_file),
+        url=live_server.url,
+        repeat=2,
+        output=str(report_file),
+        stdout=StringIO(),
+    )
+    report = json.loads(report_file.read_text())
+    assert report["searches"] == 6
+    assert sum(row["count"] for row in report["fingerprints"]) == 6
+    assert all(row["error_rate"] == 0 for row in report["fingerprints"])
@@ -0,0 +1,96 @@
+"""
+The slow search log: the searches over the `SLOW_SEARCH_THRESHOLD` recorded
+with the fingerprint of their shape, and the durations of each fingerprint
+reported by the `slow_searches` command.
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from conftest import api_endpoint, resource_count
+
+search_endpoint = f"{api_endpoint}/json_resource_search/"
+search_body = {
+    "fulltext": "wombat",
+    "facets": [{"type": "metadata", "subtype": "query count", "value": "Value 1"}],
+    "raw": {"indexables__indexable_int": 1},
+    "facet_counts": False,
+}
+
+
+@pytest.fixture
+def slow_search_threshold(monkeypatch):
+    from search_service.settings import search_service_settings
+
+    def set_threshold(threshold):
+        monkeypatch.setattr(search_service_settings, "SLOW_SEARCH_THRESHOLD", threshold)
+
+    return set_threshold
+
+
+def test_fingerprint():
+    from search_service.parsers import SearchParser
+
+    parser = SearchParser()
+    fingerprint = parser.get_fingerprint(search_body)
+    assert fingerprint == "fulltext+facets:1+raw+no_facet_counts"
+    # The values of the options aren't part of the fingerprint
+    other_body = {
+        **search_body,
+        "fulltext": "kangaroo",
+        "facets": [{"type": "tag", "subtype": "animals", "value": "Kangaroo"}],
+        "raw": {"indexables__indexable_int": 2},
+    }
+    assert parser.get_fingerprint(other_body) == fingerprint
+    assert parser.get_fingerprint({}) == "browse"
+    assert parser.get_fingerprint({"count_only": True}) == "count_only"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "threshold, recorded", [(None, False), (0, True), (1e6, False)]
+)
+def test_slow_search_threshold(
+    api_client, resources, slow_search_threshold, threshold, recorded
+):
+    from search_service.models import SlowSearch
+
+    slow_search_threshold(threshold)
+    response = api_client.post(search_endpoint, {"fulltext": "wombat"}, format="json")
+    assert response.status_code == 200
+    assert SlowSearch.objects.exists() == recorded
+    if recorded:
+        slow_search = SlowSearch.objects.get()
+        assert slow_search.view == "JSONResourceAPISearchViewSet"
+        assert slow_search.action == "create"
+        assert slow_search.fingerprint == "fulltext"
+        assert slow_search.result_count == resource_count
+        assert "page" in [stage["name"] for stage in slow_search.timings]
+
+
+@pytest.mark.django_db
+def test_slow_searches_command():
+    from search_service.models import SlowSearch
+
+    SlowSearch.objects.bulk_create(
+        [
+            SlowSearch(view="View", action="list", fingerprint="fulltext", duration=d)
+            for d in range(1, 101)
+        ]
+        + [SlowSearch(view="View", action="list", fingerprint="browse", duration=5)]
+    )
+    stdout = StringIO()
+    call_command("slow_searches", stdout=stdout)
+    header, *rows = stdout.getvalue().splitlines()
+    assert header.split()[:4] == ["count", "p50", "p95", "max"]
+    # Slowest (by p95) first
+    assert [row.split()[:5] for row in rows] == [
+        ["100", "50.5", "95.0", "100.0", "View.list"],
+        ["1", "5.0", "5.0", "5.0", "View.list"],
+    ]
+    assert rows[0].endswith("/ fulltext")
+
+    call_command("slow_searches", days=0, clear=True, stdout=StringIO())
+    assert not SlowSearch.objects.exists()
@@ -0,0 +1,105 @@
+"""
+Statement timeouts of the stages of the searches, with the queries of a stage
+slowed down (with pg_sleep) past its timeout.
+"""
+
+import pytest
+from django.db import connection, transaction
+
+from conftest import api_endpoint, resource_count
+
+search_endpoint = f"{api_endpoint}/json_resource_search/"
+search_body = {"fulltext": "wombat", "facet_types": ["metadata", "tag"]}
+
+
+def show_statement_timeout():
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW statement_timeout")
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def search_view():
+    from search_service.views import JSONResourceAPISearchViewSet
+
+    return JSONResourceAPISearchViewSet
+
+
+def slow_results(monkeypatch, view_class, seconds_per_row):
+    """Slow down every query of the results of the search."""
+    filter_queryset = view_class.filter_queryset
+
+    def slow_filter_queryset(self, queryset):
+        return filter_queryset(self, queryset).extra(
+            where=[f"pg_sleep({seconds_per_row}) IS NOT NULL"]
+        )
+
+    monkeypatch.setattr(view_class, "filter_queryset", slow_filter_queryset)
+
+
+@pytest.mark.django_db
+def test_statement_timeout_restored(search_view):
+    from search_service.timeouts import SearchTimeout, statement_timeout
+
+    with transaction.atomic():
+        timeout = show_statement_timeout()
+        with statement_timeout(1000):
+            assert show_statement_timeout() == "1s"
+            with pytest.raises(SearchTimeout):
+                with statement_timeout(10):
+                    connection.cursor().execute("SELECT pg_sleep(1)")
+            assert show_statement_timeout() == "1s"
+        assert show_statement_timeout() == timeout
+
+
+@pytest.mark.django_db
+def test_facets_timeout(api_client, resources, search_view, monkeypatch):
+    get_facets = search_view.get_facets
+
+    def slow_get_facets(self, request, queryset):
+        connection.cursor().execute("SELECT pg_sleep(1)")
+        return get_facets(self, request, queryset)
+
+    monkeypatch.setattr(search_view, "get_facets", slow_get_facets)
+    monkeypatch.setattr(search_view, "statement_timeouts", {"facets": 50})
+    response = api_client.post(search_endpoint, search_body, format="json")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pagination"]["totalResults"] == resource_count
+    assert len(data["results"]) == resource_count
+    assert data["facets"] == {}
+    assert data["unavailable"] == ["facets"]
+
+
+@pytest.mark.django_db
+def test_count_timeout(api_client, resources, search_view, monkeypatch):
+    slow_results(monkeypatch, search_view, 0.02)
+    monkeypatch.setattr(search_view, "statement_timeouts", {"count": 20})
+    response = api_client.post(
+        f"{search_endpoint}?page_size=2",
+        {**search_body, "facet_counts": False},
+        format="json",
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pagination"]["totalResults"] is None
+    assert data["pagination"]["totalPages"] is None
+    assert data["pagination"]["next"] is not None
+    assert len(data["results"]) == 2
+    assert data["unavailable"] == ["count"]
+
+
+@pytest.mark.django_db
+def test_page_timeout(api_client, resources, search_view, monkeypatch):
+    slow_results(monkeypatch, search_view, 0.02)
+    monkeypatch.setattr(search_view, "statement_timeouts", {"page": 20})
+    response = api_client.post(
+        search_endpoint, {**search_body, "facet_counts": False}, format="json"
+    )
+    assert response.status_code == 503
+    # The connection is still usable after the cancelled query
+    monkeypatch.setattr(search_view, "statement_timeouts", {})
+    response = api_client.post(
+        search_endpoint, {**search_body, "facet_counts": False}, format="json"
+    )
+    assert response.status_code == 200
@@ -0,0 +1,12 @@
+"""
+URLs of the search service, namespaced as in the example_project.
+"""
+
+from django.urls import include, path
+
+api_urls = ([path("search_service/", include("search_service.urls.api"))], "api")
+
+urlpatterns = [
+    path("api/", include(api_urls)),
+    path("search_service/", include("search_service.urls.public")),
+]
@@ -0,0 +1,95 @@
+import requests
+
+api_endpoint = "api/search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+# Query budgets for listing API endpoints, which must not grow with the number
+# of results: the page count, the page of results and the prefetched contexts.
+list_query_budget = 3
+
+
+def test_query_count_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    for i in range(5):
+        post_json = {
+            "label": f"Query Count Resource {i}",
+            "contexts": [f"urn:madoc:site:{i}", "urn:madoc:collection:query-count"],
+            "data": {
+                "indexables": [
+                    {
+                        "type": "metadata",
+                        "subtype": f"field {j}",
+                        "original_content": f"Query count value {j}",
+                        "indexable_text": f"Query count value {j}",
+                    }
+                    for j in range(3)
+                ]
+            },
+        }
+        response = requests.post(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/",
+            json=post_json,
+            headers=test_headers,
+        )
+        assert response.status_code == status
+        test_data_store[i] = response.json().get("id")
+
+
+def test_json_resource_list_query_count(http_service):
+    test_endpoint = "json_resource"
+    response = requests.get(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert len(response.json().get("results")) >= 5
+    assert int(response.headers["X-Query-Count"]) <= list_query_budget
+
+
+def test_indexable_list_query_count(http_service):
+    test_endpoint = "indexable"
+    response = requests.get(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        params={"type": "metadata"},
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert len(response_json.get("results")) >= 15
+    assert int(response.headers["X-Query-Count"]) <= list_query_budget
+    for indexable in response_json.get("results"):
+        assert "search_vector" not in indexable
+        assert "original_content" not in indexable
+        assert indexable.get("contexts")
+
+
+def test_indexable_list_include_deferred(http_service):
+    test_endpoint = "indexable"
+    response = requests.get(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        params={
+            "resource_id": test_data_store.get(0),
+            "type": "metadata",
+            "include": "original_content",
+        },
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert sorted([r.get("original_content") for r in response_json["results"]]) == [
+        f"Query count value {j}" for j in range(3)
+    ]
+    assert "search_vector" not in response_json["results"][0]
+
+
+def test_query_count_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    for resource_id in test_data_store.values():
+        response = requests.delete(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/{resource_id}/",
+            headers=test_headers,
+        )
+        assert response.status_code == status
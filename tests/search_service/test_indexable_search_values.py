@@ -0,0 +1,117 @@
+import requests
+
+api_endpoint = "api/search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+
+def test_values_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    post_json = {
+        "label": "Values Resource",
+        "data": {
+            "indexables": [
+                {
+                    "type": "metadata",
+                    "subtype": "pages",
+                    "original_content": "312 pages",
+                    "indexable_text": "312 pages",
+                    "indexable_int": 312,
+                    "indexable_float": 312.5,
+                    "indexable_json": {"unit": "pages"},
+                    "indexable_date_range_start": "1612-03-01T00:00:00Z",
+                    "indexable_date_range_end": "1612-03-31T00:00:00Z",
+                    "language_iso639_1": "en",
+                    "selector": {"box-selector": [[1, 2, 3, 4], [5, 6, 7, 8]]},
+                }
+            ]
+        },
+    }
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == status
+    test_data_store["json_resource_id"] = response.json().get("id")
+
+
+def test_indexable_search_matches_indexable_detail(http_service):
+    """
+    Search results are formatted from values rows, and must be the same
+    as the model serializer's representation of the Indexable.
+    """
+    test_endpoint = "indexable_search"
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json={},
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    results = [
+        r
+        for r in response_json.get("results")
+        if r.get("resource_id") == test_data_store["json_resource_id"]
+        and r.get("subtype") == "pages"
+    ]
+    assert len(results) == 1
+    result = results[0]
+    detail_response = requests.get(result["url"], headers=test_headers)
+    assert detail_response.status_code == 200
+    detail = detail_response.json()
+    assert result["indexable_json"] == {"unit": "pages"}
+    assert result["rank"] is None
+    for field in [
+        "url",
+        "resource_id",
+        "original_content",
+        "indexable_text",
+        "indexable_int",
+        "indexable_float",
+        "indexable_json",
+        "indexable_date_range_start",
+        "indexable_date_range_end",
+        "selector",
+        "type",
+        "subtype",
+        "language_iso639_1",
+    ]:
+        assert result[field] == detail[field]
+
+
+def test_json_resource_search_matches_json_resource_detail(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json={"fulltext": "pages"},
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    results = [
+        r
+        for r in response_json.get("results")
+        if r.get("id") == test_data_store["json_resource_id"]
+    ]
+    assert len(results) == 1
+    result = results[0]
+    assert result["rank"] > 0
+    detail_response = requests.get(
+        f"{http_service}/{api_endpoint}/json_resource/{result['id']}/",
+        headers=test_headers,
+    )
+    detail = detail_response.json()
+    for field in ["id", "created", "modified", "label", "type", "data"]:
+        assert result[field] == detail[field]
+
+
+def test_values_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store['json_resource_id']}/",
+        headers=test_headers,
+    )
+    assert response.status_code == status
@@ -0,0 +1,98 @@
+import pytest
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+box_text = "The foo-bar is  waiting and ready, at the end."
+
+
+def test_bounding_box_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    post_json = {
+        "label": "Bounding Box Resource",
+        "data": {
+            "indexables": [
+                {
+                    "type": "text",
+                    "subtype": "transcript",
+                    "original_content": box_text,
+                    "indexable_text": box_text,
+                    "language": "en",
+                    "selector": {
+                        "box-selector": [
+                            [i, 0, 10, 10] for i in range(len(box_text.split(" ")))
+                        ]
+                    },
+                }
+            ]
+        },
+    }
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == status
+    test_data_store["json_resource_id"] = response.json().get("id")
+
+
+@pytest.mark.parametrize(
+    "query,boxes",
+    [
+        ({"fulltext": "end"}, [[9, 0, 10, 10]]),
+        ({"fulltext": "waiting"}, [[4, 0, 10, 10]]),
+        ({"fulltext": "bar"}, [[1, 0, 10, 10]]),
+        ({"fulltext": "ready end"}, [[6, 0, 10, 10], [9, 0, 10, 10]]),
+        ({"fulltext": "fo:*", "search_type": "raw"}, [[1, 0, 10, 10]]),
+        # The negated lexemes of the query aren't hits
+        ({"fulltext": "end -koala"}, [[9, 0, 10, 10]]),
+        ({"fulltext": "end or ready -waiting"}, [[6, 0, 10, 10], [9, 0, 10, 10]]),
+    ],
+)
+def test_bounding_box_hits(http_service, query, boxes):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json={"search_language": "english", **query},
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert len(response_json.get("results")) == 1
+    hits = response_json["results"][0].get("hits")
+    assert hits[0].get("bounding_boxes") == boxes
+
+
+def test_bounding_box_indexable_selector(http_service):
+    """
+    The box-selector is returned as a list of boxes, whether or not it has been
+    packed for storage.
+    """
+    test_endpoint = "indexable"
+    response = requests.get(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        params={
+            "resource_id": test_data_store.get("json_resource_id"),
+            "type": "text",
+        },
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert [r.get("selector") for r in response_json.get("results")] == [
+        {"box-selector": [[i, 0, 10, 10] for i in range(len(box_text.split(" ")))]}
+    ]
+
+
+def test_bounding_box_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store.get('json_resource_id')}/",
+        headers=test_headers,
+    )
+    assert response.status_code == status
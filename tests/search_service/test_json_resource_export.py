@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+
+def test_export_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    for i in range(3):
+        label = f"Export Resource {i}"
+        post_json = {
+            "label": label,
+            "data": {
+                "pages": i,
+                "indexables": [
+                    {
+                        "type": "text",
+                        "subtype": "transcript",
+                        "original_content": f"An exportable pangolin {i}",
+                        "indexable_text": f"An exportable pangolin {i}",
+                        "language": "en",
+                    }
+                ],
+            },
+        }
+        response = requests.post(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/",
+            json=post_json,
+            headers=test_headers,
+        )
+        assert response.status_code == status
+        test_data_store[label] = response.json().get("id")
+
+
+def test_export_ndjson(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.get(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/export/",
+        params={"fulltext": "pangolin"},
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted([r.get("label") for r in rows]) == sorted(test_data_store)
+    assert all([r.get("hits") for r in rows])
+
+
+def test_export_csv(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/export/?format=csv",
+        json={"fulltext": "pangolin", "fields": ["id", "label", "data"]},
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "text/csv; charset=utf-8"
+    assert response.headers["Content-Disposition"].startswith("attachment;")
+    assert response.headers["Content-Disposition"].endswith('.csv"')
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert sorted([r["label"] for r in rows]) == sorted(test_data_store)
+    assert list(rows[0]) == ["id", "label", "data"]
+    for row in rows:
+        assert row["id"] == test_data_store[row["label"]]
+        assert json.loads(row["data"])["pages"] == int(row["label"][-1])
+
+
+def test_export_csv_no_results(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/export/",
+        json={"fulltext": "aardwolf", "fields": ["id", "label"]},
+        headers={"Content-Type": "application/json", "Accept": "text/csv"},
+    )
+    assert response.status_code == 200
+    assert response.text.splitlines() == ["id,label"]
+
+
+def test_export_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    for resource_id in test_data_store.values():
+        response = requests.delete(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/{resource_id}/",
+            headers=test_headers,
+        )
+        assert response.status_code == status
@@ -0,0 +1,146 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+# The facet list is cached per request, so each test uses a different request.
+
+
+def facet_fields_resource(label, contexts, fields):
+    return {
+        "label": label,
+        "contexts": contexts,
+        "data": {
+            "indexables": [
+                {
+                    "type": indexable_type,
+                    "subtype": subtype,
+                    "original_content": value,
+                    "indexable_text": value,
+                }
+                for indexable_type, subtype, value in fields
+            ]
+        },
+    }
+
+
+def test_facet_fields_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    for label, contexts, fields in [
+        (
+            "Facet Fields Resource A",
+            ["urn:madoc:collection:facet-fields-a", "urn:madoc:site:facet-fields"],
+            [("metadata", "author", "John Smith"), ("metadata", "place", "Glasgow")],
+        ),
+        (
+            "Facet Fields Resource B",
+            ["urn:madoc:collection:facet-fields-b", "urn:madoc:site:facet-fields"],
+            [
+                ("metadata", "author", "Mary Jones"),
+                ("metadata", "date", "1850"),
+                ("tag", "colour", "Red"),
+            ],
+        ),
+    ]:
+        response = requests.post(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/",
+            json=facet_fields_resource(label, contexts, fields),
+            headers=test_headers,
+        )
+        assert response.status_code == 201
+        test_data_store[label] = response.json().get("id")
+
+
+def test_facet_fields_list_contexts(http_service):
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/facets/",
+        json={"contexts": ["urn:madoc:collection:facet-fields-a"]},
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"metadata": ["author", "place"]}
+
+
+def test_facet_fields_list_facet_types(http_service):
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/facets/",
+        json={
+            "contexts": ["urn:madoc:site:facet-fields"],
+            "facet_types": ["metadata", "tag"],
+        },
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "metadata": ["author", "date", "place"],
+        "tag": ["colour"],
+    }
+
+
+def test_facet_fields_list_contexts_all(http_service):
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/facets/",
+        json={
+            "contexts_all": [
+                "urn:madoc:collection:facet-fields-b",
+                "urn:madoc:site:facet-fields",
+            ]
+        },
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"metadata": ["author", "date"]}
+
+
+def test_facet_fields_updated_on_reindexing(http_service):
+    test_endpoint = "json_resource"
+    label = "Facet Fields Resource A"
+    response = requests.put(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store[label]}/",
+        json=facet_fields_resource(
+            label,
+            ["urn:madoc:collection:facet-fields-a", "urn:madoc:site:facet-fields"],
+            [("metadata", "author", "John Smith"), ("metadata", "subject", "Maps")],
+        ),
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/facets/",
+        json={
+            "contexts": ["urn:madoc:collection:facet-fields-a"],
+            "facet_types": ["metadata", "entity"],
+        },
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"metadata": ["author", "subject"]}
+
+
+def test_facet_fields_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    label = "Facet Fields Resource B"
+    response = requests.delete(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store.pop(label)}/",
+    )
+    assert response.status_code == 204
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/facets/",
+        json={
+            "contexts": [
+                "urn:madoc:site:facet-fields",
+                "urn:madoc:collection:facet-fields-b",
+            ],
+            "facet_types": ["metadata", "tag"],
+        },
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"metadata": ["author", "subject"]}
+    for resource_id in test_data_store.values():
+        response = requests.delete(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/{resource_id}/",
+        )
+        assert response.status_code == 204
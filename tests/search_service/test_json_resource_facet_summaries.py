@@ -0,0 +1,133 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+collection_1 = "urn:madoc:collection:facet-summary-1"
+collection_2 = "urn:madoc:collection:facet-summary-2"
+site = "urn:madoc:site:facet-summary"
+
+
+def facet_summary_resource(label, contexts, author, place):
+    return {
+        "label": label,
+        "contexts": contexts,
+        "data": {
+            "indexables": [
+                {
+                    "type": "metadata",
+                    "subtype": "author",
+                    "original_content": author,
+                    "indexable_text": author,
+                },
+                {
+                    "type": "metadata",
+                    "subtype": "place",
+                    "original_content": place,
+                    "indexable_text": place,
+                },
+            ]
+        },
+    }
+
+
+def search_facets(http_service, post_json):
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/json_resource_search/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    return response.json().get("facets")
+
+
+def test_facet_summary_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    for label, contexts, author, place in [
+        ("Facet Summary Resource 1", [collection_1, site], "John Smith", "Glasgow"),
+        ("Facet Summary Resource 2", [collection_1, site], "John Smith", "Edinburgh"),
+        ("Facet Summary Resource 3", [collection_2, site], "Mary Jones", "Glasgow"),
+    ]:
+        response = requests.post(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/",
+            json=facet_summary_resource(label, contexts, author, place),
+            headers=test_headers,
+        )
+        assert response.status_code == 201
+        test_data_store[label] = response.json().get("id")
+
+
+def test_facet_summary_context_facets(http_service):
+    facets = search_facets(http_service, {"contexts": [collection_1]})
+    assert facets == {
+        "metadata": {
+            "author": {"John Smith": 2},
+            "place": {"Edinburgh": 1, "Glasgow": 1},
+        }
+    }
+    facets = search_facets(http_service, {"contexts": [site]})
+    assert facets == {
+        "metadata": {
+            "author": {"John Smith": 2, "Mary Jones": 1},
+            "place": {"Glasgow": 2, "Edinburgh": 1},
+        }
+    }
+
+
+def test_facet_summary_matches_aggregated_facets(http_service):
+    # contexts_all isn't answered from the summary, so the facets are aggregated
+    for post_json in [
+        {"contexts": [site]},
+        {"contexts": [site], "facet_fields": ["place"]},
+        {"contexts": [collection_2], "num_facets": 1},
+    ]:
+        assert search_facets(http_service, post_json) == search_facets(
+            http_service, {**post_json, "contexts_all": post_json["contexts"]}
+        )
+
+
+def test_facet_summary_filtered_search_facets(http_service):
+    facets = search_facets(
+        http_service,
+        {
+            "contexts": [site],
+            "facets": [{"type": "metadata", "subtype": "place", "value": "Glasgow"}],
+        },
+    )
+    assert facets == {
+        "metadata": {
+            "author": {"John Smith": 1, "Mary Jones": 1},
+            "place": {"Glasgow": 2},
+        }
+    }
+
+
+def test_facet_summary_updated_on_reindexing(http_service):
+    test_endpoint = "json_resource"
+    label = "Facet Summary Resource 3"
+    response = requests.put(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store[label]}/",
+        json=facet_summary_resource(label, [collection_1, site], "Mary Jones", "Perth"),
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    facets = search_facets(http_service, {"contexts": [collection_1]})
+    assert facets == {
+        "metadata": {
+            "author": {"John Smith": 2, "Mary Jones": 1},
+            "place": {"Edinburgh": 1, "Glasgow": 1, "Perth": 1},
+        }
+    }
+    assert search_facets(http_service, {"contexts": [collection_2]}) == {}
+
+
+def test_facet_summary_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    for resource_id in test_data_store.values():
+        response = requests.delete(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/{resource_id}/",
+        )
+        assert response.status_code == 204
+    assert search_facets(http_service, {"contexts": [site]}) == {}
@@ -0,0 +1,181 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+
+def test_facet_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    for label, author, place in [
+        ("Facet Resource 1", "John Smith", "Glasgow"),
+        ("Facet Resource 2", "John Smith", "Edinburgh"),
+        ("Facet Resource 3", "Mary Jones", "Glasgow"),
+    ]:
+        post_json = {
+            "label": label,
+            "data": {
+                "indexables": [
+                    {
+                        "type": "metadata",
+                        "subtype": "author",
+                        "original_content": author,
+                        "indexable_text": author,
+                    },
+                    {
+                        "type": "metadata",
+                        "subtype": "place",
+                        "original_content": place,
+                        "indexable_text": place,
+                    },
+                ]
+            },
+        }
+        response = requests.post(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/",
+            json=post_json,
+            headers=test_headers,
+        )
+        assert response.status_code == status
+        test_data_store[label] = response.json().get("id")
+
+
+def test_metadata_facet_query_case_insensitive(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {
+        "facets": [{"type": "Metadata", "subtype": "AUTHOR", "value": "john smith"}]
+    }
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert sorted([r.get("label") for r in response_json.get("results")]) == [
+        "Facet Resource 1",
+        "Facet Resource 2",
+    ]
+
+
+def test_metadata_facet_query_or_and(http_service):
+    """
+    Facets with the same subtype are OR'd, different subtypes are AND'd.
+    """
+    test_endpoint = "json_resource_search"
+    post_json = {
+        "facets": [
+            {"type": "metadata", "subtype": "author", "value": "John Smith"},
+            {"type": "metadata", "subtype": "author", "value": "Mary Jones"},
+            {"type": "metadata", "subtype": "place", "value": "Glasgow"},
+        ]
+    }
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert sorted([r.get("label") for r in response_json.get("results")]) == [
+        "Facet Resource 1",
+        "Facet Resource 3",
+    ]
+
+
+def test_metadata_facet_query_field_lookup(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {
+        "facets": [
+            {
+                "type": "metadata",
+                "subtype": "place",
+                "value": "Edin",
+                "field_lookup": "startswith",
+            }
+        ]
+    }
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert [r.get("label") for r in response_json.get("results")] == [
+        "Facet Resource 2"
+    ]
+
+
+def test_metadata_facet_counts(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {"facet_types": ["metadata"]}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert response_json.get("facets") == {
+        "metadata": {
+            "author": {"John Smith": 2, "Mary Jones": 1},
+            "place": {"Glasgow": 2, "Edinburgh": 1},
+        }
+    }
+
+
+def test_metadata_facet_counts_filtered(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {
+        "facet_types": ["metadata"],
+        "facets": [{"type": "metadata", "subtype": "place", "value": "Glasgow"}],
+    }
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert response_json.get("facets") == {
+        "metadata": {
+            "author": {"John Smith": 1, "Mary Jones": 1},
+            "place": {"Glasgow": 2},
+        }
+    }
+
+
+def test_non_facet_value_type_counts(http_service):
+    """
+    Facet types that aren't copied to the FacetValue table are counted
+    from the Indexables.
+    """
+    test_endpoint = "json_resource_search"
+    post_json = {
+        "facet_types": ["descriptive"],
+        "facets": [{"type": "metadata", "subtype": "author", "value": "Mary Jones"}],
+    }
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert response_json.get("facets") == {
+        "descriptive": {"label": {"Facet Resource 3": 1}}
+    }
+
+
+def test_facet_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    for resource_id in test_data_store.values():
+        response = requests.delete(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/{resource_id}/",
+            headers=test_headers,
+        )
+        assert response.status_code == status
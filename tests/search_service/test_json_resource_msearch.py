@@ -0,0 +1,108 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+
+def test_msearch_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    for label, animal, place in [
+        ("Msearch Resource 1", "narwhal", "Dundee"),
+        ("Msearch Resource 2", "narwhal", "Aberdeen"),
+        ("Msearch Resource 3", "walrus", "Dundee"),
+    ]:
+        post_json = {
+            "label": label,
+            "data": {
+                "indexables": [
+                    {
+                        "type": "text",
+                        "subtype": "transcript",
+                        "original_content": f"A {animal} seen off the coast",
+                        "indexable_text": f"A {animal} seen off the coast",
+                        "language": "en",
+                    },
+                    {
+                        "type": "metadata",
+                        "subtype": "msearch place",
+                        "original_content": place,
+                        "indexable_text": place,
+                    },
+                ]
+            },
+        }
+        response = requests.post(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/",
+            json=post_json,
+            headers=test_headers,
+        )
+        assert response.status_code == status
+        test_data_store[label] = response.json().get("id")
+
+
+def test_msearch(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = [
+        {"fulltext": "narwhal"},
+        {
+            "fulltext": "walrus",
+            "facets": [
+                {"type": "metadata", "subtype": "msearch place", "value": "Dundee"}
+            ],
+        },
+        {"fulltext": "coast", "page_size": 2, "facet_fields": ["msearch place"]},
+    ]
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/msearch/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert len(response_json) == 3
+    narwhals, walruses, coast = response_json
+    assert sorted([r.get("label") for r in narwhals.get("results")]) == [
+        "Msearch Resource 1",
+        "Msearch Resource 2",
+    ]
+    assert [r.get("label") for r in walruses.get("results")] == ["Msearch Resource 3"]
+    assert len(coast.get("results")) == 2
+    assert coast["pagination"]["totalResults"] == 3
+    assert coast["facets"]["metadata"]["msearch place"] == {"Dundee": 2, "Aberdeen": 1}
+
+
+def test_msearch_invalid_search(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/msearch/",
+        json=[{"fulltext": "walrus"}, "walrus"],
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert len(response_json[0].get("results")) == 1
+    assert response_json[1].get("status") == 400
+
+
+def test_msearch_not_a_list(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/msearch/",
+        json={"fulltext": "walrus"},
+        headers=test_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_msearch_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    for resource_id in test_data_store.values():
+        response = requests.delete(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/{resource_id}/",
+            headers=test_headers,
+        )
+        assert response.status_code == status
@@ -0,0 +1,171 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+
+def test_numeric_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    for label, pages, width, place in [
+        ("Numeric Resource 1", 120, 21.5, {"country": "Mexico", "city": "Tlatelolco"}),
+        ("Numeric Resource 2", 350, 29.7, {"country": "Spain", "city": "Seville"}),
+        ("Numeric Resource 3", 0, 14.8, {"country": "Mexico", "city": "Texcoco"}),
+    ]:
+        post_json = {
+            "label": label,
+            "data": {
+                "indexables": [
+                    {
+                        "type": "metadata",
+                        "subtype": "pages",
+                        "original_content": str(pages),
+                        "indexable_text": str(pages),
+                        "indexable_int": pages,
+                    },
+                    {
+                        "type": "metadata",
+                        "subtype": "width",
+                        "original_content": str(width),
+                        "indexable_text": str(width),
+                        "indexable_float": width,
+                    },
+                    {
+                        "type": "metadata",
+                        "subtype": "place",
+                        "original_content": place["city"],
+                        "indexable_text": place["city"],
+                        "indexable_json": place,
+                    },
+                ]
+            },
+        }
+        response = requests.post(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/",
+            json=post_json,
+            headers=test_headers,
+        )
+        assert response.status_code == status
+        test_data_store[label] = response.json().get("id")
+
+
+def test_integer_filter(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {"integer": {"value": 200, "operator": "gt"}}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert [r.get("label") for r in response_json.get("results")] == [
+        "Numeric Resource 2"
+    ]
+
+
+def test_integer_filter_zero_value(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {"integer": {"value": 0}}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert [r.get("label") for r in response_json.get("results")] == [
+        "Numeric Resource 3"
+    ]
+
+
+def test_float_filter(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {"float": {"value": 20.0, "operator": "lte"}}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert [r.get("label") for r in response_json.get("results")] == [
+        "Numeric Resource 3"
+    ]
+
+
+def test_json_containment_filter(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {"json": {"country": "Mexico"}}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert sorted([r.get("label") for r in response_json.get("results")]) == [
+        "Numeric Resource 1",
+        "Numeric Resource 3",
+    ]
+
+
+def test_json_containment_facet(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {
+        "facets": [
+            {
+                "type": "metadata",
+                "subtype": "place",
+                "indexable_json": {"city": "Seville"},
+            }
+        ]
+    }
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert [r.get("label") for r in response_json.get("results")] == [
+        "Numeric Resource 2"
+    ]
+
+
+def test_integer_facet(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {
+        "facets": [
+            {
+                "type": "metadata",
+                "subtype": "pages",
+                "indexable_int": 100,
+                "field_lookup": "gte",
+            }
+        ]
+    }
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert sorted([r.get("label") for r in response_json.get("results")]) == [
+        "Numeric Resource 1",
+        "Numeric Resource 2",
+    ]
+
+
+def test_numeric_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    for resource_id in test_data_store.values():
+        response = requests.delete(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/{resource_id}/",
+            headers=test_headers,
+        )
+        assert response.status_code == status
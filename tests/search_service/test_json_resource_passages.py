@@ -0,0 +1,152 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+passage_words = "alpha beta gamma delta epsilon zeta eta theta iota kappa".split(" ")
+
+
+def test_passage_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    post_json = {
+        "label": "Passage Resource",
+        "data": {
+            "indexables": [
+                {
+                    "type": "text",
+                    "subtype": "transcript",
+                    "original_content": " ".join(passage_words),
+                    "indexable_text": " ".join(passage_words),
+                    "selector": {
+                        "box-selector": [[i, 0, 10, 10] for i in range(10)]
+                    },
+                    "passages": [
+                        {"word_offset": 0, "passage_text": " ".join(passage_words[:5])},
+                        {"word_offset": 5, "passage_text": " ".join(passage_words[5:])},
+                    ],
+                }
+            ]
+        },
+    }
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == status
+    test_data_store["json_resource_id"] = response.json().get("id")
+
+
+def test_passage_snippet(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {"fulltext": "theta"}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert len(response_json.get("results")) == 1
+    result = response_json["results"][0]
+    assert result.get("rank") > 0
+    assert "<b>theta</b>" in result.get("snippet")
+    assert "alpha" not in result.get("snippet")
+
+
+def test_passage_hits_bounding_boxes(http_service):
+    """
+    Bounding boxes for a hit in a passage are offset by the passage word_offset.
+    """
+    test_endpoint = "json_resource_search"
+    post_json = {"fulltext": "theta"}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    hits = response_json["results"][0].get("hits")
+    assert len(hits) == 1
+    assert hits[0].get("bounding_boxes") == [[7, 0, 10, 10]]
+    assert "alpha" not in hits[0].get("snippet")
+
+
+def test_passage_phrase_across_passages(http_service):
+    """
+    A match that spans passages falls back to the whole indexable.
+    """
+    test_endpoint = "json_resource_search"
+    post_json = {"fulltext": "epsilon zeta", "search_type": "phrase"}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert len(response_json.get("results")) == 1
+    hits = response_json["results"][0].get("hits")
+    assert hits[0].get("bounding_boxes") == [[4, 0, 10, 10], [5, 0, 10, 10]]
+
+
+def test_passage_tied_ranks(http_service):
+    """
+    Of the passages with the same rank, the snippet is from the first in the
+    text.
+    """
+    tied_words = "omicron pi rho sigma tau rho".split(" ")
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/json_resource/",
+        json={
+            "label": "Tied Passage Resource",
+            "data": {
+                "indexables": [
+                    {
+                        "type": "text",
+                        "subtype": "transcript",
+                        "original_content": " ".join(tied_words),
+                        "indexable_text": " ".join(tied_words),
+                        "selector": {
+                            "box-selector": [[i, 0, 10, 10] for i in range(6)]
+                        },
+                        "passages": [
+                            {"word_offset": 3, "passage_text": " ".join(tied_words[3:])},
+                            {"word_offset": 0, "passage_text": " ".join(tied_words[:3])},
+                        ],
+                    }
+                ]
+            },
+        },
+        headers=test_headers,
+    )
+    assert response.status_code == 201
+    resource_id = response.json().get("id")
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/json_resource_search/",
+        json={"fulltext": "rho"},
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    snippet = response.json()["results"][0].get("snippet")
+    assert "omicron" in snippet
+    assert "sigma" not in snippet
+    response = requests.delete(
+        f"{http_service}/{api_endpoint}/json_resource/{resource_id}/",
+        headers=test_headers,
+    )
+    assert response.status_code == 204
+
+
+def test_passage_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store.get('json_resource_id')}/",
+        headers=test_headers,
+    )
+    assert response.status_code == status
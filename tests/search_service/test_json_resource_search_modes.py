@@ -0,0 +1,112 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+
+def test_search_modes_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    for label, colour in [
+        ("Search Mode Resource 1", "vermilion"),
+        ("Search Mode Resource 2", "vermilion"),
+        ("Search Mode Resource 3", "ochre"),
+    ]:
+        post_json = {
+            "label": label,
+            "data": {
+                "indexables": [
+                    {
+                        "type": "text",
+                        "subtype": "transcript",
+                        "original_content": f"A pigment of {colour} and gum",
+                        "indexable_text": f"A pigment of {colour} and gum",
+                        "language": "en",
+                    },
+                    {
+                        "type": "metadata",
+                        "subtype": "search mode colour",
+                        "original_content": colour,
+                        "indexable_text": colour,
+                    },
+                ]
+            },
+        }
+        response = requests.post(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/",
+            json=post_json,
+            headers=test_headers,
+        )
+        assert response.status_code == status
+        test_data_store[label] = response.json().get("id")
+
+
+def test_count_only(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {"fulltext": "pigment", "count_only": True}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"count": 3}
+
+
+def test_count_only_query_param(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.get(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        params={"fulltext": "vermilion", "count_only": "true"},
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"count": 2}
+
+
+def test_facets_only(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {
+        "fulltext": "pigment",
+        "results": False,
+        "facet_fields": ["search mode colour"],
+    }
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "facets": {"metadata": {"search mode colour": {"vermilion": 2, "ochre": 1}}}
+    }
+
+
+def test_results_without_facet_counts(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {"fulltext": "ochre", "facet_counts": False}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert "facets" not in response_json
+    assert [r.get("label") for r in response_json.get("results")] == [
+        "Search Mode Resource 3"
+    ]
+    assert response_json["results"][0].get("snippet")
+
+
+def test_search_modes_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    for resource_id in test_data_store.values():
+        response = requests.delete(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/{resource_id}/",
+            headers=test_headers,
+        )
+        assert response.status_code == status
@@ -0,0 +1,116 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+
+def test_sparse_fieldset_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    post_json = {
+        "label": "Sparse Fieldset Resource",
+        "data": {
+            "pages": 300,
+            "indexables": [
+                {
+                    "type": "text",
+                    "subtype": "transcript",
+                    "original_content": "The sparse hedgehog crossed the road",
+                    "indexable_text": "The sparse hedgehog crossed the road",
+                    "language": "en",
+                    "indexable_json": {"page": 1},
+                }
+            ],
+        },
+    }
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == status
+    test_data_store["json_resource_id"] = response.json().get("id")
+
+
+def test_sparse_fieldset_fields(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {"fulltext": "hedgehog", "fields": ["id", "label", "rank"]}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert response_json.get("results") == [
+        {
+            "id": test_data_store["json_resource_id"],
+            "label": "Sparse Fieldset Resource",
+            "rank": response_json["results"][0]["rank"],
+        }
+    ]
+    assert response_json["results"][0]["rank"] > 0
+
+
+def test_sparse_fieldset_exclude(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {"fulltext": "hedgehog", "exclude": ["data", "snippet"]}
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    result = response_json["results"][0]
+    assert "data" not in result
+    assert "snippet" not in result
+    assert result.get("label") == "Sparse Fieldset Resource"
+    assert [h.get("subtype") for h in result.get("hits")] == ["transcript"]
+
+
+def test_sparse_fieldset_query_params(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.get(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        params={"fulltext": "hedgehog", "fields": "id,label"},
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert response_json.get("results") == [
+        {"id": test_data_store["json_resource_id"], "label": "Sparse Fieldset Resource"}
+    ]
+
+
+def test_sparse_fieldset_indexable_search(http_service):
+    test_endpoint = "indexable_search"
+    post_json = {
+        "resource_id": test_data_store["json_resource_id"],
+        "exclude": ["original_content", "indexable_json", "selector", "fullsnip"],
+    }
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert len(response_json.get("results")) > 0
+    for result in response_json.get("results"):
+        assert not {"original_content", "indexable_json", "selector", "fullsnip"} & set(
+            result
+        )
+        assert "indexable_text" in result
+
+
+def test_sparse_fieldset_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store['json_resource_id']}/",
+        headers=test_headers,
+    )
+    assert response.status_code == status
@@ -0,0 +1,128 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+
+def get_metrics(http_service):
+    """Get the metrics as a dict of sample (name and labels): value."""
+    response = requests.get(f"{http_service}/{api_endpoint}/metrics/")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            sample, value = line.rsplit(" ", 1)
+            samples[sample] = float(value)
+    return samples
+
+
+def test_metrics_exposition(http_service):
+    response = requests.get(f"{http_service}/{api_endpoint}/metrics/")
+    assert response.status_code == 200
+    for metric, metric_type in [
+        ("search_service_indexables_written_total", "counter"),
+        ("search_service_indexing_duration_seconds", "histogram"),
+        ("search_service_indexing_failures_total", "counter"),
+        ("search_service_indexing_in_progress", "gauge"),
+        ("search_service_search_duration_seconds", "histogram"),
+        ("search_service_facet_duration_seconds", "histogram"),
+        ("search_service_search_results", "histogram"),
+        ("search_service_cache_requests_total", "counter"),
+    ]:
+        assert f"# TYPE {metric} {metric_type}" in response.text
+    test_data_store["metrics"] = get_metrics(http_service)
+
+
+def test_metrics_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    post_json = {
+        "label": "Metrics Resource",
+        "data": {
+            "indexables": [
+                {
+                    "type": "text",
+                    "subtype": "transcript",
+                    "original_content": "A measured numbat",
+                    "indexable_text": "A measured numbat",
+                    "language": "en",
+                },
+                {
+                    "type": "metadata",
+                    "subtype": "measure",
+                    "original_content": "Measured",
+                    "indexable_text": "Measured",
+                },
+            ]
+        },
+    }
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == 201
+    test_data_store["id"] = response.json().get("id")
+
+
+def test_metrics_indexing(http_service):
+    before = test_data_store["metrics"]
+    after = get_metrics(http_service)
+    written = 'search_service_indexables_written_total{model="JSONResource"}'
+    # The two indexables of the data, and that of the label
+    assert after[written] - before.get(written, 0) == 3
+    count = 'search_service_indexing_duration_seconds_count{model="JSONResource"}'
+    assert after[count] - before.get(count, 0) == 1
+    assert after['search_service_indexing_in_progress{model="JSONResource"}'] == 0
+    test_data_store["metrics"] = after
+
+
+def test_metrics_search(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json={"fulltext": "numbat"},
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["pagination"]["totalResults"] == 1
+    before = test_data_store["metrics"]
+    after = get_metrics(http_service)
+    view = "JSONResourcePublicSearchViewSet"
+    count = (
+        f'search_service_search_duration_seconds_count{{view="{view}",action="create"}}'
+    )
+    assert after[count] - before.get(count, 0) == 1
+    count = f'search_service_facet_duration_seconds_count{{view="{view}"}}'
+    assert after[count] - before.get(count, 0) == 1
+    bucket = f'search_service_search_results_bucket{{view="{view}",le="1"}}'
+    assert after[bucket] - before.get(bucket, 0) == 1
+    bucket = f'search_service_search_results_bucket{{view="{view}",le="0"}}'
+    assert after.get(bucket, 0) - before.get(bucket, 0) == 0
+
+
+def test_metrics_facet_fields_cache(http_service):
+    before = get_metrics(http_service)
+    for _ in range(2):
+        response = requests.get(f"{http_service}/{public_endpoint}/facets/")
+        assert response.status_code == 200
+    after = get_metrics(http_service)
+    hits, misses = [
+        f'search_service_cache_requests_total{{cache="facet_fields",result="{result}"}}'
+        for result in ["hit", "miss"]
+    ]
+    assert (after.get(hits, 0) - before.get(hits, 0)) + (
+        after.get(misses, 0) - before.get(misses, 0)
+    ) == 2
+    assert after.get(hits, 0) - before.get(hits, 0) >= 1
+
+
+def test_metrics_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    response = requests.delete(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store['id']}/",
+        headers=test_headers,
+    )
+    assert response.status_code == 204
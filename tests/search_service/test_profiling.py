@@ -0,0 +1,106 @@
+from collections import Counter
+
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+profile_headers = {**test_headers, "X-Profile": "1"}
+test_data_store = {}
+
+
+def get_profiles(http_service):
+    response = requests.get(
+        f"{http_service}/{api_endpoint}/profiles/",
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_profiling_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    post_json = {
+        "label": "Profiled Resource",
+        "data": {
+            "indexables": [
+                {
+                    "type": "text",
+                    "subtype": "transcript",
+                    "original_content": "A profiled quokka",
+                    "indexable_text": "A profiled quokka",
+                    "language": "en",
+                },
+            ]
+        },
+    }
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=profile_headers,
+    )
+    assert response.status_code == 201
+    test_data_store["id"] = response.json().get("id")
+    latest = get_profiles(http_service)[0]
+    assert latest["view"] == "JSONResourceAPIViewSet"
+    assert latest["action"] == "create"
+    assert latest["reason"] == "requested"
+
+
+def test_profiling_requested_search(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json={"fulltext": "quokka"},
+        headers=profile_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["pagination"]["totalResults"] == 1
+    latest = get_profiles(http_service)[0]
+    assert latest["view"] == "JSONResourceAPISearchViewSet"
+    assert latest["method"] == "POST"
+    assert latest["samples"] == sum(latest["stacks"].values())
+    # The top (20) functions are those with the most samples at the leaves of
+    # the stacks, with ties in either order
+    leaves = Counter()
+    for stack, count in latest["stacks"].items():
+        leaves[stack.split(";")[-1]] += count
+    top = dict(latest["top"])
+    assert len(top) == min(20, len(leaves))
+    assert all(leaves[name] == count for name, count in top.items())
+    assert all(
+        count <= min(top.values()) for name, count in leaves.items() if name not in top
+    )
+
+
+def test_profiling_not_requested(http_service):
+    test_endpoint = "json_resource_search"
+    profiles = get_profiles(http_service)
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json={"fulltext": "quokka"},
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert get_profiles(http_service)[0]["time"] == profiles[0]["time"]
+
+
+def test_profiling_public_search_not_allowed(http_service):
+    test_endpoint = "indexable_search"
+    profiles = get_profiles(http_service)
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json={"fulltext": "quokka"},
+        headers=profile_headers,
+    )
+    assert response.status_code == 200
+    assert get_profiles(http_service)[0]["time"] == profiles[0]["time"]
+
+
+def test_profiling_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    response = requests.delete(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store['id']}/",
+        headers=test_headers,
+    )
+    assert response.status_code == 204
@@ -0,0 +1,88 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+
+def test_search_explain_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    post_json = {
+        "label": "Search Explain Resource",
+        "data": {
+            "indexables": [
+                {
+                    "type": "text",
+                    "subtype": "transcript",
+                    "original_content": "An explained numbat",
+                    "indexable_text": "An explained numbat",
+                    "language": "en",
+                },
+                {
+                    "type": "metadata",
+                    "subtype": "explain",
+                    "original_content": "Explained",
+                    "indexable_text": "Explained",
+                },
+            ]
+        },
+    }
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == 201
+    test_data_store["id"] = response.json().get("id")
+
+
+def test_search_explain_api_search(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json={"fulltext": "numbat", "explain": True},
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    response_json = response.json()
+    assert response_json["pagination"]["totalResults"] == 1
+    plans = response_json["debug"]["explain"]
+    assert {"page", "count", "facets"} <= {plan["stage"] for plan in plans}
+    for plan in plans:
+        assert plan["sql"].lstrip().upper().startswith("SELECT")
+        root = plan["plan"][0]
+        assert "Plan" in root
+        assert "Execution Time" in root
+        assert "Shared Hit Blocks" in root["Plan"]
+
+
+def test_search_explain_not_allowed_for_public_search(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json={"fulltext": "numbat", "explain": True},
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert "explain" not in response.json().get("debug", {})
+
+
+def test_search_explain_list(http_service):
+    test_endpoint = "search_explain"
+    response = requests.get(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    latest = response.json()[0]
+    assert latest["view"] == "JSONResourceAPISearchViewSet"
+    assert {"page", "count", "facets"} <= {plan["stage"] for plan in latest["plans"]}
+
+
+def test_search_explain_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    response = requests.delete(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store['id']}/",
+    )
+    assert response.status_code == 204
@@ -0,0 +1,111 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+# Query budget for a search without hits: the facet counts, the results count,
+# the page of results and the prefetched relationship sources. The filters
+# must not run the search query themselves (e.g. to test if it is empty).
+search_query_budget = 4
+
+
+def test_search_query_count_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    status = 201
+    for i in range(3):
+        post_json = {
+            "label": f"Search Query Count Resource {i}",
+            "data": {
+                "iiif_type": "manifest",
+                "indexables": [
+                    {
+                        "type": "text",
+                        "subtype": "transcript",
+                        "original_content": "An uncounted quokka",
+                        "indexable_text": "An uncounted quokka",
+                        "language": "en",
+                    },
+                    {
+                        "type": "metadata",
+                        "subtype": "query count",
+                        "original_content": f"Value {i}",
+                        "indexable_text": f"Value {i}",
+                    },
+                ],
+            },
+        }
+        response = requests.post(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/",
+            json=post_json,
+            headers=test_headers,
+        )
+        assert response.status_code == status
+        test_data_store[i] = response.json().get("id")
+
+
+def test_search_query_count_warm_up(http_service):
+    """Warms the per-process caches (e.g. of ContentTypes) of the server."""
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json={"fulltext": "quokka"},
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+
+
+def test_search_query_count(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {
+        "fulltext": "quokka",
+        "fields": ["id", "label", "rank", "snippet"],
+        "facets": [{"type": "metadata", "subtype": "query count", "value": "Value 1"}],
+        "resource_filters": [
+            {
+                "value": "search query count",
+                "field": "label",
+                "operator": "icontains",
+                "resource_class": "jsonresource",
+            }
+        ],
+    }
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    response_json = response.json()
+    assert response.status_code == 200
+    assert [r.get("label") for r in response_json.get("results")] == [
+        "Search Query Count Resource 1"
+    ]
+    assert int(response.headers["X-Query-Count"]) <= search_query_budget
+
+
+def test_search_query_count_facet_on(http_service):
+    test_endpoint = "json_resource_search"
+    post_json = {
+        "fulltext": "quokka",
+        "fields": ["id", "label"],
+        "facet_on": {"data__iiif_type": "manifest"},
+    }
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) <= search_query_budget
+
+
+def test_search_query_count_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    status = 204
+    for resource_id in test_data_store.values():
+        response = requests.delete(
+            f"{http_service}/{api_endpoint}/{test_endpoint}/{resource_id}/",
+            headers=test_headers,
+        )
+        assert response.status_code == status
@@ -0,0 +1,96 @@
+import requests
+
+api_endpoint = "api/search_service"
+public_endpoint = "search_service"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+test_data_store = {}
+
+
+def parse_server_timing(header):
+    """Parse a Server-Timing header into a dict of metric name: parameters."""
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+def test_search_timings_json_resource_create(http_service):
+    test_endpoint = "json_resource"
+    post_json = {
+        "label": "Search Timings Resource",
+        "data": {
+            "indexables": [
+                {
+                    "type": "text",
+                    "subtype": "transcript",
+                    "original_content": "A timed wombat",
+                    "indexable_text": "A timed wombat",
+                    "language": "en",
+                },
+                {
+                    "type": "metadata",
+                    "subtype": "timing",
+                    "original_content": "Timed",
+                    "indexable_text": "Timed",
+                },
+            ]
+        },
+    }
+    response = requests.post(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/",
+        json=post_json,
+        headers=test_headers,
+    )
+    assert response.status_code == 201
+    test_data_store["id"] = response.json().get("id")
+
+
+def test_search_timings_server_timing(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json={"fulltext": "wombat"},
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["pagination"]["totalResults"] == 1
+    metrics = parse_server_timing(response.headers["Server-Timing"])
+    for stage in [
+        "parse",
+        "filter.ResourceFilter",
+        "facets",
+        "count",
+        "page",
+        "serialize",
+        "hits",
+        "render",
+        "total",
+    ]:
+        assert stage in metrics
+        assert float(metrics[stage]["dur"]) >= 0
+    # Each of the facets, count and hits stages run (at least) one query
+    for stage in ["facets", "count", "hits"]:
+        assert not metrics[stage]["desc"].startswith('"0 queries')
+
+
+def test_search_timings_count_only(http_service):
+    test_endpoint = "json_resource_search"
+    response = requests.post(
+        f"{http_service}/{public_endpoint}/{test_endpoint}/",
+        json={"fulltext": "wombat", "count_only": True},
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    metrics = parse_server_timing(response.headers["Server-Timing"])
+    assert metrics["count"]["desc"].startswith('"1 queries')
+    assert "facets" not in metrics
+    assert "page" not in metrics
+
+
+def test_search_timings_json_resource_delete(http_service):
+    test_endpoint = "json_resource"
+    response = requests.delete(
+        f"{http_service}/{api_endpoint}/{test_endpoint}/{test_data_store['id']}/",
+    )
+    assert response.status_code == 204